@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+VisionPro batch processing
+Apply one filter to many images with overlapped decode / filter / encode.
+
+Examples:
+    python batch.py "scans/*.png" -o out -f threshold -p type=single -p t=100
+    python batch.py scans -o out -f object_boxing --workers 4 --cache-dir .cache
+    python batch.py parts -o edges -f edges -p method=canny -p low=40 -p high=120
+"""
+
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from modules.batch_pipeline import BATCH_FILTERS, BatchPipeline
+from modules.frame_source import IMAGE_EXTENSIONS, natural_key
+from modules.image_saver import SAVE_PROFILES
+from modules.result_cache import ResultCache
+
+
+def collect_inputs(specs):
+    """Expand files, directories and glob patterns into a sorted list of image paths."""
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.extend(os.path.join(spec, name) for name in os.listdir(spec)
+                         if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif glob.has_magic(spec):
+            paths.extend(glob.glob(spec))
+        else:
+            paths.append(spec)
+    return sorted(paths, key=natural_key)
+
+
+def parse_params(pairs):
+    """key=value pairs -> dict, values parsed as Python literals when possible."""
+    params = {}
+    for pair in pairs:
+        if '=' not in pair:
+            raise argparse.ArgumentTypeError(f"Parameter must be key=value: {pair}")
+        key, value = pair.split('=', 1)
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a VisionPro filter to a batch of images.")
+    parser.add_argument('inputs', nargs='+', help="image files, directories or glob patterns")
+    parser.add_argument('-o', '--output-dir', required=True, help="directory for the results")
+    parser.add_argument('-f', '--filter', required=True, choices=sorted(BATCH_FILTERS), help="filter to apply")
+    parser.add_argument('-p', '--param', action='append', default=[], metavar='KEY=VALUE',
+                        help="filter parameter (repeatable)")
+    parser.add_argument('--format', default='png', help="output format extension (default: png)")
+    parser.add_argument('--profile', default=None, choices=sorted(SAVE_PROFILES),
+                        help="encoder profile (default: fast profile for the format)")
+    parser.add_argument('--decode-threads', type=int, default=4, help="threads reading and decoding images")
+    parser.add_argument('--encode-threads', type=int, default=4, help="threads encoding and writing results")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="filter processes (default: CPU count, 0 = in-process)")
+    parser.add_argument('--queue-depth', type=int, default=8, help="images in flight per stage")
+    parser.add_argument('--cache-dir', default=None, help="persist results here and reuse them on later runs")
+    parser.add_argument('--cache-size-mb', type=int, default=1024, help="disk cache limit in MB")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No input images found.")
+        return 1
+
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(max_bytes=64 * 1024 * 1024, cache_dir=args.cache_dir,
+                            max_disk_bytes=args.cache_size_mb * 1024 * 1024)
+
+    try:
+        pipeline = BatchPipeline(
+            args.filter, parse_params(args.param),
+            output_dir=args.output_dir, output_format=args.format,
+            decode_threads=args.decode_threads, encode_threads=args.encode_threads,
+            workers=args.workers, queue_depth=args.queue_depth, cache=cache,
+            save_profile=args.profile
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    failed = cached = 0
+    for done, item in enumerate(pipeline.run(inputs), 1):
+        if item['error']:
+            failed += 1
+            print(f"[{done}/{len(inputs)}] FAILED {item['input']}: {item['error']}")
+        else:
+            cached += item['cached']
+            note = " (cached)" if item['cached'] else ""
+            print(f"[{done}/{len(inputs)}] {item['input']} -> {item['output']}{note}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\nProcessed {len(inputs) - failed}/{len(inputs)} images in {elapsed:.2f}s "
+          f"({len(inputs) / elapsed:.1f} images/s, {cached} from cache, {failed} failed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,19 +13,30 @@ import io
 import qtawesome as qta
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from modules.image_processor import ImageProcessor
-from modules.grayscale_converter import GrayscaleConverter
-from modules.black_white_converter import BlackWhiteConverter
 from modules.pixel_stats import PixelStats
-from modules.color_filter import ColorFilter
-from modules.rotate_converter import ImageRotator
-from modules.mirror_converter import ImageMirror
-from modules.translate_converter import ImageTranslator
-from modules.object_boxer import ObjectBoxer
-from modules.convolution_filters import ConvolutionFilter
-from modules.threshold_converter import ThresholdConverter
+from modules.result_cache import ResultCache
+from modules.image_saver import ImageSaver
+from gui.lazy import LazyComponent
+from gui.startup_timer import startup_timer
+
+PREVIEW_SIZE = (400, 300)
+HISTOGRAM_MAX_PIXELS = 1 << 18
+GALLERY_THUMBNAIL_SIZE = (160, 120)
 
 class ImageProcessingApp(QMainWindow):
+    # Processing components are imported and created on first use
+    # (several pull in NumPy), keeping them off the start-up path.
+    image_processor = LazyComponent('modules.image_processor', 'ImageProcessor')
+    grayscale_converter = LazyComponent('modules.grayscale_converter', 'GrayscaleConverter')
+    black_white_converter = LazyComponent('modules.black_white_converter', 'BlackWhiteConverter')
+    image_rotator = LazyComponent('modules.rotate_converter', 'ImageRotator')
+    image_mirror = LazyComponent('modules.mirror_converter', 'ImageMirror')
+    image_translator = LazyComponent('modules.translate_converter', 'ImageTranslator')
+    object_boxer = LazyComponent('modules.object_boxer', 'ObjectBoxer')
+    convolution_filter = LazyComponent('modules.convolution_filters', 'ConvolutionFilter')
+    threshold_converter = LazyComponent('modules.threshold_converter', 'ThresholdConverter')
+    edge_detector = LazyComponent('modules.edge_detector', 'EdgeDetector')
+
     def __init__(self):
         super().__init__()
         self.original_image = None
@@ -36,21 +47,22 @@ class ImageProcessingApp(QMainWindow):
         self.crop_end = QPoint()
         self.crop_rect = QRect()
         self.crop_applied = False
-        self.image_processor = ImageProcessor()
-        self.grayscale_converter = GrayscaleConverter()
-        self.black_white_converter = BlackWhiteConverter()
-        self.image_rotator = ImageRotator()
-        self.image_mirror = ImageMirror()
-        self.image_translator = ImageTranslator()
-        self.object_boxer = ObjectBoxer()
-        self.convolution_filter = ConvolutionFilter()
-        self.threshold_converter = ThresholdConverter()
+        self.selection_mode = "crop"   # what the drag rectangle is for: "crop" or "roi"
+        self.current_roi = None        # (left, top, right, bottom) in the image being processed
+        self.result_cache = ResultCache()
+        self.save_future = None   # pending background save
         self.current_filter = "custom_grayscale"
+        self.current_bw_threshold = 128
         self.current_rotation_angle = 0
+        self.current_rotation_resample = "nearest"
+        self.current_rotation_expand = False
         self.current_mirror_type = "horizontal"
         self.current_translate_dx = 0
         self.current_translate_dy = 0
         self.current_object_threshold = 128
+        self.current_object_method = "background"
+        self.current_object_min_area = 0
+        self.current_object_max_objects = 0   # 0 = no limit
 
         # Threshold variables
         self.current_threshold_type = "single"
@@ -60,6 +72,12 @@ class ImageProcessingApp(QMainWindow):
         self.current_adaptive_block = 11
         self.current_adaptive_c = 2
 
+        # Edge detection variables
+        self.current_edge_method = "canny"
+        self.current_edge_low = 50
+        self.current_edge_high = 150
+        self.current_edge_sigma = 1.4
+
         self.centroid_btn = None
         self.centroid_label = None
 
@@ -69,6 +87,7 @@ class ImageProcessingApp(QMainWindow):
 
         self.setup_ui()
         self.apply_styles()
+        startup_timer.mark("dashboard constructed")
 
     def setup_ui(self):
         self.setWindowTitle("CPEP 323A - Advanced Image Processing")
@@ -119,7 +138,7 @@ class ImageProcessingApp(QMainWindow):
         from gui.ui_components.page_header import create_page_header
         widget = create_page_header()
         widget.findChild(QLabel, "page-title").setText("Advanced Image Processing Dashboard")
-        widget.findChild(QLabel, "page-subtitle").setText("Upload, crop, and apply filters including background removal, rotation, mirroring, translation, object boxing, convolution, and thresholding")
+        widget.findChild(QLabel, "page-subtitle").setText("Upload, crop, and apply filters including background removal, rotation, mirroring, translation, object boxing, convolution, thresholding, and edge detection")
         return widget
 
     def create_status_bar(self):
@@ -188,11 +207,9 @@ class ImageProcessingApp(QMainWindow):
         source_image = self.cropped_image if self.crop_applied and self.cropped_image else self.original_image
         if source_image is None:
             return
-        threshold = getattr(self, 'bw_threshold_slider', None)
-        thresh_val = threshold.value() if threshold else 128
-        binary_img = self.black_white_converter.convert_to_black_white(source_image, threshold=thresh_val)
+        binary_img = self.black_white_converter.convert_to_black_white(source_image, threshold=self.current_bw_threshold)
         if binary_img and hasattr(self, 'projection_widget'):
-            self.projection_widget.update_projections(binary_img)
+            self.projection_widget.content().update_projections(binary_img)
 
     def create_control_panel(self):
         from gui.ui_components.control_panel import create_control_panel
@@ -202,6 +219,12 @@ class ImageProcessingApp(QMainWindow):
         self.filter_controls_stack.setVisible(False)
         return widget
 
+    def build_deferred_widgets(self):
+        """Build the matplotlib canvases once the window is on screen."""
+        for name in ('histogram_widget', 'projection_widget'):
+            if hasattr(self, name):
+                getattr(self, name).build_later()
+
     def get_scrollbar_style(self):
         return """
             QScrollArea { border: none; background-color: #111827; }
@@ -213,6 +236,9 @@ class ImageProcessingApp(QMainWindow):
             #crop-btn { background-color: #F59E0B; color: white; border: none; border-radius: 6px; padding: 8px 16px; font-weight: 600; font-size: 13px; }
             #crop-btn:hover:enabled { background-color: #D97706; transform: translateY(-1px); }
             #crop-btn:disabled { opacity: 0.5; cursor: not-allowed; }
+            #roi-btn { background-color: #0EA5E9; color: white; border: none; border-radius: 6px; padding: 8px 16px; font-weight: 600; font-size: 13px; }
+            #roi-btn:hover:enabled { background-color: #0284C7; transform: translateY(-1px); }
+            #roi-btn:disabled { opacity: 0.5; cursor: not-allowed; }
             #apply-crop-btn { background-color: #10B981; color: white; border: none; border-radius: 6px; padding: 8px 16px; font-weight: 600; font-size: 13px; }
             #apply-crop-btn:hover:enabled { background-color: #0DA271; transform: translateY(-1px); }
             #apply-crop-btn:disabled { opacity: 0.5; cursor: not-allowed; }
@@ -236,7 +262,8 @@ class ImageProcessingApp(QMainWindow):
             6: "translate",
             7: "object_boxing",
             8: "convolution",
-            9: "threshold"
+            9: "threshold",
+            10: "edges"
         }
         self.current_filter = filter_map.get(index, "custom_grayscale")
 
@@ -252,6 +279,8 @@ class ImageProcessingApp(QMainWindow):
             self.object_boxing_widget.setVisible(self.current_filter == "object_boxing")
         if hasattr(self, 'threshold_controls_widget'):
             self.threshold_controls_widget.setVisible(self.current_filter == "threshold")
+        if hasattr(self, 'edge_controls_widget'):
+            self.edge_controls_widget.setVisible(self.current_filter == "edges")
 
         if hasattr(self, 'filter_controls_stack'):
             if index == 3:
@@ -269,6 +298,7 @@ class ImageProcessingApp(QMainWindow):
     def on_threshold_changed(self, value):
         if hasattr(self, 'bw_threshold_value_label'):
             self.bw_threshold_value_label.setText(str(value))
+        self.current_bw_threshold = value
         self.black_white_converter.threshold = value
         self.update_binary_projections()
 
@@ -277,6 +307,12 @@ class ImageProcessingApp(QMainWindow):
         if hasattr(self, 'rotation_value_label'):
             self.rotation_value_label.setText(f"{value}°")
 
+    def on_rotation_resample_changed(self, resample):
+        self.current_rotation_resample = resample
+
+    def on_rotation_expand_changed(self, checked):
+        self.current_rotation_expand = checked
+
     def on_mirror_direction_changed(self):
         if hasattr(self, 'mirror_horizontal_radio') and hasattr(self, 'mirror_vertical_radio'):
             if self.mirror_horizontal_radio.isChecked():
@@ -294,6 +330,14 @@ class ImageProcessingApp(QMainWindow):
         if hasattr(self, 'object_threshold_value_label'):
             self.object_threshold_value_label.setText(str(value))
 
+    def on_object_method_changed(self, index):
+        self.current_object_method = "threshold" if index == 1 else "background"
+
+    def on_object_limits_changed(self):
+        if hasattr(self, 'object_min_area_spin') and hasattr(self, 'object_max_objects_spin'):
+            self.current_object_min_area = self.object_min_area_spin.value()
+            self.current_object_max_objects = self.object_max_objects_spin.value()
+
     def on_threshold_type_changed(self, index):
         if hasattr(self, 'threshold_controls_stack'):
             self.threshold_controls_stack.setCurrentIndex(index)
@@ -321,6 +365,18 @@ class ImageProcessingApp(QMainWindow):
             self.current_adaptive_block = block
             self.current_adaptive_c = self.adaptive_c_spin.value()
 
+    def on_edge_method_changed(self, index):
+        self.current_edge_method = ("canny", "sobel", "scharr", "orientation")[index]
+        if hasattr(self, 'edge_low_spin') and hasattr(self, 'edge_high_spin'):
+            self.edge_low_spin.setEnabled(index == 0)
+            self.edge_high_spin.setEnabled(index == 0)
+
+    def on_edge_params_changed(self):
+        if hasattr(self, 'edge_low_spin') and hasattr(self, 'edge_high_spin') and hasattr(self, 'edge_sigma_spin'):
+            self.current_edge_low = self.edge_low_spin.value()
+            self.current_edge_high = self.edge_high_spin.value()
+            self.current_edge_sigma = self.edge_sigma_spin.value()
+
     def get_current_convolution_kernel(self):
         if not hasattr(self, 'conv_controls'):
             return None
@@ -331,18 +387,8 @@ class ImageProcessingApp(QMainWindow):
                 QMessageBox.warning(self, "Invalid Kernel", "Please enter numeric values for all kernel entries.")
                 return None
             return kernel
-        if preset == "Smoothing (Average)":
-            return ConvolutionFilter.get_smoothing_kernel(3)
-        elif preset == "Gaussian Blur":
-            return ConvolutionFilter.get_gaussian_kernel(3, sigma=1.0)
-        elif preset == "Sharpening":
-            return ConvolutionFilter.get_sharpening_kernel()
-        elif preset == "Mean Removal (High-pass)":
-            return ConvolutionFilter.get_mean_removal_kernel()
-        elif preset == "Emboss":
-            return ConvolutionFilter.get_emboss_kernel()
-        else:
-            return None
+        kernel = self.conv_controls.get_preset_kernel(preset)
+        return kernel.to_list() if kernel else None
 
     def update_object_area(self, pil_image, filter_name):
         if pil_image is None:
@@ -364,36 +410,41 @@ class ImageProcessingApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "No processed image available. Please process an image first.")
             return
 
-        img = self.processed_image.copy()
-        width, height = img.size
+        width, height = self.processed_image.size
         img_cx = width / 2.0
         img_cy = height / 2.0
 
         if self.current_filter == "object_boxing" and hasattr(self.object_boxer, 'objects') and self.object_boxer.objects:
-            from PIL import ImageDraw
-            draw = ImageDraw.Draw(img)
+            from PIL import Image, ImageDraw
+            from modules.overlay_renderer import OverlayRenderer
+            from modules.image_pyramid import ImagePyramid
+            # Draw markers on a display-resolution layer instead of the full-size image
+            display_size = OverlayRenderer.fit_size((width, height), (400, 300))
+            source = ImagePyramid.get(self.processed_image).for_size(display_size)
+            display = source.convert('RGBA').resize(display_size, Image.LANCZOS)
+            layer = OverlayRenderer.render_layer(self.object_boxer.objects, (width, height), display_size,
+                                                 boxes=False, centroids=True)
+            draw = ImageDraw.Draw(layer)
             marker_size = 8
             line_width = 2
-
-            draw.line([(img_cx - marker_size, img_cy), (img_cx + marker_size, img_cy)], fill='red', width=line_width)
-            draw.line([(img_cx, img_cy - marker_size), (img_cx, img_cy + marker_size)], fill='red', width=line_width)
+            dx = img_cx * display_size[0] / width
+            dy = img_cy * display_size[1] / height
+            draw.line([(dx - marker_size, dy), (dx + marker_size, dy)], fill='red', width=line_width)
+            draw.line([(dx, dy - marker_size), (dx, dy + marker_size)], fill='red', width=line_width)
+            display.alpha_composite(layer)
 
             coord_msgs = []
             for obj in self.object_boxer.objects:
                 if obj.get('is_full_image'):
                     continue
                 cx, cy = obj['centroid']
-                draw.line([(cx - marker_size, cy), (cx + marker_size, cy)], fill='lime', width=line_width)
-                draw.line([(cx, cy - marker_size), (cx, cy + marker_size)], fill='lime', width=line_width)
-                draw.ellipse([cx-3, cy-3, cx+3, cy+3], fill='lime')
                 coord_msgs.append(f"Object {obj['label']}: ({cx:.1f}, {cy:.1f})")
 
             byte_arr = io.BytesIO()
-            img.save(byte_arr, format='PNG')
+            display.save(byte_arr, format='PNG')
             pixmap = QPixmap()
             pixmap.loadFromData(byte_arr.getvalue())
-            scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.processed_image_label.setPixmap(scaled_pixmap)
+            self.processed_image_label.setPixmap(pixmap)
 
             msg = f"Image Centroid: ({img_cx:.1f}, {img_cy:.1f})\n\nDetected Objects: {len(coord_msgs)}\n" + "\n".join(coord_msgs)
             if self.centroid_label:
@@ -401,6 +452,7 @@ class ImageProcessingApp(QMainWindow):
             QMessageBox.information(self, "Centroid Coordinates", msg)
         else:
             # fallback for other filters
+            img = self.processed_image.copy()
             obj_cx, obj_cy = img_cx, img_cy
             has_object = False
             if img.mode == 'RGBA':
@@ -430,12 +482,7 @@ class ImageProcessingApp(QMainWindow):
                 draw.line([(obj_cx - marker_size, obj_cy), (obj_cx + marker_size, obj_cy)], fill='lime', width=line_width)
                 draw.line([(obj_cx, obj_cy - marker_size), (obj_cx, obj_cy + marker_size)], fill='lime', width=line_width)
 
-            byte_arr = io.BytesIO()
-            img.save(byte_arr, format='PNG')
-            pixmap = QPixmap()
-            pixmap.loadFromData(byte_arr.getvalue())
-            scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.processed_image_label.setPixmap(scaled_pixmap)
+            self.show_preview(self.processed_image_label, img)
 
             coord_msg = f"Image Centroid: ({img_cx:.1f}, {img_cy:.1f})"
             if has_object:
@@ -508,19 +555,13 @@ class ImageProcessingApp(QMainWindow):
                             scale_y = orig_h / pixmap_size.height()
                             orig_x = int(px * scale_x)
                             orig_y = int(py * scale_y)
-                            found = False
-                            for obj_info in self.object_boxer.objects:
-                                if obj_info.get('is_full_image'):
-                                    continue   # skip the full-image bounding box
-                                x1, y1, x2, y2 = obj_info['bbox']
-                                if x1 <= orig_x <= x2 and y1 <= orig_y <= y2:
-                                    area = obj_info['area']
-                                    QToolTip.showText(event.globalPosition().toPoint(), f"Area: {area} pixels")
-                                    if hasattr(self, 'object_area_card'):
-                                        self.object_area_card.findChild(QLabel, "card-value").setText(f"{area:,}")
-                                    found = True
-                                    break
-                            if not found:
+                            obj_info = self.object_boxer.object_at(orig_x, orig_y)
+                            if obj_info is not None:
+                                area = obj_info['area']
+                                QToolTip.showText(event.globalPosition().toPoint(), f"Area: {area} pixels")
+                                if hasattr(self, 'object_area_card'):
+                                    self.object_area_card.findChild(QLabel, "card-value").setText(f"{area:,}")
+                            else:
                                 QToolTip.hideText()
                                 if hasattr(self, 'object_area_card'):
                                     self.object_area_card.findChild(QLabel, "card-value").setText(f"{self.total_object_area:,}")
@@ -549,16 +590,16 @@ class ImageProcessingApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please upload an image first!")
             return
         self.is_cropping = True
+        self.selection_mode = "crop"
         self.crop_btn.setEnabled(False)
         self.crop_confirmation_widget.show()
         self.apply_crop_btn.setEnabled(False)
         self.original_image_label.setCursor(Qt.CrossCursor)
-        self.status_value.setText("Crop Mode - Click and drag to select area")
-        self.status_value.setObjectName("status-value-processing")
-        self.apply_styles()
+        self.set_status("Crop Mode - Click and drag to select area", "processing")
 
-    def calculate_scaled_crop_rect(self):
-        if not self.original_image or self.crop_rect.isNull():
+    def calculate_scaled_crop_rect(self, image=None):
+        image = image or self.original_image
+        if not image or self.crop_rect.isNull():
             return None
         pixmap = self.original_image_label.pixmap()
         if not pixmap:
@@ -570,7 +611,7 @@ class ImageProcessingApp(QMainWindow):
         adjusted_rect = QRect(self.crop_rect.x() - offset_x, self.crop_rect.y() - offset_y,
                               self.crop_rect.width(), self.crop_rect.height())
         adjusted_rect = adjusted_rect.intersected(QRect(0, 0, pixmap_size.width(), pixmap_size.height()))
-        original_width, original_height = self.original_image.size
+        original_width, original_height = image.size
         scale_x = original_width / pixmap_size.width()
         scale_y = original_height / pixmap_size.height()
         scaled_rect = QRect(int(adjusted_rect.x() * scale_x), int(adjusted_rect.y() * scale_y),
@@ -581,6 +622,9 @@ class ImageProcessingApp(QMainWindow):
     def apply_crop(self):
         if not self.original_image or self.crop_rect.isNull():
             return
+        if self.selection_mode == "roi":
+            self.apply_roi()
+            return
         scaled_rect = self.calculate_scaled_crop_rect()
         if not scaled_rect or scaled_rect.width() < 10 or scaled_rect.height() < 10:
             QMessageBox.warning(self, "Warning", "Invalid crop area! Please select a larger area.")
@@ -590,18 +634,14 @@ class ImageProcessingApp(QMainWindow):
                                                 scaled_rect.y() + scaled_rect.height()))
         self.cropped_image = cropped_pil
         self.crop_applied = True
-        byte_arr = io.BytesIO()
-        cropped_pil.save(byte_arr, format='PNG')
-        pixmap = QPixmap()
-        pixmap.loadFromData(byte_arr.getvalue())
-        scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.original_image_label.setPixmap(scaled_pixmap)
+        self.current_roi = None   # ROI coordinates referred to the uncropped image
+        self.update_roi_button()
+        scaled_pixmap = self.show_preview(self.original_image_label, cropped_pil)
         self.processed_image_label.setPixmap(scaled_pixmap)
         self.processed_placeholder.hide()
         self.processed_image_label.show()
         self.processed_image = None
-        self.processed_status.setText("Cropped")
-        self.processed_status.setObjectName("status-badge-pending")
+        self.set_badge("Cropped", "pending")
         self.save_btn.setEnabled(False)
         self.process_btn.setEnabled(True)
         self.update_histogram(cropped_pil)
@@ -614,17 +654,61 @@ class ImageProcessingApp(QMainWindow):
 
     def cancel_cropping(self):
         self.is_cropping = False
+        if self.selection_mode == "roi":
+            self.apply_crop_btn.setText(self.apply_crop_text)
+        self.selection_mode = "crop"
         self.crop_start = QPoint()
         self.crop_end = QPoint()
         self.crop_rect = QRect()
         self.crop_btn.setEnabled(True)
+        self.roi_btn.setEnabled(self.original_image is not None)
         self.crop_confirmation_widget.hide()
         self.apply_crop_btn.setEnabled(False)
         self.original_image_label.setCursor(Qt.ArrowCursor)
         self.original_image_label.update()
-        self.status_value.setText("Ready for Processing")
-        self.status_value.setObjectName("status-value-ready")
-        self.apply_styles()
+        self.set_status("Ready for Processing", "ready")
+
+    def toggle_roi(self):
+        """Start selecting a region of interest, or clear the current one."""
+        if self.current_roi is not None:
+            self.current_roi = None
+            self.update_roi_button()
+            self.set_status("ROI cleared - filters use the whole image", "ready")
+            self.update_histogram(self.processed_image or self.current_source_image())
+            return
+        if not self.original_image:
+            QMessageBox.warning(self, "Warning", "Please upload an image first!")
+            return
+        self.is_cropping = True
+        self.selection_mode = "roi"
+        self.crop_btn.setEnabled(False)
+        self.roi_btn.setEnabled(False)
+        self.apply_crop_text = self.apply_crop_btn.text()
+        self.apply_crop_btn.setText(" Set ROI")
+        self.crop_confirmation_widget.show()
+        self.apply_crop_btn.setEnabled(False)
+        self.original_image_label.setCursor(Qt.CrossCursor)
+        self.set_status("ROI Mode - Click and drag to select the region to process", "processing")
+
+    def apply_roi(self):
+        source = self.current_source_image()
+        scaled_rect = self.calculate_scaled_crop_rect(source)
+        if not scaled_rect or scaled_rect.width() < 10 or scaled_rect.height() < 10:
+            QMessageBox.warning(self, "Warning", "Invalid ROI! Please select a larger area.")
+            return
+        self.current_roi = (scaled_rect.x(), scaled_rect.y(),
+                            scaled_rect.x() + scaled_rect.width(), scaled_rect.y() + scaled_rect.height())
+        self.cancel_cropping()
+        self.update_roi_button()
+        self.update_histogram(self.processed_image or source)
+        self.set_status(f"ROI set: {scaled_rect.width()} x {scaled_rect.height()} px", "ready")
+
+    def update_roi_button(self):
+        if hasattr(self, 'roi_btn'):
+            self.roi_btn.setText(" Clear ROI" if self.current_roi is not None else " Set ROI")
+
+    def current_source_image(self):
+        return self.cropped_image if self.crop_applied and self.cropped_image else self.original_image
 
     def update_image_info_after_crop(self, cropped_image):
         width, height = cropped_image.size
@@ -645,17 +729,16 @@ class ImageProcessingApp(QMainWindow):
                 self.original_image = self.image_processor.pil_image
                 self.cropped_image = None
                 self.crop_applied = False
-                pixmap = QPixmap(file_path)
-                scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.original_image_label.setPixmap(scaled_pixmap)
+                self.current_roi = None
+                self.update_roi_button()
+                scaled_pixmap = self.show_preview(self.original_image_label, self.original_image)
                 self.original_placeholder.hide()
                 self.original_image_label.show()
                 self.processed_image = None
                 self.processed_image_label.setPixmap(scaled_pixmap)
                 self.processed_placeholder.hide()
                 self.processed_image_label.show()
-                self.processed_status.setText("Original")
-                self.processed_status.setObjectName("status-badge-pending")
+                self.set_badge("Original", "pending")
                 self.save_btn.setEnabled(False)
                 self.process_btn.setEnabled(True)
                 if self.centroid_btn:
@@ -664,11 +747,10 @@ class ImageProcessingApp(QMainWindow):
                     self.centroid_label.setText("Not computed")
                 self.update_histogram(self.original_image)
                 self.update_info_cards(image_info)
-                self.status_value.setText("Image Uploaded")
-                self.status_value.setObjectName("status-value-uploaded")
+                self.set_status("Image Uploaded", "uploaded")
                 self.update_binary_projections()
-                self.apply_styles()
                 self.crop_btn.setEnabled(True)
+                self.roi_btn.setEnabled(True)
                 if self.is_cropping:
                     self.cancel_cropping()
             except Exception as e:
@@ -685,24 +767,25 @@ class ImageProcessingApp(QMainWindow):
         if not image_to_process:
             QMessageBox.warning(self, "Warning", "Please upload an image first!")
             return
-        grayscale_img = self.grayscale_converter.convert_to_grayscale(image_to_process)
-        if not grayscale_img:
-            QMessageBox.warning(self, "Warning", "Failed to convert to grayscale.")
-            return
+        def gray_then_filter(image):
+            grayscale_img = self.grayscale_converter.convert_to_grayscale(image)
+            if not grayscale_img:
+                raise Exception("Failed to convert to grayscale.")
+            return filter_func(grayscale_img)
+
         try:
-            processed = filter_func(grayscale_img)
+            if self.current_roi is not None:
+                # Grayscale and filter run on the ROI crop only, like every other filter
+                from modules.roi_processor import ROIProcessor
+                processed = ROIProcessor(self.current_roi).apply(image_to_process, gray_then_filter)
+            else:
+                processed = gray_then_filter(image_to_process)
             self.processed_image = processed
             self.processed_original_size = (processed.width, processed.height)
-            byte_arr = io.BytesIO()
-            processed.save(byte_arr, format='PNG')
-            pixmap = QPixmap()
-            pixmap.loadFromData(byte_arr.getvalue())
-            scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.processed_image_label.setPixmap(scaled_pixmap)
+            self.show_preview(self.processed_image_label, processed)
             self.processed_placeholder.hide()
             self.processed_image_label.show()
-            self.processed_status.setText("Color Filter")
-            self.processed_status.setObjectName("status-badge-ready")
+            self.set_badge("Color Filter", "ready")
             self.save_btn.setEnabled(True)
             self.update_histogram(processed)
             self.update_object_area(processed, "color_filter")
@@ -713,6 +796,38 @@ class ImageProcessingApp(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to apply filter: {str(e)}")
 
+    def show_color_gallery(self):
+        """Contact sheet of every colour preset; clicking a thumbnail applies it."""
+        from modules.color_filter import ColorFilter, COLOR_MAPS
+        image_to_process = self.cropped_image if self.crop_applied and self.cropped_image else self.original_image
+        if not image_to_process:
+            QMessageBox.warning(self, "Warning", "Please upload an image first!")
+            return
+        try:
+            thumbnails = ColorFilter.gallery(image_to_process, thumbnail_size=GALLERY_THUMBNAIL_SIZE)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to render presets: {str(e)}")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Color Filter Presets")
+        layout = QGridLayout(dialog)
+        layout.setSpacing(10)
+        for index, (preset, thumbnail) in enumerate(thumbnails.items()):
+            byte_arr = io.BytesIO()
+            thumbnail.save(byte_arr, format='PNG', compress_level=1)
+            pixmap = QPixmap()
+            pixmap.loadFromData(byte_arr.getvalue())
+            btn = QToolButton()
+            btn.setIcon(QIcon(pixmap))
+            btn.setIconSize(pixmap.size())
+            btn.setText(COLOR_MAPS[preset][0])
+            btn.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(lambda checked, f=getattr(ColorFilter, preset): (dialog.accept(), self.apply_color_filter(f)))
+            layout.addWidget(btn, index // 5, index % 5)
+        dialog.exec()
+
     def process_image(self):
         if hasattr(self, 'scroll_area'):
             old_scroll = self.scroll_area.verticalScrollBar().value()
@@ -724,33 +839,29 @@ class ImageProcessingApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please upload an image first!")
             return
 
-        self.status_value.setText("Processing...")
-        self.status_value.setObjectName("status-value-processing")
-        self.processed_status.setText("Processing")
-        self.processed_status.setObjectName("status-badge-processing")
+        self.set_status("Processing...", "processing")
+        self.set_badge("Processing", "processing")
         self.process_btn.setEnabled(False)
         self.save_btn.setEnabled(False)
-        self.apply_styles()
         QApplication.processEvents()
 
         try:
-            processed = self.apply_filter(image_to_process, self.current_filter)
+            if self.current_roi is not None and self.current_filter != "object_boxing":
+                # Only the ROI is filtered; the rest of the frame is kept as is
+                from modules.roi_processor import ROIProcessor
+                processed = ROIProcessor(self.current_roi).apply(
+                    image_to_process, self.apply_filter_cached, self.current_filter)
+            else:
+                processed = self.apply_filter_cached(image_to_process, self.current_filter)
             self.processed_image = processed
             self.processed_original_size = (processed.width, processed.height)
 
-            byte_arr = io.BytesIO()
-            processed.save(byte_arr, format='PNG')
-            pixmap = QPixmap()
-            pixmap.loadFromData(byte_arr.getvalue())
-            scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.processed_image_label.setPixmap(scaled_pixmap)
+            self.show_preview(self.processed_image_label, processed)
             self.processed_placeholder.hide()
             self.processed_image_label.show()
 
-            self.status_value.setText("Processing Complete")
-            self.status_value.setObjectName("status-value-complete")
-            self.processed_status.setText("Complete")
-            self.processed_status.setObjectName("status-badge-ready")
+            self.set_status("Processing Complete", "complete")
+            self.set_badge("Complete", "ready")
             self.save_btn.setEnabled(True)
             self.process_btn.setEnabled(True)
 
@@ -763,9 +874,11 @@ class ImageProcessingApp(QMainWindow):
                 self.centroid_label.setText("Click 'Show Centroid' to compute")
 
             crop_info = " (cropped)" if self.crop_applied else ""
+            if self.current_roi is not None:
+                crop_info += " (ROI only)"
 
             if self.current_filter == "custom_bw":
-                threshold = self.bw_threshold_slider.value()
+                threshold = self.current_bw_threshold
                 QMessageBox.information(self, "Success",
                     f"Image{crop_info} processed successfully using Black & White filter!\nThreshold: {threshold}")
             elif self.current_filter == "background_removal":
@@ -785,9 +898,14 @@ class ImageProcessingApp(QMainWindow):
                 QMessageBox.information(self, "Success",
                     f"Image{crop_info} translated by ({dx}, {dy}) pixels!")
             elif self.current_filter == "object_boxing":
-                threshold = self.current_object_threshold
+                if self.current_object_method == "threshold":
+                    segmentation = f"Luminance threshold: {self.current_object_threshold}"
+                else:
+                    segmentation = "Segmentation: background color"
+                dropped = self.object_boxer.dropped_objects
+                dropped_info = f"\n{dropped} object(s) outside the area/count limits ignored." if dropped else ""
                 QMessageBox.information(self, "Success",
-                    f"Objects detected and boxed successfully!\nDetection threshold: {threshold}\nBackground set to gray.")
+                    f"Objects detected and boxed successfully!\n{segmentation}{dropped_info}\nBackground set to gray.")
             elif self.current_filter == "convolution":
                 filter_name = self.conv_controls.preset_combo.currentText() if hasattr(self, 'conv_controls') else "Convolution"
                 QMessageBox.information(self, "Success",
@@ -802,20 +920,25 @@ class ImageProcessingApp(QMainWindow):
                 else:
                     QMessageBox.information(self, "Success",
                         f"Image{crop_info} thresholded (adaptive) with block size {self.current_adaptive_block}, C={self.current_adaptive_c}!")
+            elif self.current_filter == "edges":
+                if self.current_edge_method == "canny":
+                    QMessageBox.information(self, "Success",
+                        f"Canny edges{crop_info} detected: {self.edge_detector.edge_pixels} edge pixels\n"
+                        f"Low: {self.current_edge_low}, High: {self.current_edge_high}, Sigma: {self.current_edge_sigma:.1f}")
+                else:
+                    QMessageBox.information(self, "Success",
+                        f"Image{crop_info} processed with {self.edge_method_combo.currentText()} edge filter.")
             else:
                 QMessageBox.information(self, "Success",
                     f"Image{crop_info} processed successfully using Grayscale filter!")
 
         except Exception as e:
-            self.status_value.setText("Processing Failed")
-            self.status_value.setObjectName("status-value-ready")
-            self.processed_status.setText("Failed")
-            self.processed_status.setObjectName("status-badge-pending")
+            self.set_status("Processing Failed", "ready")
+            self.set_badge("Failed", "pending")
             self.save_btn.setEnabled(False)
             self.process_btn.setEnabled(True)
             QMessageBox.critical(self, "Error", f"Failed to process image: {str(e)}")
 
-        self.apply_styles()
         if old_scroll is not None:
             QTimer.singleShot(50, lambda: self.scroll_area.verticalScrollBar().setValue(old_scroll))
 
@@ -825,53 +948,161 @@ class ImageProcessingApp(QMainWindow):
             return
         file_dialog = QFileDialog()
         if self.current_filter in ("background_removal", "object_boxing"):
-            file_path, _ = file_dialog.getSaveFileName(self, "Save Processed Image", "",
-                "PNG Image (*.png);;All Files (*)")
-            if file_path and not file_path.lower().endswith('.png'):
-                file_path += '.png'
-            format = 'PNG'
+            # Formats that keep the alpha channel / exact colours
+            profiles = {
+                "PNG Image - fast (*.png)": 'png_fast',
+                "PNG Image - optimized (*.png)": 'png_optimized',
+                "WebP Image - lossless (*.webp)": 'webp_lossless',
+                "TIFF Image - LZW (*.tiff *.tif)": 'tiff_lzw',
+                "TIFF Image - Deflate (*.tiff *.tif)": 'tiff_deflate',
+            }
         else:
-            file_path, _ = file_dialog.getSaveFileName(self, "Save Processed Image", "",
-                "PNG Image (*.png);;JPEG Image (*.jpg *.jpeg);;BMP Image (*.bmp);;TIFF Image (*.tiff);;All Files (*)")
-            if file_path:
-                if file_path.lower().endswith('.jpg') or file_path.lower().endswith('.jpeg'):
-                    format = 'JPEG'
-                elif file_path.lower().endswith('.png'):
-                    format = 'PNG'
-                elif file_path.lower().endswith('.bmp'):
-                    format = 'BMP'
-                elif file_path.lower().endswith('.tiff'):
-                    format = 'TIFF'
-                else:
-                    file_path += '.png'
-                    format = 'PNG'
-        if file_path:
-            try:
-                self.processed_image.save(file_path, format=format)
-                QMessageBox.information(self, "Success", f"Image saved successfully to:\n{file_path}")
-                self.status_value.setText("Image Saved")
-                self.status_value.setObjectName("status-value-complete")
-                self.apply_styles()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save image: {str(e)}")
+            profiles = {
+                "PNG Image - fast (*.png)": 'png_fast',
+                "PNG Image - optimized (*.png)": 'png_optimized',
+                "JPEG Image (*.jpg *.jpeg)": 'jpeg',
+                "JPEG Image - high quality (*.jpg *.jpeg)": 'jpeg_high',
+                "WebP Image - lossless (*.webp)": 'webp_lossless',
+                "TIFF Image - LZW (*.tiff *.tif)": 'tiff_lzw',
+                "TIFF Image - Deflate (*.tiff *.tif)": 'tiff_deflate',
+                "BMP Image (*.bmp)": 'bmp',
+            }
+        file_path, selected_filter = file_dialog.getSaveFileName(self, "Save Processed Image", "",
+            ";;".join(profiles) + ";;All Files (*)")
+        if not file_path:
+            return
+        profile = profiles.get(selected_filter)
+        if profile is None:
+            profile = ImageSaver.profile_for_path(file_path)
+            if profile not in profiles.values():
+                profile = 'png_fast'
+        file_path = ImageSaver.ensure_extension(file_path, profile)
+
+        # Encode on a background thread; poll for completion from the UI thread
+        try:
+            self.save_future = ImageSaver.save_async(self.processed_image, file_path, profile)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save image: {str(e)}")
+            return
+        self.save_btn.setEnabled(False)
+        self.set_status("Saving...", "processing")
+        QTimer.singleShot(50, self.check_save_finished)
+
+    def check_save_finished(self):
+        if self.save_future is None:
+            return
+        if not self.save_future.done():
+            QTimer.singleShot(50, self.check_save_finished)
+            return
+        future, self.save_future = self.save_future, None
+        self.save_btn.setEnabled(True)
+        try:
+            file_path = future.result()
+            QMessageBox.information(self, "Success", f"Image saved successfully to:\n{file_path}")
+            self.set_status("Image Saved", "complete")
+        except Exception as e:
+            self.set_status("Save Failed", "ready")
+            QMessageBox.critical(self, "Error", f"Failed to save image: {str(e)}")
+
+    def get_filter_params(self, filter_name):
+        """Parameters that determine a filter's output (used as cache key)."""
+        if filter_name == "custom_bw":
+            return {'threshold': self.current_bw_threshold}
+        elif filter_name == "rotate":
+            return {'angle': self.current_rotation_angle, 'resample': self.current_rotation_resample,
+                    'expand': self.current_rotation_expand}
+        elif filter_name == "mirror":
+            return {'mirror_type': self.current_mirror_type}
+        elif filter_name == "translate":
+            return {'dx': self.current_translate_dx, 'dy': self.current_translate_dy}
+        elif filter_name == "object_boxing":
+            return {'threshold': self.current_object_threshold, 'method': self.current_object_method,
+                    'min_area': self.current_object_min_area, 'max_objects': self.current_object_max_objects,
+                    'roi': self.current_roi}
+        elif filter_name == "convolution":
+            if not hasattr(self, 'conv_controls'):
+                return None
+            preset = self.conv_controls.preset_combo.currentText()
+            if preset == "Custom kernel":
+                kernel = self.conv_controls.get_custom_kernel()
+                if kernel is None:
+                    return None
+                return {'kernel': kernel}
+            return {'preset': preset}
+        elif filter_name == "threshold":
+            if self.current_threshold_type == "single":
+                return {'type': 'single', 't': self.current_single_t}
+            elif self.current_threshold_type == "range":
+                return {'type': 'range', 't1': self.current_range_t1, 't2': self.current_range_t2}
+            return {'type': 'adaptive', 'block_size': self.current_adaptive_block, 'c': self.current_adaptive_c}
+        elif filter_name == "edges":
+            return {'method': self.current_edge_method, 'low': self.current_edge_low,
+                    'high': self.current_edge_high, 'sigma': self.current_edge_sigma}
+        return {}
+
+    def capture_filter_state(self, filter_name):
+        """Side results of a filter run that the UI reads later (hover, area)."""
+        if filter_name == "object_boxing":
+            return {'objects': self.object_boxer.objects, 'object_area': self.object_boxer.object_area,
+                    'label_map': self.object_boxer.label_map, 'dropped_objects': self.object_boxer.dropped_objects}
+        elif filter_name == "background_removal":
+            return {'objects': self.black_white_converter.background_remover.objects}
+        elif filter_name == "edges":
+            return {'edge_pixels': self.edge_detector.edge_pixels}
+        return {}
+
+    def restore_filter_state(self, filter_name, image, state):
+        if filter_name == "object_boxing":
+            self.object_boxer.result_image = image
+            self.object_boxer.set_objects(state.get('objects', []), state.get('label_map'))
+            self.object_boxer.object_area = state.get('object_area', 0)
+            self.object_boxer.dropped_objects = state.get('dropped_objects', 0)
+        elif filter_name == "background_removal":
+            remover = self.black_white_converter.background_remover
+            remover.removed_background_image = image
+            remover.width, remover.height = image.size
+            remover.objects = state.get('objects', [])
+        elif filter_name == "edges":
+            self.edge_detector.edge_pixels = state.get('edge_pixels', 0)
+
+    def apply_filter_cached(self, image, filter_name):
+        """apply_filter with a result cache keyed by image content and parameters."""
+        params = self.get_filter_params(filter_name)
+        if params is None:
+            return self.apply_filter(image, filter_name)
+        key = ResultCache.make_key(image, filter_name, params)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            processed, state = cached
+            self.restore_filter_state(filter_name, processed, state)
+            return processed
+        processed = self.apply_filter(image, filter_name)
+        self.result_cache.put(key, processed, self.capture_filter_state(filter_name))
+        return processed
 
     def apply_filter(self, image, filter_name):
         if filter_name == "custom_grayscale":
             return self.grayscale_converter.convert_to_grayscale(image)
         elif filter_name == "custom_bw":
-            threshold = self.bw_threshold_slider.value()
+            threshold = self.current_bw_threshold
             return self.black_white_converter.convert_to_black_white(image, threshold=threshold)
         elif filter_name == "background_removal":
-            return self.black_white_converter.remove_background(image, method='otsu')
+            # Coarse-to-fine: level picked from the image size, full resolution only near edges
+            return self.black_white_converter.remove_background(image, method='otsu', coarse_level=None)
         elif filter_name == "rotate":
             angle = self.current_rotation_angle
-            return self.image_rotator.rotate_image(image, angle)
+            return self.image_rotator.rotate_image(image, angle, resample=self.current_rotation_resample,
+                                                   expand=self.current_rotation_expand)
         elif filter_name == "mirror":
             return self.image_mirror.mirror(image, self.current_mirror_type)
         elif filter_name == "translate":
             return self.image_translator.translate_image(image, self.current_translate_dx, self.current_translate_dy)
         elif filter_name == "object_boxing":
-            img, area = self.object_boxer.box_objects(image, threshold=self.current_object_threshold, include_full_image=True)
+            img, area = self.object_boxer.box_objects(image, threshold=self.current_object_threshold, include_full_image=True,
+                                                      method=self.current_object_method,
+                                                      min_area=self.current_object_min_area,
+                                                      max_objects=self.current_object_max_objects or None,
+                                                      roi=self.current_roi)
             self.object_boxer.object_area = area
             return img
         elif filter_name == "convolution":
@@ -886,16 +1117,56 @@ class ImageProcessingApp(QMainWindow):
                 return self.threshold_converter.apply_range_threshold(image, self.current_range_t1, self.current_range_t2)
             else:
                 return self.threshold_converter.apply_adaptive_threshold(image, self.current_adaptive_block, self.current_adaptive_c)
+        elif filter_name == "edges":
+            return self.edge_detector.detect(image, self.current_edge_method, low=self.current_edge_low,
+                                             high=self.current_edge_high, sigma=self.current_edge_sigma)
         else:
-            return self.grayscale_converter.convert_manual_loop(image)
+            return self.grayscale_converter.convert_to_grayscale(image)
 
     def apply_styles(self):
         from gui.styles.app_styles import get_app_styles
         self.setStyleSheet(get_app_styles())
 
+    def set_status(self, text, state):
+        """Status bar text; state is ready / uploaded / processing / complete."""
+        from gui.styles.app_styles import set_style_state
+        self.status_value.setText(text)
+        set_style_state(self.status_value, state)
+
+    def set_badge(self, text, state):
+        """Processed-image badge text; state is pending / processing / ready."""
+        from gui.styles.app_styles import set_style_state
+        self.processed_status.setText(text)
+        set_style_state(self.processed_status, state)
+
+    def show_preview(self, label, pil_image):
+        """
+        Show an image scaled into the 400x300 preview. Scaling starts from the
+        smallest pyramid level that is still at least the preview size.
+        """
+        from modules.image_pyramid import ImagePyramid
+        source = ImagePyramid.get(pil_image).for_size(PREVIEW_SIZE)
+        byte_arr = io.BytesIO()
+        source.save(byte_arr, format='PNG', compress_level=1)
+        pixmap = QPixmap()
+        pixmap.loadFromData(byte_arr.getvalue())
+        scaled_pixmap = pixmap.scaled(PREVIEW_SIZE[0], PREVIEW_SIZE[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        label.setPixmap(scaled_pixmap)
+        return scaled_pixmap
+
     def update_histogram(self, pil_image):
         if pil_image is None:
             return
-        r_hist, g_hist, b_hist = PixelStats.get_rgb_histograms(pil_image)
+        from modules.image_pyramid import ImagePyramid
+        if self.current_roi is not None:
+            # Statistics cover the region of interest only
+            from modules.roi_processor import ROIProcessor
+            pil_image = ROIProcessor(self.current_roi).crop(pil_image)
+        # Estimate from a subsampled level, scaled back to full-image counts
+        sample = ImagePyramid.get(pil_image, 'nearest').for_pixels(HISTOGRAM_MAX_PIXELS)
+        r_hist, g_hist, b_hist = PixelStats.get_rgb_histograms(sample)
+        if sample is not pil_image:
+            factor = (pil_image.width * pil_image.height) / (sample.width * sample.height)
+            r_hist, g_hist, b_hist = ([round(v * factor) for v in hist] for hist in (r_hist, g_hist, b_hist))
         if hasattr(self, 'histogram_widget'):
-            self.histogram_widget.set_histograms(r_hist, g_hist, b_hist)
\ No newline at end of file
+            self.histogram_widget.content().set_histograms(r_hist, g_hist, b_hist)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import importlib
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtCore import QTimer
+from gui.startup_timer import startup_timer
+
+
+class LazyComponent:
+    """
+    Class attribute that imports and instantiates a processing component the
+    first time it is accessed on an instance, e.g.
+
+        object_boxer = LazyComponent('modules.object_boxer', 'ObjectBoxer')
+
+    The instance is then stored on the object, so later lookups are plain
+    attribute reads.
+    """
+
+    def __init__(self, module_name, class_name):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.attr_name = None
+
+    def __set_name__(self, owner, name):
+        self.attr_name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        cls = getattr(importlib.import_module(self.module_name), self.class_name)
+        component = cls()
+        instance.__dict__[self.attr_name] = component
+        startup_timer.mark(f"loaded {self.class_name}")
+        return component
+
+
+class DeferredWidget(QWidget):
+    """
+    Placeholder that builds its real content from `factory` on first use:
+    when it is first shown (build_on_show), when build_later() fires, or when
+    content() is called.
+    """
+
+    def __init__(self, factory, name=None, build_on_show=True, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._content = None
+        self.name = name or getattr(factory, '__name__', 'widget')
+        self.build_on_show = build_on_show
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def is_built(self):
+        return self._content is not None
+
+    def content(self):
+        """The real widget, built now if needed."""
+        if self._content is None:
+            self._content = self._factory()
+            self.layout().addWidget(self._content)
+            startup_timer.mark(f"built {self.name}")
+        return self._content
+
+    def build_later(self, delay_ms=0):
+        """Build once control returns to the event loop (after the window is painted)."""
+        QTimer.singleShot(delay_ms, self.content)
+
+    def showEvent(self, event):
+        if self.build_on_show:
+            self.content()
+        super().showEvent(event)
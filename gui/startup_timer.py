@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+# Enable with VISIONPRO_STARTUP_TIMING=1 or `python main.py --startup-timing`
+ENV_VAR = 'VISIONPRO_STARTUP_TIMING'
+FLAG = '--startup-timing'
+
+
+class StartupTimer:
+    """Record named checkpoints during start-up and print them as a report."""
+
+    def __init__(self):
+        self.enabled = os.environ.get(ENV_VAR, '') not in ('', '0') or FLAG in sys.argv
+        self.start = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, label):
+        """Record a checkpoint (ignored when disabled or after the report)."""
+        if self.enabled and not self.reported:
+            self.marks.append((label, time.perf_counter()))
+
+    def report(self, stream=None):
+        """Print elapsed and step times for every checkpoint, once."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        stream = stream or sys.stderr
+        print("Startup timing (ms):", file=stream)
+        print(f"{'total':>9} {'step':>9}  checkpoint", file=stream)
+        previous = self.start
+        for label, stamp in self.marks:
+            print(f"{(stamp - self.start) * 1000:9.1f} {(stamp - previous) * 1000:9.1f}  {label}", file=stream)
+            previous = stamp
+
+
+startup_timer = StartupTimer()
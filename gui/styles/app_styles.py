@@ -1,4 +1,9 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
 def get_app_styles():
+    """The application stylesheet, built once and reused."""
     return """
         /* Global Styles */
         QWidget {
@@ -98,25 +103,25 @@ def get_app_styles():
             color: #9CA3AF;
         }
         
-        #status-value-ready {
+        #status-value[state="ready"] {
             font-size: 16px;
             font-weight: 600;
             color: #10B981;
         }
         
-        #status-value-uploaded {
+        #status-value[state="uploaded"] {
             font-size: 16px;
             font-weight: 600;
             color: #F59E0B;
         }
         
-        #status-value-processing {
+        #status-value[state="processing"] {
             font-size: 16px;
             font-weight: 600;
             color: #4F46E5;
         }
         
-        #status-value-complete {
+        #status-value[state="complete"] {
             font-size: 16px;
             font-weight: 600;
             color: #10B981;
@@ -230,20 +235,20 @@ def get_app_styles():
             cursor: not-allowed;
         }
         
-        #status-badge-pending, #status-badge-processing, #status-badge-ready {
+        #status-badge {
             border-radius: 4px;
             font-size: 12px;
             font-weight: 600;
         }
-        #status-badge-pending {
+        #status-badge[state="pending"] {
             background-color: rgba(245, 158, 11, 0.2);
             color: #F59E0B;
         }
-        #status-badge-processing {
+        #status-badge[state="processing"] {
             background-color: rgba(79, 70, 229, 0.2);
             color: #4F46E5;
         }
-        #status-badge-ready {
+        #status-badge[state="ready"] {
             background-color: rgba(16, 185, 129, 0.2);
             color: #10B981;
         }
@@ -481,6 +486,27 @@ def get_app_styles():
             cursor: not-allowed;
         }
 
+        #roi-btn {
+            background-color: #0EA5E9;
+            color: white;
+            border: none;
+            border-radius: 8px;
+            padding: 10px 20px;
+            font-weight: 600;
+            font-size: 14px;
+            margin-right: 8px;
+        }
+
+        #roi-btn:hover:enabled {
+            background-color: #0284C7;
+            transform: translateY(-2px);
+        }
+
+        #roi-btn:disabled {
+            opacity: 0.5;
+            cursor: not-allowed;
+        }
+
         #apply-crop-btn {
             background-color: #10B981;
             color: white;
@@ -543,4 +569,18 @@ def get_app_styles():
         }
 
 
-    """
\ No newline at end of file
+    """
+
+
+def set_style_state(widget, state):
+    """
+    Switch a widget's `state` property (matched by selectors such as
+    #status-badge[state="ready"]) and re-polish only that widget.
+    """
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
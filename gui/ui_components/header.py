@@ -136,6 +136,7 @@ def create_filter_navbar(app_instance):
     tab_bar.addTab("Object Boxing")   
     tab_bar.addTab("Convolution")
     tab_bar.addTab("Threshold")            # NEW
+    tab_bar.addTab("Edge Detection")
     tab_bar.setExpanding(True)
     tab_bar.setStyleSheet("""
         QTabBar::tab {
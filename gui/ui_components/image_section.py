@@ -2,6 +2,7 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 import qtawesome as qta
+from gui.lazy import DeferredWidget
 
 def create_image_processing_section(app_instance):
     widget = QWidget()
@@ -68,37 +69,40 @@ def create_card_header(title, icon, is_original, app_instance):
 
     if is_original:
         crop_btn = create_crop_button(app_instance)
+        roi_btn = create_roi_button(app_instance)
         upload_btn = create_upload_button(app_instance)
         top_layout.addWidget(crop_btn)
+        top_layout.addWidget(roi_btn)
         top_layout.addWidget(upload_btn)
 
+        # Filter controls are built the first time their tab is selected
         # B&W threshold slider – initially hidden
-        threshold_widget = create_threshold_widget(app_instance)
+        threshold_widget = DeferredWidget(lambda: create_threshold_widget(app_instance), "B&W threshold controls")
         threshold_widget.setVisible(False)
         app_instance.bw_threshold_widget = threshold_widget
 
         # Rotation widget – initially hidden
-        rotation_widget = create_rotation_widget(app_instance)
+        rotation_widget = DeferredWidget(lambda: create_rotation_widget(app_instance), "rotation controls")
         rotation_widget.setVisible(False)
         app_instance.rotation_widget = rotation_widget
 
         # Mirror widget – initially hidden
-        mirror_widget = create_mirror_widget(app_instance)
+        mirror_widget = DeferredWidget(lambda: create_mirror_widget(app_instance), "mirror controls")
         mirror_widget.setVisible(False)
         app_instance.mirror_widget = mirror_widget
 
         # Translation widget – initially hidden
-        translation_widget = create_translation_widget(app_instance)
+        translation_widget = DeferredWidget(lambda: create_translation_widget(app_instance), "translation controls")
         translation_widget.setVisible(False)
         app_instance.translation_widget = translation_widget
 
         # Object Boxing widget – initially hidden
-        object_boxing_widget = create_object_boxing_widget(app_instance)
+        object_boxing_widget = DeferredWidget(lambda: create_object_boxing_widget(app_instance), "object boxing controls")
         object_boxing_widget.setVisible(False)
         app_instance.object_boxing_widget = object_boxing_widget
 
         # NEW: Threshold controls (single / range / adaptive) – initially hidden
-        threshold_controls_widget = create_threshold_controls_widget(app_instance)
+        threshold_controls_widget = DeferredWidget(lambda: create_threshold_controls_widget(app_instance), "threshold controls")
         threshold_controls_widget.setVisible(False)
         app_instance.threshold_controls_widget = threshold_controls_widget
 
@@ -110,6 +114,12 @@ def create_card_header(title, icon, is_original, app_instance):
         header_layout.addWidget(object_boxing_widget)
         header_layout.addWidget(threshold_controls_widget)
 
+        # Edge detection controls – initially hidden
+        edge_controls_widget = DeferredWidget(lambda: create_edge_controls_widget(app_instance), "edge detection controls")
+        edge_controls_widget.setVisible(False)
+        app_instance.edge_controls_widget = edge_controls_widget
+        header_layout.addWidget(edge_controls_widget)
+
         return header, crop_btn, threshold_widget, rotation_widget, mirror_widget, translation_widget, object_boxing_widget, threshold_controls_widget
     else:
         right_widget, processed_status, save_btn, process_btn = create_processed_header_right(app_instance)
@@ -167,6 +177,24 @@ def create_crop_button(app_instance):
 
     return crop_btn
 
+def create_roi_button(app_instance):
+    roi_btn = QPushButton(" Set ROI")
+    roi_btn.setObjectName("roi-btn")
+    roi_btn.setCursor(Qt.PointingHandCursor)
+    roi_btn.clicked.connect(app_instance.toggle_roi)
+    roi_btn.setEnabled(False)
+    roi_btn.setToolTip("Process only a region; the rest of the frame is left untouched")
+
+    try:
+        roi_icon = qta.icon('fa5s.vector-square', color='white')
+        roi_btn.setIcon(roi_icon)
+        roi_btn.setIconSize(QSize(14, 14))
+    except:
+        roi_btn.setText("▢ Set ROI")
+
+    app_instance.roi_btn = roi_btn
+    return roi_btn
+
 def create_upload_button(app_instance):
     upload_btn = QPushButton(" Upload Image")
     upload_btn.setObjectName("upload-btn")
@@ -189,7 +217,8 @@ def create_processed_header_right(app_instance):
     right_layout.setSpacing(8)
 
     processed_status = QLabel("Waiting")
-    processed_status.setObjectName("status-badge-pending")
+    processed_status.setObjectName("status-badge")
+    processed_status.setProperty("state", "pending")
     processed_status.setFixedSize(70, 28)
     processed_status.setAlignment(Qt.AlignCenter)
 
@@ -303,13 +332,32 @@ def create_rotation_widget(app_instance):
     slider.valueChanged.connect(lambda v: value_label.setText(f"{v}°"))
     slider.valueChanged.connect(lambda v: app_instance.on_rotation_changed(v))
 
+    # Interpolation and canvas options
+    options_widget = QWidget()
+    options_layout = QHBoxLayout(options_widget)
+    options_layout.setContentsMargins(0, 0, 0, 0)
+    resample_label = QLabel("Interpolation:")
+    resample_label.setObjectName("threshold-label")
+    resample_combo = QComboBox()
+    resample_combo.addItems(["Nearest", "Bilinear", "Bicubic"])
+    resample_combo.currentTextChanged.connect(lambda text: app_instance.on_rotation_resample_changed(text.lower()))
+    expand_checkbox = QCheckBox("Expand canvas")
+    expand_checkbox.toggled.connect(app_instance.on_rotation_expand_changed)
+    options_layout.addWidget(resample_label)
+    options_layout.addWidget(resample_combo)
+    options_layout.addStretch()
+    options_layout.addWidget(expand_checkbox)
+
     layout.addWidget(header_widget)
     layout.addWidget(slider)
     layout.addWidget(spinbox)
+    layout.addWidget(options_widget)
 
     app_instance.rotation_slider = slider
     app_instance.rotation_value_label = value_label
     app_instance.rotation_spinbox = spinbox
+    app_instance.rotation_resample_combo = resample_combo
+    app_instance.rotation_expand_checkbox = expand_checkbox
 
     return widget
 
@@ -388,13 +436,24 @@ def create_translation_widget(app_instance):
     return widget
 
 def create_object_boxing_widget(app_instance):
-    """Create threshold slider for object detection sensitivity."""
+    """Create segmentation method, threshold slider and object limits for object detection."""
     widget = QWidget()
     widget.setObjectName("object-boxing-widget")
     layout = QVBoxLayout(widget)
     layout.setContentsMargins(0, 8, 0, 0)
     layout.setSpacing(8)
 
+    method_layout = QHBoxLayout()
+    method_label = QLabel("Segmentation:")
+    method_label.setObjectName("threshold-label")
+    method_combo = QComboBox()
+    method_combo.addItems(["Background color", "Luminance threshold"])
+    method_combo.currentIndexChanged.connect(app_instance.on_object_method_changed)
+    method_layout.addWidget(method_label)
+    method_layout.addWidget(method_combo)
+    method_layout.addStretch()
+    layout.addLayout(method_layout)
+
     threshold_header = QWidget()
     threshold_header_layout = QHBoxLayout(threshold_header)
     threshold_header_layout.setContentsMargins(0, 0, 0, 0)
@@ -421,8 +480,35 @@ def create_object_boxing_widget(app_instance):
     layout.addWidget(threshold_header)
     layout.addWidget(threshold_slider)
 
+    limits_layout = QHBoxLayout()
+    min_area_label = QLabel("Min area:")
+    min_area_label.setObjectName("threshold-label")
+    min_area_spin = QSpinBox()
+    min_area_spin.setRange(0, 10000000)
+    min_area_spin.setValue(0)
+    min_area_spin.setToolTip("Ignore objects smaller than this many pixels")
+    max_objects_label = QLabel("Max objects:")
+    max_objects_label.setObjectName("threshold-label")
+    max_objects_spin = QSpinBox()
+    max_objects_spin.setRange(0, 100000)
+    max_objects_spin.setValue(0)
+    max_objects_spin.setSpecialValueText("No limit")
+    max_objects_spin.setToolTip("Keep only the largest objects (0 = no limit)")
+    limits_layout.addWidget(min_area_label)
+    limits_layout.addWidget(min_area_spin)
+    limits_layout.addWidget(max_objects_label)
+    limits_layout.addWidget(max_objects_spin)
+    limits_layout.addStretch()
+    layout.addLayout(limits_layout)
+
+    min_area_spin.valueChanged.connect(lambda: app_instance.on_object_limits_changed())
+    max_objects_spin.valueChanged.connect(lambda: app_instance.on_object_limits_changed())
+
+    app_instance.object_method_combo = method_combo
     app_instance.object_threshold_slider = threshold_slider
     app_instance.object_threshold_value_label = threshold_value_label
+    app_instance.object_min_area_spin = min_area_spin
+    app_instance.object_max_objects_spin = max_objects_spin
 
     return widget
 
@@ -556,6 +642,62 @@ def create_threshold_controls_widget(app_instance):
 
     return widget
 
+def create_edge_controls_widget(app_instance):
+    """Edge method, Canny hysteresis thresholds and Gaussian sigma."""
+    widget = QWidget()
+    widget.setObjectName("edge-controls-widget")
+    layout = QVBoxLayout(widget)
+    layout.setContentsMargins(0, 8, 0, 0)
+    layout.setSpacing(8)
+
+    method_layout = QHBoxLayout()
+    method_label = QLabel("Method:")
+    method_label.setObjectName("threshold-label")
+    method_combo = QComboBox()
+    method_combo.addItems(["Canny", "Sobel magnitude", "Scharr magnitude", "Gradient orientation"])
+    method_combo.currentIndexChanged.connect(app_instance.on_edge_method_changed)
+    method_layout.addWidget(method_label)
+    method_layout.addWidget(method_combo)
+    method_layout.addStretch()
+    layout.addLayout(method_layout)
+
+    canny_layout = QHBoxLayout()
+    low_label = QLabel("Low:")
+    low_label.setObjectName("threshold-label")
+    low_spin = QSpinBox()
+    low_spin.setRange(0, 1500)
+    low_spin.setValue(50)
+    low_spin.setToolTip("Weak edges (gradient magnitude) kept only when connected to a strong edge")
+    high_label = QLabel("High:")
+    high_label.setObjectName("threshold-label")
+    high_spin = QSpinBox()
+    high_spin.setRange(0, 1500)
+    high_spin.setValue(150)
+    high_spin.setToolTip("Gradient magnitude that starts an edge")
+    sigma_label = QLabel("Sigma:")
+    sigma_label.setObjectName("threshold-label")
+    sigma_spin = QDoubleSpinBox()
+    sigma_spin.setRange(0.5, 5.0)
+    sigma_spin.setSingleStep(0.1)
+    sigma_spin.setValue(1.4)
+    sigma_spin.setToolTip("Gaussian smoothing before the gradient")
+    for label, spin in ((low_label, low_spin), (high_label, high_spin), (sigma_label, sigma_spin)):
+        canny_layout.addWidget(label)
+        canny_layout.addWidget(spin)
+    canny_layout.addStretch()
+    layout.addLayout(canny_layout)
+
+    low_spin.valueChanged.connect(lambda: app_instance.on_edge_params_changed())
+    high_spin.valueChanged.connect(lambda: app_instance.on_edge_params_changed())
+    sigma_spin.valueChanged.connect(lambda: app_instance.on_edge_params_changed())
+
+    app_instance.edge_method_combo = method_combo
+    app_instance.edge_low_spin = low_spin
+    app_instance.edge_high_spin = high_spin
+    app_instance.edge_sigma_spin = sigma_spin
+
+    return widget
+
 def create_image_processing_section(app_instance):
     widget = QWidget()
     layout = QHBoxLayout(widget)
@@ -0,0 +1,156 @@
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+import matplotlib
+matplotlib.use('Qt5Agg')
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+import numpy as np
+from modules.projection import ProjectionAnalyzer
+
+# ---------- Blitting helper ----------
+def nice_limit(value):
+    """Round an axis maximum up to 1, 2 or 5 x 10^k so limits change rarely."""
+    value = max(float(value), 1.0)
+    magnitude = 10 ** np.floor(np.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+class BlitUpdater:
+    """
+    Redraw only the data artists of a figure. A full draw (axes, ticks, labels)
+    is captured as background; data updates restore it and blit the artists.
+    """
+
+    def __init__(self, canvas, artists):
+        self.canvas = canvas
+        self.artists = artists
+        self.background = None
+        self.limits = None
+        for artist in artists:
+            artist.set_animated(True)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+
+    def update(self, limits):
+        """Blit the artists; a full draw only when the axis limits changed."""
+        if self.background is None or limits != self.limits:
+            self.limits = limits
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+# ---------- Histogram Canvas ----------
+class HistogramCanvas(FigureCanvas):
+    def __init__(self, parent=None):
+        self.fig = Figure(figsize=(5, 2.5), dpi=100, facecolor='#1F2937')
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self.axes = self.fig.add_subplot(111)
+        self.axes.set_facecolor('#1F2937')
+        self.axes.tick_params(colors='white')
+        self.axes.set_xlabel('Pixel Intensity', color='white')
+        self.axes.set_ylabel('Frequency', color='white')
+        self.axes.grid(True, linestyle='--', alpha=0.5, color='gray')
+        self.axes.set_xlim(0, 255)
+
+        # One step line per channel, created once and updated in place
+        x = np.arange(256)
+        zeros = np.zeros(256)
+        self.lines = [
+            self.axes.plot(x, zeros, drawstyle='steps-mid', color=color, linewidth=1.2, label=label)[0]
+            for color, label in (('red', 'Red'), ('green', 'Green'), ('blue', 'Blue'))
+        ]
+        self.axes.legend(loc='upper right', facecolor='#1F2937', edgecolor='white', labelcolor='white')
+        self.fig.tight_layout()
+        self.blitter = BlitUpdater(self, self.lines)
+
+    def set_histograms(self, r_hist, g_hist, b_hist):
+        x = np.arange(256)
+        peak = 0
+        for line, hist in zip(self.lines, (r_hist, g_hist, b_hist)):
+            hist = np.asarray(hist)
+            line.set_data(x, hist)
+            peak = max(peak, int(hist.max(initial=0)))
+        top = nice_limit(peak)
+        self.axes.set_ylim(0, top)
+        self.blitter.update((top,))
+
+# ---------- Projection Widget (row sums against row index, column sums against column index) ----------
+class ProjectionWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+
+        # Single figure with two subplots
+        self.fig = Figure(figsize=(5, 4), dpi=100, facecolor='#1F2937')
+        self.canvas = FigureCanvas(self.fig)
+
+        # Top subplot: horizontal projection (row index on Y, count on X)
+        self.ax_h = self.fig.add_subplot(2, 1, 1)
+        self.ax_h.set_facecolor('#1F2937')
+        self.ax_h.tick_params(colors='white')
+        self.ax_h.set_xlabel('White Pixel Count', color='white')
+        self.ax_h.set_ylabel('Row Index', color='white')
+        self.ax_h.set_title('Horizontal Projection (Row Sums)', color='white')
+        self.ax_h.grid(True, linestyle='--', alpha=0.5, color='gray', axis='x')
+
+        # Bottom subplot: vertical projection (column index on X, count on Y)
+        self.ax_v = self.fig.add_subplot(2, 1, 2)
+        self.ax_v.set_facecolor('#1F2937')
+        self.ax_v.tick_params(colors='white')
+        self.ax_v.set_xlabel('Column Index', color='white')
+        self.ax_v.set_ylabel('White Pixel Count', color='white')
+        self.ax_v.set_title('Vertical Projection (Column Sums)', color='white')
+        self.ax_v.grid(True, linestyle='--', alpha=0.5, color='gray', axis='y')
+
+        # One line per profile, updated in place
+        self.line_h = self.ax_h.plot([], [], color='#4F46E5', linewidth=1.2)[0]
+        self.line_v = self.ax_v.plot([], [], drawstyle='steps-mid', color='#10B981', linewidth=1.2)[0]
+
+        self.fig.tight_layout()
+        self.blitter = BlitUpdater(self.canvas, [self.line_h, self.line_v])
+        layout.addWidget(self.canvas)
+
+    def update_projections(self, binary_image):
+        if binary_image is None:
+            return
+        width, height = binary_image.size
+        # Row sums (horizontal projection) and column sums (vertical projection)
+        row_sums, col_sums = ProjectionAnalyzer.profiles(binary_image, threshold=128)
+
+        # Bin each profile to the pixels available along its index axis (max-pooled,
+        # so a one-pixel line still shows up on a 6000-row image)
+        rows_px = self.ax_h.get_window_extent().height
+        cols_px = self.ax_v.get_window_extent().width
+        rows, row_values = ProjectionAnalyzer.downsample(row_sums, rows_px)
+        cols, col_values = ProjectionAnalyzer.downsample(col_sums, cols_px)
+
+        # ----- Horizontal projection -----
+        self.line_h.set_data(row_values, rows)
+        row_top = nice_limit(row_values.max(initial=0))
+        self.ax_h.set_ylim(height - 0.5, -0.5)  # invert so row 0 is at top
+        self.ax_h.set_xlim(0, row_top)
+
+        # ----- Vertical projection -----
+        self.line_v.set_data(cols, col_values)
+        col_top = nice_limit(col_values.max(initial=0))
+        self.ax_v.set_xlim(-0.5, width - 0.5)
+        self.ax_v.set_ylim(0, col_top)
+
+        self.blitter.update((width, height, row_top, col_top))
@@ -15,7 +15,8 @@ def create_status_bar():
     status_label.setObjectName("status-label")
     
     status_value = QLabel("Ready for Upload")
-    status_value.setObjectName("status-value-ready")
+    status_value.setObjectName("status-value")
+    status_value.setProperty("state", "ready")
     
     status_layout.addWidget(status_label)
     status_layout.addWidget(status_value)
@@ -0,0 +1,150 @@
+import numpy as np
+from PIL import Image
+
+
+class BackgroundModel:
+    """
+    Learned background for a fixed camera.
+
+    A warm-up set of empty frames is folded into a running per-pixel mean and
+    variance (Welford's update, one frame at a time, nothing else kept in
+    memory). With block_size > 1 the model is per region: it learns the mean
+    and variance of each block's average colour, which is cheaper to learn
+    and more tolerant of small camera shake.
+
+    Segmenting a frame is a single vectorized comparison against lower/upper
+    bounds (mean -/+ k standard deviations) that are computed once and reused
+    for every frame. Block models compare the frame's block averages (the
+    scale they were learned at) and mark whole blocks as foreground. The model
+    is plain numpy arrays, so it can be pickled to worker processes or saved
+    with save()/load().
+    """
+
+    def __init__(self, block_size=1, k=2.5, min_std=6.0):
+        self.block_size = max(1, int(block_size))
+        self.k = float(k)
+        self.min_std = float(min_std)
+        self.size = None            # (width, height) of the frames
+        self.count = 0
+        self._mean = None
+        self._m2 = None
+        self._bounds = None         # cached (lower, upper), per pixel or per block
+
+    # ---------- Learning ----------
+    def _frame_array(self, pil_image):
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        if self.size is None:
+            self.size = pil_image.size
+        elif pil_image.size != self.size:
+            raise ValueError(f"Frame size {pil_image.size} does not match the model size {self.size}")
+        pixels = np.asarray(pil_image, dtype=np.float64)
+        if self.block_size == 1:
+            return pixels
+        # Average each block (edge blocks are partial)
+        b = self.block_size
+        h, w = pixels.shape[:2]
+        gh, gw = -(-h // b), -(-w // b)
+        padded = np.zeros((gh * b, gw * b, 3))
+        padded[:h, :w] = pixels
+        counts = np.zeros((gh * b, gw * b))
+        counts[:h, :w] = 1
+        sums = padded.reshape(gh, b, gw, b, 3).sum(axis=(1, 3))
+        totals = counts.reshape(gh, b, gw, b).sum(axis=(1, 3))
+        return sums / totals[:, :, None]
+
+    def update(self, pil_image):
+        """Fold one background frame into the running mean and variance."""
+        x = self._frame_array(pil_image)
+        if self._mean is None:
+            self._mean = np.zeros_like(x)
+            self._m2 = np.zeros_like(x)
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        self._bounds = None
+        return self
+
+    def learn(self, frames):
+        """Learn from an iterable of background frames (e.g. a FrameSource warm-up)."""
+        for frame in frames:
+            self.update(frame)
+        if self.count == 0:
+            raise ValueError("No frames to learn the background from")
+        return self
+
+    @property
+    def is_trained(self):
+        return self.count > 0
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def variance(self):
+        if self._m2 is None:
+            return None
+        return self._m2 / max(self.count - 1, 1)
+
+    # ---------- Segmentation ----------
+    def _get_bounds(self):
+        if self._bounds is None:
+            if not self.is_trained:
+                raise ValueError("Background model has not been trained")
+            std = np.maximum(np.sqrt(self.variance), self.min_std)
+            lower = np.clip(np.floor(self._mean - self.k * std), -1, 255).astype(np.int16)
+            upper = np.clip(np.ceil(self._mean + self.k * std), 0, 256).astype(np.int16)
+            self._bounds = (np.ascontiguousarray(lower), np.ascontiguousarray(upper))
+        return self._bounds
+
+    def segment(self, pil_image):
+        """Boolean foreground mask (H x W): any channel outside the learned band."""
+        lower, upper = self._get_bounds()
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        if pil_image.size != self.size:
+            raise ValueError(f"Frame size {pil_image.size} does not match the model size {self.size}")
+        if self.block_size == 1:
+            pixels = np.asarray(pil_image)
+            return ((pixels < lower) | (pixels > upper)).any(axis=2)
+        # Block averages against the block model, then each block's verdict to its pixels
+        averages = self._frame_array(pil_image)
+        blocks = ((averages < lower) | (averages > upper)).any(axis=2)
+        w, h = self.size
+        b = self.block_size
+        return blocks.repeat(b, axis=0).repeat(b, axis=1)[:h, :w]
+
+    def remove(self, pil_image):
+        """RGBA copy of the frame with background pixels made transparent."""
+        mask = self.segment(pil_image)
+        rgba = pil_image.convert('RGBA')
+        rgba.putalpha(Image.fromarray(mask.astype(np.uint8) * 255, 'L'))
+        return rgba
+
+    # ---------- Serialization ----------
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_bounds'] = None     # cheap to rebuild, large to ship
+        return state
+
+    def save(self, path):
+        """Save the model to a .npz file."""
+        np.savez_compressed(
+            path,
+            mean=self._mean, m2=self._m2, count=self.count,
+            size=np.array(self.size), block_size=self.block_size,
+            k=self.k, min_std=self.min_std
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a model written by save()."""
+        with np.load(path) as data:
+            model = cls(int(data['block_size']), float(data['k']), float(data['min_std']))
+            model._mean = data['mean']
+            model._m2 = data['m2']
+            model.count = int(data['count'])
+            model.size = tuple(int(v) for v in data['size'])
+        return model
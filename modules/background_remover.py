@@ -1,15 +1,37 @@
 from PIL import Image
+import numpy as np
 from modules.pixel_stats import PixelStats
-from modules.pixel_processor import process_pixels
+from modules.component_analyzer import ComponentAnalyzer
+from modules.image_pyramid import ImagePyramid
+from modules.morphology import Morphology
+
+# Edge colours are sampled from a pyramid level about this size (a 2x2 block
+# average per pixel, which also suppresses sensor noise)
+_BACKGROUND_SAMPLE_SIZE = (256, 256)
 
 class BackgroundRemover:
     def __init__(self):
         self.removed_background_image = None
         self.width = 0
         self.height = 0
-        self.objects = []   # list of dicts: {'bbox', 'centroid', 'area'}
-
-    def remove_background(self, pil_image, tolerance=30):
+        self.objects = []   # list of dicts: {'label', 'bbox', 'centroid', 'area'}
+        self.label_map = None
+        self.properties = None   # columnar region properties (see ComponentAnalyzer.measure)
+        self.refined_fraction = 1.0   # share of pixels evaluated at full resolution
+
+    def remove_background(self, pil_image, tolerance=30, coarse_level=0, refine_margin=2):
+        """
+        Make the border-connected background transparent and feather the edges.
+
+        coarse_level: 0 solves at full resolution. n > 0 solves on the pyramid
+                      level reduced 2^n times, upsamples the mask and recomputes
+                      full-resolution pixels only in a band around its
+                      transitions. None picks a level from the image size.
+        refine_margin: band half-width in coarse pixels. Wider bands match the
+                       full-resolution result more closely; structures smaller
+                       than a coarse pixel that never form a transition there
+                       can still be missed.
+        """
         if not pil_image:
             return None
 
@@ -17,46 +39,28 @@ class BackgroundRemover:
             pil_image = pil_image.convert('RGB')
 
         self.width, self.height = pil_image.size
+        if coarse_level is None:
+            coarse_level = self._auto_coarse_level(pil_image.size)
 
         # 1. Detect background color from edges (manual loop)
         bg_color = self._detect_background_color(pil_image)
-
-        # 2. Create mask image (1‑channel) using process_pixels
-        def mask_transform(x, y, pixel):
-            if len(pixel) >= 3:
-                r, g, b = pixel[0], pixel[1], pixel[2]
-            else:
-                r = g = b = pixel[0]
-            distance = abs(r - bg_color[0]) + abs(g - bg_color[1]) + abs(b - bg_color[2])
-            # Return 1 if background, else 0
-            return (1 if distance <= tolerance * 3 else 0,)
-
-        mask_img = process_pixels(pil_image, mask_transform, output_mode='L')
-        mask_pixels = mask_img.load()
-        # Convert to 2D boolean: True = background, False = foreground
-        bg_mask = [[False for _ in range(self.width)] for _ in range(self.height)]
-        for y in range(self.height):
-            for x in range(self.width):
-                bg_mask[y][x] = (mask_pixels[x, y] == 1)
-
-        # 3. Flood fill from borders (manual BFS)
-        visited = self._flood_fill_mask(bg_mask)
-
-        # 4. Create RGBA image with transparency using process_pixels
-        def rgba_transform(x, y, pixel):
-            if len(pixel) >= 3:
-                r, g, b = pixel[0], pixel[1], pixel[2]
-            else:
-                r = g = b = pixel[0]
-            alpha = 0 if visited[y][x] else 255
-            return (r, g, b, alpha)
-
-        rgba_img = process_pixels(pil_image, rgba_transform, output_mode='RGBA')
-
-        # 5. Smooth edges (manual loops)
-        smoothed = self._smooth_edges(rgba_img, visited)
-
-        # 6. Extract separate objects from the foreground (opaque pixels)
+        rgb = np.asarray(pil_image)[:, :, :3]
+
+        if coarse_level > 0:
+            # 2a. Solve on the reduced image, refine only near mask transitions
+            background, zone = self._coarse_to_fine_mask(pil_image, rgb, bg_color, tolerance,
+                                                         coarse_level, refine_margin)
+        else:
+            # 2b. Candidate background pixels, kept if connected to the border
+            background = self._border_connected(self._background_candidates(rgb, bg_color, tolerance))
+            zone = None
+            self.refined_fraction = 1.0
+
+        # 3. RGBA with feathered alpha
+        alpha = self._feather_alpha(background, zone)
+        smoothed = Image.fromarray(np.dstack((rgb, alpha)), 'RGBA')
+
+        # 4. Extract separate objects from the foreground (opaque pixels)
         self._extract_objects(smoothed)
 
         self.removed_background_image = smoothed
@@ -98,8 +102,26 @@ class BackgroundRemover:
         self._extract_objects(result)   # extract objects from the simple method too
         return self.removed_background_image
 
+    def remove_background_with_model(self, pil_image, model):
+        """
+        Remove the background using a learned BackgroundModel (fixed camera):
+        one vectorized comparison per frame instead of edge sampling and flood fill.
+        """
+        if not pil_image:
+            return None
+
+        if pil_image.mode not in ('RGB', 'RGBA'):
+            pil_image = pil_image.convert('RGB')
+
+        self.width, self.height = pil_image.size
+        result = model.remove(pil_image)
+        self._extract_objects(result)
+        self.removed_background_image = result
+        return result
+
     def _detect_background_color(self, pil_image):
-        """Detect background color by sampling edge pixels (manual loops)."""
+        """Detect background color by sampling edge pixels of a coarse pyramid level (manual loops)."""
+        pil_image = ImagePyramid.get(pil_image).for_size(_BACKGROUND_SAMPLE_SIZE)
         width, height = pil_image.size
         pixels = pil_image.load()
         edge_pixels = []
@@ -142,126 +164,114 @@ class BackgroundRemover:
         count = len(largest_group)
         return (sum_r // count, sum_g // count, sum_b // count)
 
-    def _flood_fill_mask(self, mask):
-        """BFS flood fill from borders to keep only background connected to edges."""
-        h, w = len(mask), len(mask[0])
-        visited = [[False for _ in range(w)] for _ in range(h)]
-        queue = []
-        # Add border cells that are True in mask
-        for y in range(h):
-            if mask[y][0] and not visited[y][0]:
-                queue.append((y, 0))
-                visited[y][0] = True
-            if mask[y][w-1] and not visited[y][w-1]:
-                queue.append((y, w-1))
-                visited[y][w-1] = True
-        for x in range(w):
-            if mask[0][x] and not visited[0][x]:
-                queue.append((0, x))
-                visited[0][x] = True
-            if mask[h-1][x] and not visited[h-1][x]:
-                queue.append((h-1, x))
-                visited[h-1][x] = True
-
-        # BFS
-        while queue:
-            y, x = queue.pop(0)
-            for dy, dx in [(-1,0),(1,0),(0,-1),(0,1)]:
-                ny, nx = y + dy, x + dx
-                if 0 <= ny < h and 0 <= nx < w:
-                    if mask[ny][nx] and not visited[ny][nx]:
-                        visited[ny][nx] = True
-                        queue.append((ny, nx))
-        return visited
-
-    def _smooth_edges(self, rgba_img, mask):
-        """Apply edge smoothing by adjusting alpha based on neighbor mask."""
-        width, height = rgba_img.size
-        pixels = rgba_img.load()
-        result = Image.new('RGBA', (width, height))
-        result_pixels = result.load()
-        # Copy original pixels first
-        for y in range(height):
-            for x in range(width):
-                result_pixels[x, y] = pixels[x, y]
-
-        feather_distance = 3
-        for y in range(height):
-            for x in range(width):
-                if mask[y][x]:
-                    continue
-                bg_neighbors = 0
-                total = 0
-                for dy in range(-feather_distance, feather_distance+1):
-                    for dx in range(-feather_distance, feather_distance+1):
-                        ny, nx = y + dy, x + dx
-                        if 0 <= ny < height and 0 <= nx < width:
-                            total += 1
-                            if mask[ny][nx]:
-                                bg_neighbors += 1
-                if bg_neighbors > 0:
-                    alpha_ratio = 1.0 - (bg_neighbors / total)
-                    alpha = int(alpha_ratio * 255)
-                    r, g, b, _ = result_pixels[x, y]
-                    result_pixels[x, y] = (r, g, b, alpha)
-        return result
+    @staticmethod
+    def _auto_coarse_level(size):
+        """Reduce up to 4x, keeping the coarse image at least 256 pixels on its short side."""
+        level = 0
+        while level < 2 and min(size) >> (level + 1) >= 256:
+            level += 1
+        return level
+
+    @staticmethod
+    def _background_candidates(rgb, bg_color, tolerance):
+        """Pixels within tolerance of the background color (sum of channel differences)."""
+        distance = np.abs(rgb.astype(np.int16) - np.asarray(bg_color, dtype=np.int16)).sum(axis=-1)
+        return distance <= tolerance * 3
+
+    @staticmethod
+    def _border_connected(mask):
+        """Keep the 4-connected components of mask that touch the image border."""
+        analyzer = ComponentAnalyzer()
+        labels, _ = analyzer.label(mask, connectivity=4)
+        border = np.concatenate((labels[0], labels[-1], labels[:, 0], labels[:, -1]))
+        border = np.unique(border[border > 0])
+        keep = np.zeros(analyzer.count + 1, dtype=bool)
+        keep[border] = True
+        return keep[labels]
+
+    @staticmethod
+    def _dilate(mask, radius):
+        """Square dilation by radius (a (2*radius+1)-pixel square element)."""
+        return Morphology.dilate(mask, 2 * radius + 1)
+
+    def _coarse_to_fine_mask(self, pil_image, rgb, bg_color, tolerance, level, margin):
+        """
+        Background mask solved at a pyramid level and refined at full resolution
+        near its transitions. Returns (mask, zone that needs feathering).
+        """
+        coarse = np.asarray(ImagePyramid.get(pil_image).level(level))[:, :, :3]
+        coarse_bg = self._border_connected(self._background_candidates(coarse, bg_color, tolerance))
+
+        # Coarse pixels next to a transition, widened by the margin
+        edges = np.zeros_like(coarse_bg)
+        edges[:-1] |= coarse_bg[:-1] != coarse_bg[1:]
+        edges[1:] |= coarse_bg[:-1] != coarse_bg[1:]
+        edges[:, :-1] |= coarse_bg[:, :-1] != coarse_bg[:, 1:]
+        edges[:, 1:] |= coarse_bg[:, :-1] != coarse_bg[:, 1:]
+        band = self._dilate(edges, margin)
+
+        # Upsample (each coarse pixel covers a 2^level block; edge blocks are cropped)
+        factor = 1 << level
+        height, width = rgb.shape[:2]
+
+        def upsample(mask):
+            return np.repeat(np.repeat(mask, factor, axis=0), factor, axis=1)[:height, :width]
+
+        background = upsample(coarse_bg)
+        # Every transition of the refined mask lies in the band, so feathering
+        # only needs the band plus the feather distance (3 px)
+        zone = upsample(self._dilate(band, -(-3 // factor)))
+        band = upsample(band)
+        self.refined_fraction = float(band.mean())
+
+        # Recompute candidates inside the band, then connectivity over the whole mask
+        # (regions outside the band are long runs, so labeling them is cheap)
+        background[band] = self._background_candidates(rgb[band], bg_color, tolerance)
+        return self._border_connected(background), zone
+
+    @staticmethod
+    def _feather_alpha(background, zone=None, feather_distance=3):
+        """
+        Alpha channel: 0 for background; foreground pixels with background within
+        feather_distance get 255 * (1 - background share of their window).
+        Window sums are read from an integral image, only for foreground pixels
+        in `zone` (default: everything within feather_distance of background).
+        """
+        height, width = background.shape
+        if zone is None:
+            zone = BackgroundRemover._dilate(background, feather_distance)
+        ys, xs = np.nonzero(zone & ~background)
+
+        integral = np.zeros((height + 1, width + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(background, axis=0, dtype=np.int32), axis=1, out=integral[1:, 1:])
+        y0 = np.maximum(ys - feather_distance, 0)
+        y1 = np.minimum(ys + feather_distance + 1, height)
+        x0 = np.maximum(xs - feather_distance, 0)
+        x1 = np.minimum(xs + feather_distance + 1, width)
+        bg_neighbors = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        total = (y1 - y0) * (x1 - x0)
+
+        alpha = np.where(background, 0, 255).astype(np.uint8)
+        edge = bg_neighbors > 0
+        alpha[ys[edge], xs[edge]] = ((1.0 - bg_neighbors[edge] / total[edge]) * 255).astype(np.uint8)
+        return alpha
 
     def _extract_objects(self, rgba_image):
         """Extract separate objects from the foreground (alpha > 0)."""
-        width, height = rgba_image.size
-        pixels = rgba_image.load()
-        # Create binary mask: 1 = foreground (alpha > 0), 0 = background
-        fg_mask = [[0 for _ in range(width)] for _ in range(height)]
-        for y in range(height):
-            for x in range(width):
-                if pixels[x, y][3] > 0:
-                    fg_mask[y][x] = 1
-
-        # Connected component labeling (4-connectivity)
-        labels = [[0 for _ in range(width)] for _ in range(height)]
-        current_label = 1
-        objects = []
-
-        for y in range(height):
-            for x in range(width):
-                if fg_mask[y][x] == 1 and labels[y][x] == 0:
-                    queue = [(y, x)]
-                    labels[y][x] = current_label
-                    min_x = max_x = x
-                    min_y = max_y = y
-                    sum_x = 0.0
-                    sum_y = 0.0
-                    pixel_count = 0
-                    while queue:
-                        cy, cx = queue.pop(0)
-                        min_x = min(min_x, cx)
-                        max_x = max(max_x, cx)
-                        min_y = min(min_y, cy)
-                        max_y = max(max_y, cy)
-                        sum_x += cx
-                        sum_y += cy
-                        pixel_count += 1
-                        for dy, dx in [(-1,0),(1,0),(0,-1),(0,1)]:
-                            ny, nx = cy + dy, cx + dx
-                            if 0 <= ny < height and 0 <= nx < width:
-                                if fg_mask[ny][nx] == 1 and labels[ny][nx] == 0:
-                                    labels[ny][nx] = current_label
-                                    queue.append((ny, nx))
-                    centroid_x = sum_x / pixel_count
-                    centroid_y = sum_y / pixel_count
-                    objects.append({
-                        'bbox': (min_x, min_y, max_x, max_y),
-                        'centroid': (centroid_x, centroid_y),
-                        'area': pixel_count
-                    })
-                    current_label += 1
-
-        self.objects = objects
+        analyzer = ComponentAnalyzer()
+        analyzer.label(np.asarray(rgba_image.getchannel('A')) > 0)
+        self.properties = analyzer.measure(rgba_image.convert('RGB'))
+        self.label_map = analyzer.labels
+        self.objects = analyzer.to_objects()
 
     def get_objects(self):
         """Return list of detected objects (bounding boxes, centroids, areas)."""
         return self.objects
 
+    def get_region_properties(self):
+        """Return columnar region properties of the detected objects."""
+        return self.properties
+
     def get_stats(self):
         if not self.removed_background_image:
             return None
@@ -0,0 +1,290 @@
+"""
+Streaming row-band processing for images that do not fit in memory.
+
+The source is decoded in horizontal bands using PIL's strip decoding
+(uncompressed or strip-organised TIFF, BMP, PPM ...), each band is pushed
+through a filter together with `overlap` extra rows above and below, and the
+core rows are written straight into an uncompressed, strip-organised TIFF.
+Peak memory depends on the band height and image width, not on the height.
+
+Example (3x3 convolution needs one row of overlap):
+
+    conv = ConvolutionFilter()
+    process_in_bands("scan.tif", "out.tif",
+                     lambda band: conv.apply_convolution(band, kernel),
+                     band_height=128, overlap=1)
+"""
+
+import os
+import struct
+from PIL import Image, ImageFile
+
+# Modes the TIFF writer can store directly (8 bits per sample)
+_WRITER_MODES = ('L', 'RGB', 'RGBA')
+
+
+def _make_tile(decoder, extents, offset, args):
+    """Build a tile entry in the form the installed Pillow expects."""
+    tile_type = getattr(ImageFile, '_Tile', None)
+    if tile_type is None:
+        return (decoder, extents, offset, args)
+    return tile_type(decoder, extents, offset, args)
+
+
+def _open_source(source):
+    """Return (image, owns_file) for a path or an already opened PIL image."""
+    if isinstance(source, Image.Image):
+        return source, False
+    return Image.open(source), True
+
+
+def _band_tiles(image, top, bottom):
+    """
+    Return the tile list that decodes rows [top, bottom) of a lazily opened
+    image, re-based so the band starts at row 0, plus the first decoded row.
+    Returns (None, None) when the file layout does not allow partial decoding.
+    """
+    tiles = getattr(image, 'tile', None)
+    if not tiles:
+        return None, None
+    width, height = image.size
+
+    # Strip-organised files (one full-width tile per strip)
+    if len(tiles) > 1:
+        if any(t[1][0] != 0 or t[1][2] != width for t in tiles):
+            return None, None
+        selected = [t for t in tiles if t[1][1] < bottom and t[1][3] > top]
+        first = min(t[1][1] for t in selected)
+        shifted = [
+            _make_tile(t[0], (0, t[1][1] - first, width, t[1][3] - first), t[2], t[3])
+            for t in selected
+        ]
+        return shifted, first
+
+    # Single uncompressed tile: seek directly to the band's rows
+    decoder, extents, offset, args = tiles[0]
+    if decoder != 'raw' or tuple(extents) != (0, 0, width, height):
+        return None, None
+    if isinstance(args, tuple):
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        ystep = args[2] if len(args) > 2 else 1
+    else:
+        rawmode, stride, ystep = args, 0, 1
+    if not stride:
+        stride = len(Image.new(image.mode, (width, 1)).tobytes())
+    if ystep < 0:
+        # Bottom-up storage (BMP): the band's last row comes first on disk
+        band_offset = offset + (height - bottom) * stride
+    else:
+        band_offset = offset + top * stride
+    return [_make_tile(decoder, (0, 0, width, bottom - top), band_offset, (rawmode, stride, ystep))], top
+
+
+def _read_band(source, image, top, bottom):
+    """Decode rows [top, bottom) of the source as a standalone PIL image."""
+    width = image.size[0]
+    if isinstance(source, Image.Image):
+        return source.crop((0, top, width, bottom))
+
+    tiles, first = _band_tiles(image, top, bottom)
+    if tiles is None:
+        # Layout cannot be decoded partially (e.g. PNG/JPEG): full decode
+        image.load()
+        return image.crop((0, top, width, bottom))
+
+    last = max(t[1][3] for t in tiles) + first
+    band = Image.open(source)
+    band.tile = tiles
+    band._size = (width, last - first)
+    band.load()
+    if first == top and last == bottom:
+        return band
+    return band.crop((0, top - first, width, bottom - first))
+
+
+def iter_bands(source, band_height=256, overlap=0):
+    """
+    Yield (y0, y1, top, band) for consecutive horizontal bands of the source.
+
+    Rows [y0, y1) are the band's own rows; `band` additionally carries up to
+    `overlap` rows of context above and below, and starts at image row `top`.
+
+    Only uncompressed layouts (raw strips or a single raw tile) are decoded
+    band-by-band. Compressed files - LZW/deflate TIFF, PNG, JPEG - cannot be
+    entered mid-stream, so they are decoded in full on the first band and the
+    bands are cropped from memory: the output still streams, the input does not.
+    """
+    if band_height < 1:
+        raise ValueError("band_height must be at least 1")
+    image, owns_file = _open_source(source)
+    try:
+        width, height = image.size
+        for y0 in range(0, height, band_height):
+            y1 = min(height, y0 + band_height)
+            top = max(0, y0 - overlap)
+            bottom = min(height, y1 + overlap)
+            yield y0, y1, top, _read_band(source, image, top, bottom)
+    finally:
+        if owns_file:
+            image.close()
+
+
+class BandWriter:
+    """
+    Incremental writer for an uncompressed, strip-organised baseline TIFF.
+
+    The header and strip tables are written up front (the final size is
+    known), then each band's pixels are appended as they are produced.
+    Files written this way can be read back band-by-band with iter_bands.
+    """
+
+    def __init__(self, path, size, mode, rows_per_strip=256):
+        if mode not in _WRITER_MODES:
+            raise ValueError(f"Unsupported band writer mode: {mode}")
+        self.path = path
+        self.width, self.height = size
+        self.mode = mode
+        self.rows_per_strip = max(1, min(rows_per_strip, self.height))
+        self.rows_written = 0
+        self._file = None
+        header = self._build_header()
+        self._file = open(path, 'wb')
+        self._file.write(header)
+
+    def _build_header(self):
+        spp = len(self.mode)
+        row_bytes = self.width * spp
+        strip_count = (self.height + self.rows_per_strip - 1) // self.rows_per_strip
+        byte_counts = []
+        for i in range(strip_count):
+            rows = min(self.rows_per_strip, self.height - i * self.rows_per_strip)
+            byte_counts.append(rows * row_bytes)
+        if sum(byte_counts) > 0xFFFFFFFF - 65536:
+            raise ValueError("Image too large for a classic (32-bit offset) TIFF")
+
+        entries = [
+            (256, 4, [self.width]),                 # ImageWidth
+            (257, 4, [self.height]),                # ImageLength
+            (258, 3, [8] * spp),                    # BitsPerSample
+            (259, 3, [1]),                          # Compression: none
+            (262, 3, [1 if spp == 1 else 2]),       # Photometric
+            (273, 4, [0] * strip_count),            # StripOffsets (filled below)
+            (277, 3, [spp]),                        # SamplesPerPixel
+            (278, 4, [self.rows_per_strip]),        # RowsPerStrip
+            (279, 4, byte_counts),                  # StripByteCounts
+            (284, 3, [1]),                          # PlanarConfiguration: chunky
+        ]
+        if self.mode == 'RGBA':
+            entries.append((338, 3, [2]))           # ExtraSamples: unassociated alpha
+
+        type_size = {3: 2, 4: 4}
+        ifd_size = 2 + 12 * len(entries) + 4
+        extra_size = sum(type_size[t] * len(v) for _, t, v in entries if type_size[t] * len(v) > 4)
+        data_start = 8 + ifd_size + extra_size
+        strip_bytes = self.rows_per_strip * row_bytes
+        entries[5] = (273, 4, [data_start + i * strip_bytes for i in range(strip_count)])
+
+        ifd = struct.pack('<H', len(entries))
+        extra = b''
+        extra_offset = 8 + ifd_size
+        for tag, typ, values in entries:
+            fmt = '<' + ('H' if typ == 3 else 'I') * len(values)
+            packed = struct.pack(fmt, *values)
+            if len(packed) <= 4:
+                ifd += struct.pack('<HHI', tag, typ, len(values)) + packed.ljust(4, b'\0')
+            else:
+                ifd += struct.pack('<HHII', tag, typ, len(values), extra_offset + len(extra))
+                extra += packed
+        ifd += struct.pack('<I', 0)
+        return b'II*\0' + struct.pack('<I', 8) + ifd + extra
+
+    def write(self, band):
+        """Append a band (full image width) below the rows already written."""
+        if band.mode != self.mode:
+            band = band.convert(self.mode)
+        if band.size[0] != self.width:
+            raise ValueError("Band width does not match the output width")
+        if self.rows_written + band.size[1] > self.height:
+            raise ValueError("More rows written than the output height")
+        self._file.write(band.tobytes())
+        self.rows_written += band.size[1]
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.rows_written != self.height:
+            self._remove_output()
+            raise ValueError(f"Incomplete output: {self.rows_written} of {self.height} rows written")
+
+    def discard(self):
+        """Close without completing and delete the partial output file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._remove_output()
+
+    def _remove_output(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+            return False
+        self.close()
+        return False
+
+
+def process_in_bands(source, output_path, band_func, band_height=256, overlap=0, output_mode=None):
+    """
+    Stream `source` through `band_func` and write the result to `output_path`
+    (uncompressed TIFF) one band at a time.
+
+    Args:
+        source: Image path (decoded band-by-band) or an in-memory PIL image.
+        output_path (str): Destination TIFF file.
+        band_func (callable): Takes a PIL band image and returns a PIL image of
+                              the same size. Pointwise filters need overlap=0;
+                              a k x k window filter needs overlap=k // 2.
+        band_height (int): Rows produced per band (also the TIFF strip height).
+        overlap (int): Context rows added above and below each band.
+        output_mode (str): 'L', 'RGB' or 'RGBA'; defaults to the first band's
+                           output mode ('1'/'P' etc. are widened to L/RGB).
+
+    Returns:
+        tuple: (width, height) of the written image.
+    """
+    image, owns_file = _open_source(source)
+    size = image.size
+    if owns_file:
+        image.close()
+
+    writer = None
+    try:
+        for y0, y1, top, band in iter_bands(source, band_height, overlap):
+            result = band_func(band)
+            if result.size != band.size:
+                raise ValueError("band_func must preserve the band size")
+            core = result.crop((0, y0 - top, result.size[0], y1 - top))
+            if writer is None:
+                mode = output_mode or core.mode
+                if mode not in _WRITER_MODES:
+                    mode = 'L' if mode in ('1', 'I', 'F') else 'RGB'
+                writer = BandWriter(output_path, size, mode, rows_per_strip=band_height)
+            writer.write(core)
+    except Exception:
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is None:
+        raise ValueError("Source image is empty")
+    writer.close()
+    return size
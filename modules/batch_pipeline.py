@@ -0,0 +1,317 @@
+"""
+Three-stage batch pipeline: decode -> filter -> encode.
+
+Decoding (Image.open + load) and encoding (save) run on thread pools, since
+PIL releases the GIL inside its codecs, while the filters run on a process
+pool so pure-Python pixel work uses every core. Each stage keeps at most
+`queue_depth` items in flight, so disk reads, filtering and compression of
+different images overlap while memory stays bounded.
+
+Filters are looked up by name in BATCH_FILTERS (same names and parameters
+as the dashboard's filters), so only the name, parameters and pixels cross
+the process boundary. Optionally a ResultCache skips images whose result is
+already known.
+
+Example:
+
+    pipeline = BatchPipeline("threshold", {'type': 'single', 't': 100}, output_dir="out")
+    for item in pipeline.run(["a.png", "b.png"]):
+        print(item['input'], item['output'] or item['error'])
+"""
+
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from PIL import Image
+from modules.image_saver import ImageSaver, SAVE_PROFILES
+from modules.result_cache import ResultCache
+
+
+# ---------- Filters (module level so worker processes can resolve them) ----------
+def _custom_grayscale(image):
+    from modules.grayscale_converter import GrayscaleConverter
+    return GrayscaleConverter().convert_to_grayscale(image)
+
+
+def _custom_bw(image, threshold=128, contrast=None):
+    from modules.black_white_converter import BlackWhiteConverter
+    return BlackWhiteConverter().convert_to_black_white(image, threshold=threshold, contrast=contrast)
+
+
+def _morphology(image, operation='open', size=3):
+    from modules.morphology import Morphology
+    mask = Morphology.apply(Morphology.to_mask(image), operation, size)
+    return Image.fromarray(mask.astype('uint8') * 255, 'L')
+
+
+def _contrast(image, method='equalize', **params):
+    from modules.contrast_enhancer import ContrastEnhancer
+    return ContrastEnhancer.enhance(image, method, **params)
+
+
+def _background_removal(image, tolerance=30, coarse_level=0, refine_margin=2):
+    from modules.background_remover import BackgroundRemover
+    return BackgroundRemover().remove_background(image, tolerance=tolerance, coarse_level=coarse_level,
+                                                 refine_margin=refine_margin)
+
+
+_background_models = {}   # per-process cache of loaded BackgroundModels
+
+
+def _background_model(image, model_path):
+    from modules.background_model import BackgroundModel
+    from modules.background_remover import BackgroundRemover
+    model = _background_models.get(model_path)
+    if model is None:
+        model = _background_models[model_path] = BackgroundModel.load(model_path)
+    return BackgroundRemover().remove_background_with_model(image, model)
+
+
+def _color_filter(image, preset='blue_ocean'):
+    from modules.color_filter import ColorFilter
+    color_func = getattr(ColorFilter, preset, None)
+    if color_func is None or preset.startswith('_'):
+        raise ValueError(f"Unknown color filter: {preset}")
+    return color_func(image)
+
+
+def _rotate(image, angle=0, resample='nearest', expand=False):
+    from modules.rotate_converter import ImageRotator
+    return ImageRotator().rotate_image(image, angle, resample=resample, expand=expand)
+
+
+def _mirror(image, mirror_type='horizontal'):
+    from modules.mirror_converter import ImageMirror
+    return ImageMirror().mirror(image, mirror_type)
+
+
+def _translate(image, dx=0, dy=0):
+    from modules.translate_converter import ImageTranslator
+    return ImageTranslator().translate_image(image, dx, dy)
+
+
+def _object_boxing(image, threshold=128, cleanup=None, cleanup_size=3, method='background', roi=None,
+                   min_area=0, max_area=None, max_objects=None):
+    from modules.object_boxer import ObjectBoxer
+    result, _ = ObjectBoxer().box_objects(image, threshold=threshold, include_full_image=True,
+                                          cleanup=cleanup, cleanup_size=cleanup_size, method=method, roi=roi,
+                                          min_area=min_area, max_area=max_area, max_objects=max_objects)
+    return result
+
+
+def _convolution(image, preset='smoothing', kernel=None, size=3, sigma=None):
+    """preset: any KernelRegistry type ('smoothing', 'gaussian', 'sobel_x', ...)."""
+    from modules.convolution_filters import ConvolutionFilter
+    from modules.kernel_registry import KernelRegistry
+    if kernel is None:
+        kernel = KernelRegistry.get(preset, size, sigma).to_list()
+    return ConvolutionFilter().apply_convolution(image, kernel, kernel_size=len(kernel))
+
+
+def _edges(image, method='canny', low=50, high=150, sigma=None, operator='sobel'):
+    from modules.edge_detector import EdgeDetector
+    return EdgeDetector().detect(image, method, low=low, high=high, sigma=sigma, operator=operator)
+
+
+def _threshold(image, type='single', t=128, t1=0, t2=255, block_size=11, c=2, contrast=None):
+    from modules.threshold_converter import ThresholdConverter
+    converter = ThresholdConverter()
+    if type == 'single':
+        return converter.apply_single_threshold(image, t, contrast=contrast)
+    elif type == 'range':
+        return converter.apply_range_threshold(image, t1, t2, contrast=contrast)
+    return converter.apply_adaptive_threshold(image, block_size, c, contrast=contrast)
+
+
+BATCH_FILTERS = {
+    'custom_grayscale': _custom_grayscale,
+    'custom_bw': _custom_bw,
+    'contrast': _contrast,
+    'background_removal': _background_removal,
+    'background_model': _background_model,
+    'color_filter': _color_filter,
+    'rotate': _rotate,
+    'mirror': _mirror,
+    'translate': _translate,
+    'object_boxing': _object_boxing,
+    'morphology': _morphology,
+    'convolution': _convolution,
+    'edges': _edges,
+    'threshold': _threshold,
+}
+
+
+# Filters that take roi= themselves; every other filter gets it through ROIProcessor
+_NATIVE_ROI = ('object_boxing',)
+
+
+def _run_filter(filter_name, image, params):
+    """Filter stage entry point (runs in a worker process)."""
+    if params.get('roi') is not None and filter_name not in _NATIVE_ROI:
+        from modules.roi_processor import ROIProcessor
+        params = dict(params)
+        roi = ROIProcessor(params.pop('roi'))
+        result = roi.apply(image, BATCH_FILTERS[filter_name], **params)
+    else:
+        result = BATCH_FILTERS[filter_name](image, **params)
+    if isinstance(result, tuple):
+        result = result[0]
+    if result is None:
+        raise Exception(f"Filter '{filter_name}' produced no image")
+    return result
+
+
+class BatchPipeline:
+    def __init__(self, filter_name, params=None, output_dir='.', output_format='png',
+                 decode_threads=4, encode_threads=4, workers=None, queue_depth=8,
+                 cache=None, save_profile=None, save_options=None):
+        """
+        workers: process count for the filter stage (None = CPU count,
+        0 = run filters on a single thread in this process).
+        queue_depth: maximum number of images in flight per stage.
+        save_profile: ImageSaver profile (default: chosen from output_format).
+        """
+        if filter_name not in BATCH_FILTERS:
+            raise ValueError(f"Unknown filter: {filter_name}")
+        self.filter_name = filter_name
+        self.params = params or {}
+        self.output_dir = output_dir
+        self.output_format = output_format.lower().lstrip('.')
+        # Fail before any image is processed if the profile cannot write this format
+        sample_path = f"output.{self.output_format}"
+        profile = save_profile or ImageSaver.profile_for_path(sample_path)
+        if profile not in SAVE_PROFILES:
+            raise ValueError(f"Unknown save profile: {profile}")
+        ImageSaver.check_extension(sample_path, (save_options or {}).get('format', SAVE_PROFILES[profile]['format']))
+        self.decode_threads = max(1, decode_threads)
+        self.encode_threads = max(1, encode_threads)
+        self.workers = workers
+        self.queue_depth = max(1, queue_depth)
+        self.cache = cache
+        self.save_profile = save_profile
+        self.save_options = save_options or {}
+
+    # ---------- Stage work ----------
+    def _decode(self, path):
+        image = Image.open(path)
+        image.load()
+        if image.mode == 'P':
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        key = None
+        if self.cache is not None:
+            key = ResultCache.make_key(image, self.filter_name, self.params)
+        return image, key
+
+    def _encode(self, image, output_path):
+        return ImageSaver.save(image, output_path, self.save_profile, **self.save_options)
+
+    def _output_paths(self, input_paths):
+        """
+        Output path per input: <stem>.<format> in output_dir. Inputs that would
+        share a name (a/img.png and b/img.tif) get _2, _3 ... suffixes in input
+        order, so no image overwrites another.
+        """
+        taken = set()
+        outputs = []
+        for input_path in input_paths:
+            stem = os.path.splitext(os.path.basename(input_path))[0]
+            name, suffix = f"{stem}.{self.output_format}", 1
+            while os.path.normcase(name) in taken:
+                suffix += 1
+                name = f"{stem}_{suffix}.{self.output_format}"
+            taken.add(os.path.normcase(name))
+            outputs.append(os.path.join(self.output_dir, name))
+        return outputs
+
+    def _filter_executor(self):
+        if self.workers == 0:
+            return ThreadPoolExecutor(1)
+        return ProcessPoolExecutor(self.workers)
+
+    @staticmethod
+    def _take(stage):
+        """Pop the oldest entry of a stage: (item, ok, value)."""
+        item, future = stage.popleft()
+        try:
+            return item, True, future.result()
+        except Exception as e:
+            item['error'] = str(e)
+            return item, False, None
+
+    # ---------- Driver ----------
+    def run(self, input_paths):
+        """
+        Process every path; yields one result dict per image
+        ({'input', 'target', 'output', 'error', 'cached', 'key'}) as it leaves
+        the pipeline. 'target' is the path assigned to the result; 'output' is
+        set once it has been written.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Output names are assigned up front so duplicate stems cannot collide
+        input_paths = list(input_paths)
+        paths = iter(zip(input_paths, self._output_paths(input_paths)))
+        exhausted = False
+        depth = self.queue_depth
+        decoding, filtering, encoding = deque(), deque(), deque()
+
+        with ThreadPoolExecutor(self.decode_threads) as decode_pool, \
+                self._filter_executor() as filter_pool, \
+                ThreadPoolExecutor(self.encode_threads) as encode_pool:
+            while True:
+                # Step 1: Move finished work down the pipeline while the next stage has room
+                progressed = True
+                while progressed:
+                    progressed = False
+                    if encoding and encoding[0][1].done():
+                        item, ok, output = self._take(encoding)
+                        item['output'] = output
+                        yield item
+                        progressed = True
+                    if filtering and filtering[0][1].done() and len(encoding) < depth:
+                        item, ok, result = self._take(filtering)
+                        if not ok:
+                            yield item
+                        else:
+                            if self.cache is not None and not item['cached']:
+                                self.cache.put(item['key'], result)
+                            encoding.append((item, encode_pool.submit(self._encode, result, item['target'])))
+                        progressed = True
+                    if decoding and decoding[0][1].done() and len(filtering) < depth:
+                        item, ok, decoded = self._take(decoding)
+                        if not ok:
+                            yield item
+                        else:
+                            image, item['key'] = decoded
+                            cached = self.cache.get(item['key']) if self.cache is not None else None
+                            if cached is not None:
+                                item['cached'] = True
+                                future = Future()
+                                future.set_result(cached[0])
+                            else:
+                                future = filter_pool.submit(_run_filter, self.filter_name, image, self.params)
+                            filtering.append((item, future))
+                        progressed = True
+
+                # Step 2: Keep the decode stage full
+                while not exhausted and len(decoding) < depth:
+                    entry = next(paths, None)
+                    if entry is None:
+                        exhausted = True
+                        break
+                    path, target = entry
+                    item = {'input': path, 'target': target, 'output': None, 'error': None,
+                            'cached': False, 'key': None}
+                    decoding.append((item, decode_pool.submit(self._decode, path)))
+
+                if not (decoding or filtering or encoding):
+                    return
+
+                # Step 3: Wait for the oldest entry of any stage that can advance
+                waiting = [encoding[0][1]] if encoding else []
+                if filtering and len(encoding) < depth:
+                    waiting.append(filtering[0][1])
+                if decoding and len(filtering) < depth:
+                    waiting.append(decoding[0][1])
+                if waiting:
+                    wait(waiting, return_when=FIRST_COMPLETED)
@@ -3,6 +3,11 @@ from modules.grayscale_converter import GrayscaleConverter
 from modules.background_remover import BackgroundRemover
 from modules.pixel_stats import PixelStats
 from modules.pixel_processor import process_pixels
+from modules.image_pyramid import ImagePyramid
+from modules.contrast_enhancer import ContrastEnhancer
+
+# Otsu only needs the shape of the histogram; estimate it from at most this many pixels
+_OTSU_MAX_PIXELS = 1 << 18
 
 class BlackWhiteConverter:
     def __init__(self):
@@ -13,7 +18,8 @@ class BlackWhiteConverter:
         self.background_remover = BackgroundRemover()
         self.threshold = 128
 
-    def convert_to_black_white(self, pil_image, threshold=None, method='manual'):
+    def convert_to_black_white(self, pil_image, threshold=None, method='manual', contrast=None):
+        """contrast: optional ContrastEnhancer method applied to the grayscale before thresholding."""
         if not pil_image:
             return None
 
@@ -21,6 +27,7 @@ class BlackWhiteConverter:
         grayscale_image = self.grayscale_converter.convert_to_grayscale(pil_image)
         if not grayscale_image:
             return None
+        grayscale_image = ContrastEnhancer.enhance(grayscale_image, contrast)
 
         self.width, self.height = grayscale_image.size
 
@@ -33,17 +40,17 @@ class BlackWhiteConverter:
 
         # Pixel transform for thresholding
         def threshold_transform(x, y, pixel):
-            # pixel is (gray, gray, gray)
+            # pixel is (gray,)
             gray_value = pixel[0]
-            bw_value = 0 if gray_value < self.threshold else 255
-            return (bw_value, bw_value, bw_value)
+            return (0,) if gray_value < self.threshold else (255,)
 
-        self.black_white_image = process_pixels(grayscale_image, threshold_transform, output_mode='RGB')
+        self.black_white_image = process_pixels(grayscale_image, threshold_transform, output_mode='L')
         return self.black_white_image
 
     def _calculate_otsu_threshold(self, grayscale_image):
         """Use PixelStats histogram for Otsu's method (still manual loops)."""
-        hist = PixelStats.get_histogram(grayscale_image)
+        sample = ImagePyramid.get(grayscale_image, 'nearest').for_pixels(_OTSU_MAX_PIXELS)
+        hist = PixelStats.get_histogram(sample)
         total_pixels = sum(hist)
         if total_pixels == 0:
             return 128
@@ -81,34 +88,37 @@ class BlackWhiteConverter:
         if not pil_image:
             return None
 
-        grayscale_image = self.grayscale_converter.convert_manual_loop(pil_image)
+        grayscale_image = self.grayscale_converter.convert_to_grayscale(pil_image)
         if not grayscale_image:
             return None
 
         self.width, self.height = grayscale_image.size
-        three_level_image = Image.new('RGB', (self.width, self.height))
+        three_level_image = Image.new('L', (self.width, self.height))
         source_pixels = grayscale_image.load()
         target_pixels = three_level_image.load()
 
         for y in range(self.height):
             for x in range(self.width):
-                gray_value = source_pixels[x, y][0]
+                gray_value = source_pixels[x, y]
                 if gray_value < low_threshold:
                     level_value = 0
                 elif gray_value < high_threshold:
                     level_value = 128
                 else:
                     level_value = 255
-                target_pixels[x, y] = (level_value, level_value, level_value)
+                target_pixels[x, y] = level_value
 
         self.black_white_image = three_level_image
         return self.black_white_image
 
-    def remove_background(self, pil_image, method='auto', tolerance=30, bg_color=None):
+    def remove_background(self, pil_image, method='auto', tolerance=30, bg_color=None,
+                          coarse_level=0, refine_margin=2):
         if method == 'simple':
             return self.background_remover.remove_background_simple(pil_image, bg_color, tolerance)
         else:
-            return self.background_remover.remove_background(pil_image, tolerance)
+            return self.background_remover.remove_background(pil_image, tolerance,
+                                                             coarse_level=coarse_level,
+                                                             refine_margin=refine_margin)
 
     def get_background_removal_stats(self):
         return self.background_remover.get_stats()
@@ -161,7 +171,7 @@ class BlackWhiteConverter:
         if not pil_image:
             return None
 
-        grayscale_image = self.grayscale_converter.convert_manual_loop(pil_image)
+        grayscale_image = self.grayscale_converter.convert_to_grayscale(pil_image)
         if not grayscale_image:
             return None
 
@@ -1,142 +1,175 @@
+import numpy as np
 from PIL import Image
 from modules.grayscale_converter import GrayscaleConverter
-from modules.pixel_processor import process_pixels
+from modules.image_pyramid import ImagePyramid
+
+
+def _heatmap(v):
+    if v < 85:
+        return (0, v * 3, 255 - v * 3)
+    elif v < 170:
+        return ((v - 85) * 3, 255 - (v - 85) * 3, 0)
+    else:
+        return (255, (v - 170) * 3, 0)
+
+
+def _rainbow(v):
+    hue = (v / 255.0) * 360
+    c = 1.0
+    x_val = c * (1 - abs((hue / 60) % 2 - 1))
+    if hue < 60:
+        r, g, b = c, x_val, 0
+    elif hue < 120:
+        r, g, b = x_val, c, 0
+    elif hue < 180:
+        r, g, b = 0, c, x_val
+    elif hue < 240:
+        r, g, b = 0, x_val, c
+    elif hue < 300:
+        r, g, b = x_val, 0, c
+    else:
+        r, g, b = c, 0, x_val
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+
+def _sunset(v):
+    if v < 128:
+        return (v, v // 2, 0)
+    else:
+        return (255, int((v - 128) * 2), 0)
+
+
+# Preset name -> (display name, grayscale value -> (r, g, b)), in display order
+COLOR_MAPS = {
+    'blue_ocean': ("Blue Ocean", lambda v: (v // 2, v, 255)),
+    'green_forest': ("Green Forest", lambda v: (v // 3, v, v // 3)),
+    'red_sunset': ("Red Sunset", lambda v: (v, v // 2, 0)),
+    'purple_night': ("Purple Night", lambda v: (v, v // 2, v)),
+    'gold_metal': ("Gold Metal", lambda v: (v, int(v * 0.8), 0)),
+    'pink_candy': ("Pink Candy", lambda v: (255, v // 2, v)),
+    'cyan_water': ("Cyan Water", lambda v: (0, v, v)),
+    'autumn_leaves': ("Autumn Leaves", lambda v: (v, int(v * 0.5), 0)),
+    'neon_glow': ("Neon Glow", lambda v: ((v * 2) % 256, (v * 3) % 256, (v * 5) % 256)),
+    'heatmap': ("Heatmap", _heatmap),
+    'rainbow': ("Rainbow", _rainbow),
+    'vintage_paper': ("Vintage Paper", lambda v: (min(255, int(v * 1.2)), min(255, int(v * 1.0)), min(255, int(v * 0.8)))),
+    'electric_blue': ("Electric Blue", lambda v: (v // 4, v // 2, v)),
+    'sunset_gradient': ("Sunset Gradient", _sunset),
+    'forest_canopy': ("Forest Canopy", lambda v: (int(v * 0.3), v, int(v * 0.2))),
+}
+
+COLOR_PRESETS = tuple(COLOR_MAPS)
+
+_luts = {}
+
 
 class ColorFilter:
     """Colorization filters that map grayscale intensity to colours."""
 
     @staticmethod
-    def _apply_color_map(gray_img, color_func):
+    def lut(preset):
+        """256x3 uint8 table for a preset, built once from its colour function."""
+        table = _luts.get(preset)
+        if table is None:
+            color_func = COLOR_MAPS[preset][1]
+            table = np.array([color_func(v) for v in range(256)], dtype=np.uint8)
+            _luts[preset] = table
+        return table
+
+    @staticmethod
+    def _apply_preset(image, preset):
+        gray = GrayscaleConverter.luma(image)
+        return Image.fromarray(ColorFilter.lut(preset)[gray], 'RGB')
+
+    @staticmethod
+    def gallery(image, presets=None, thumbnail_size=None):
         """
-        Helper: convert grayscale image (RGB mode, three equal channels) to color using process_pixels.
-        color_func takes a grayscale value (0-255) and returns (r, g, b) tuple.
+        Render several presets of one image: luma is computed and widened to
+        RGB once, then each preset is a single table lookup (Image.point) with
+        its row of a stacked (presets x 768) table, so only the frames being
+        returned are allocated. With thumbnail_size=(w, h) the luma comes from
+        a pyramid level and is fitted into that size first.
+        Returns {preset name: RGB image} in the order of presets.
         """
-        # gray_img is RGB but all channels equal; we take the first channel as intensity
-        def transform(x, y, pixel):
-            v = pixel[0]  # grayscale intensity
-            return color_func(v)
-        return process_pixels(gray_img, transform, output_mode='RGB')
+        presets = list(presets) if presets is not None else list(COLOR_PRESETS)
+        if not presets:
+            return {}
+
+        source = image
+        if thumbnail_size is not None:
+            source = ImagePyramid.get(image).for_size(thumbnail_size)
+        gray_img = Image.fromarray(GrayscaleConverter.luma(source), 'L')
+        if thumbnail_size is not None:
+            gray_img.thumbnail(thumbnail_size, Image.BILINEAR)
+        gray_rgb = gray_img.convert('RGB')
+
+        # Step 1: stack the tables in point() layout (all R, then G, then B)
+        luts = np.stack([ColorFilter.lut(preset) for preset in presets]).transpose(0, 2, 1)
+        luts = luts.reshape(len(presets), 768)
+        # Step 2: one lookup per preset on the shared RGB luma
+        return {preset: gray_rgb.point(luts[i].tolist()) for i, preset in enumerate(presets)}
 
     @staticmethod
     def blue_ocean(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v // 2, v, 255))
+        return ColorFilter._apply_preset(gray_img, 'blue_ocean')
 
     @staticmethod
     def green_forest(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v // 3, v, v // 3))
+        return ColorFilter._apply_preset(gray_img, 'green_forest')
 
     @staticmethod
     def red_sunset(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v, v // 2, 0))
+        return ColorFilter._apply_preset(gray_img, 'red_sunset')
 
     @staticmethod
     def purple_night(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v, v // 2, v))
+        return ColorFilter._apply_preset(gray_img, 'purple_night')
 
     @staticmethod
     def gold_metal(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v, int(v * 0.8), 0))
+        return ColorFilter._apply_preset(gray_img, 'gold_metal')
 
     @staticmethod
     def pink_candy(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (255, v // 2, v))
+        return ColorFilter._apply_preset(gray_img, 'pink_candy')
 
     @staticmethod
     def cyan_water(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (0, v, v))
+        return ColorFilter._apply_preset(gray_img, 'cyan_water')
 
     @staticmethod
     def autumn_leaves(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v, int(v * 0.5), 0))
+        return ColorFilter._apply_preset(gray_img, 'autumn_leaves')
 
     @staticmethod
     def neon_glow(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: ((v * 2) % 256, (v * 3) % 256, (v * 5) % 256))
+        return ColorFilter._apply_preset(gray_img, 'neon_glow')
 
     @staticmethod
     def grayscale_to_rgb(gray_img):
         converter = GrayscaleConverter()
-        return converter.convert_to_grayscale(gray_img)
+        return converter.convert_to_grayscale(gray_img).convert('RGB')
 
     @staticmethod
     def heatmap(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        def heatmap_func(v):
-            if v < 85:
-                return (0, v * 3, 255 - v * 3)
-            elif v < 170:
-                return ((v - 85) * 3, 255 - (v - 85) * 3, 0)
-            else:
-                return (255, (v - 170) * 3, 0)
-        return ColorFilter._apply_color_map(gray_rgb, heatmap_func)
+        return ColorFilter._apply_preset(gray_img, 'heatmap')
 
     @staticmethod
     def rainbow(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        def rainbow_func(v):
-            hue = (v / 255.0) * 360
-            c = 1.0
-            x_val = c * (1 - abs((hue / 60) % 2 - 1))
-            if hue < 60:
-                r, g, b = c, x_val, 0
-            elif hue < 120:
-                r, g, b = x_val, c, 0
-            elif hue < 180:
-                r, g, b = 0, c, x_val
-            elif hue < 240:
-                r, g, b = 0, x_val, c
-            elif hue < 300:
-                r, g, b = x_val, 0, c
-            else:
-                r, g, b = c, 0, x_val
-            return (int(r * 255), int(g * 255), int(b * 255))
-        return ColorFilter._apply_color_map(gray_rgb, rainbow_func)
+        return ColorFilter._apply_preset(gray_img, 'rainbow')
 
     @staticmethod
     def vintage_paper(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (min(255, int(v * 1.2)), min(255, int(v * 1.0)), min(255, int(v * 0.8))))
+        return ColorFilter._apply_preset(gray_img, 'vintage_paper')
 
     @staticmethod
     def electric_blue(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (v // 4, v // 2, v))
+        return ColorFilter._apply_preset(gray_img, 'electric_blue')
 
     @staticmethod
     def sunset_gradient(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        def sunset_func(v):
-            if v < 128:
-                return (v, v // 2, 0)
-            else:
-                return (255, int((v - 128) * 2), 0)
-        return ColorFilter._apply_color_map(gray_rgb, sunset_func)
+        return ColorFilter._apply_preset(gray_img, 'sunset_gradient')
 
     @staticmethod
     def forest_canopy(gray_img):
-        converter = GrayscaleConverter()
-        gray_rgb = converter.convert_to_grayscale(gray_img)
-        return ColorFilter._apply_color_map(gray_rgb, lambda v: (int(v * 0.3), v, int(v * 0.2)))
\ No newline at end of file
+        return ColorFilter._apply_preset(gray_img, 'forest_canopy')
@@ -0,0 +1,222 @@
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from modules.grayscale_converter import GrayscaleConverter
+
+CONTRAST_METHODS = ('equalize', 'clahe', 'auto_levels', 'gamma')
+
+# id(image) -> (weakref, 256-bin luma histogram)
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+class ContrastEnhancer:
+    """
+    Histogram-driven contrast correction. Every method builds a 256-entry
+    lookup table from the luma histogram and applies it in one pass; CLAHE
+    uses one table per tile and blends the four nearest tables per pixel.
+
+    'L' images give 'L' results. For colour images the same table is applied
+    to each of R, G and B (alpha is kept), which preserves hue.
+    """
+
+    @staticmethod
+    def histogram(image):
+        """256-bin luma histogram as a numpy array, cached per image object."""
+        key = id(image)
+        with _histograms_lock:
+            entry = _histograms.get(key)
+            if entry is not None and entry[0]() is image:
+                return entry[1]
+        hist = np.bincount(GrayscaleConverter.luma(image).ravel(), minlength=256)
+        with _histograms_lock:
+            ref = weakref.ref(image, lambda _ref, key=key: ContrastEnhancer._evict(key, _ref))
+            _histograms[key] = (ref, hist)
+        return hist
+
+    @staticmethod
+    def _evict(key, ref):
+        with _histograms_lock:
+            entry = _histograms.get(key)
+            if entry is not None and entry[0] is ref:
+                del _histograms[key]
+
+    # ---------- Lookup tables ----------
+    @staticmethod
+    def equalize_lut(hist):
+        """Map the cumulative histogram linearly onto 0-255 (first occupied level -> 0)."""
+        hist = np.asarray(hist, dtype=np.float64)
+        cdf = np.cumsum(hist)
+        total = cdf[-1]
+        cdf_min = cdf[np.argmax(hist > 0)] if total > 0 else 0
+        if total <= cdf_min:
+            return np.arange(256, dtype=np.uint8)
+        lut = np.round((cdf - cdf_min) / (total - cdf_min) * 255)
+        return np.clip(lut, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def gamma_lut(gamma):
+        """out = 255 * (v / 255) ** gamma; gamma < 1 brightens, gamma > 1 darkens."""
+        if gamma <= 0:
+            raise ValueError("gamma must be positive")
+        levels = np.arange(256, dtype=np.float64) / 255.0
+        return np.clip(np.round(255.0 * levels ** gamma), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def auto_levels_lut(hist, clip_percent=0.5):
+        """Stretch so clip_percent of pixels saturate at each end."""
+        hist = np.asarray(hist, dtype=np.float64)
+        total = hist.sum()
+        if total == 0:
+            return np.arange(256, dtype=np.uint8)
+        cdf = np.cumsum(hist)
+        cut = total * clip_percent / 100.0
+        low = int(np.searchsorted(cdf, cut, side='right'))
+        high = int(np.searchsorted(cdf, total - cut, side='left'))
+        low, high = min(low, 255), min(high, 255)
+        if high <= low:
+            return np.arange(256, dtype=np.uint8)
+        lut = (np.arange(256, dtype=np.float64) - low) * 255.0 / (high - low)
+        return np.clip(np.round(lut), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def apply_lut(image, lut):
+        """Apply a 256-entry table to luma ('L') or to each colour channel."""
+        lut = [int(v) for v in lut]
+        if image.mode == '1':
+            image = image.convert('L')
+        if image.mode == 'L':
+            return image.point(lut)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+        if image.mode == 'RGBA':
+            return image.point(lut * 3 + list(range(256)))
+        return image.point(lut * 3)
+
+    # ---------- Global corrections ----------
+    @staticmethod
+    def equalize(image):
+        return ContrastEnhancer.apply_lut(image, ContrastEnhancer.equalize_lut(ContrastEnhancer.histogram(image)))
+
+    @staticmethod
+    def gamma(image, gamma=1.0):
+        return ContrastEnhancer.apply_lut(image, ContrastEnhancer.gamma_lut(gamma))
+
+    @staticmethod
+    def auto_levels(image, clip_percent=0.5):
+        hist = ContrastEnhancer.histogram(image)
+        return ContrastEnhancer.apply_lut(image, ContrastEnhancer.auto_levels_lut(hist, clip_percent))
+
+    # ---------- CLAHE ----------
+    @staticmethod
+    def clahe(image, tiles=(8, 8), clip_limit=2.0):
+        """
+        Contrast-limited adaptive equalization. The image is split into
+        tiles=(columns, rows); each tile gets an equalization table from its
+        clipped histogram (clip_limit is a multiple of the mean bin count,
+        excess is spread evenly), and every pixel is bilinearly blended from
+        the tables of the four nearest tile centres. Tiles and row blocks are
+        processed on a thread pool.
+        """
+        gray = GrayscaleConverter.luma(image)
+        height, width = gray.shape
+        tiles_x = max(1, min(int(tiles[0]), width))
+        tiles_y = max(1, min(int(tiles[1]), height))
+        x_edges = np.linspace(0, width, tiles_x + 1).astype(np.int64)
+        y_edges = np.linspace(0, height, tiles_y + 1).astype(np.int64)
+        col_tile = np.repeat(np.arange(tiles_x), np.diff(x_edges))
+        workers = os.cpu_count() or 1
+
+        # Step 1: one equalization table per tile (one tile row per task)
+        luts = np.empty((tiles_y, tiles_x, 256), dtype=np.float32)
+
+        def tile_row_luts(ty):
+            band = gray[y_edges[ty]:y_edges[ty + 1]]
+            hist = np.bincount((col_tile[None, :] * 256 + band).ravel(),
+                               minlength=tiles_x * 256).reshape(tiles_x, 256).astype(np.float64)
+            counts = hist.sum(axis=1, keepdims=True)
+            if clip_limit and clip_limit > 0:
+                limit = np.maximum(1.0, clip_limit * counts / 256.0)
+                excess = np.maximum(hist - limit, 0).sum(axis=1, keepdims=True)
+                hist = np.minimum(hist, limit) + excess / 256.0
+            # Same mapping as equalize_lut: first occupied level -> 0, flat tiles unchanged
+            cdf = np.cumsum(hist, axis=1)
+            cdf_min = np.take_along_axis(cdf, np.argmax(hist > 0, axis=1)[:, None], axis=1)
+            span = counts - cdf_min
+            identity = np.arange(256, dtype=np.float64)[None, :]
+            luts[ty] = np.where(span > 0, (cdf - cdf_min) * 255.0 / np.where(span > 0, span, 1), identity)
+
+        ContrastEnhancer._run(tile_row_luts, range(tiles_y), workers)
+
+        # Step 2: blend the four nearest tables for every pixel, in row blocks
+        def axis_weights(edges, size, count):
+            centres = (edges[:-1] + edges[1:] - 1) / 2.0
+            pos = np.arange(size, dtype=np.float64)
+            upper = np.clip(np.searchsorted(centres, pos, side='right'), 1, max(1, count - 1))
+            lower = upper - 1
+            if count == 1:
+                return np.zeros(size, np.int64), np.zeros(size, np.int64), np.zeros(size, np.float32)
+            span = centres[upper] - centres[lower]
+            weight = np.clip((pos - centres[lower]) / span, 0.0, 1.0)
+            return lower, upper, weight.astype(np.float32)
+
+        x0, x1, wx = axis_weights(x_edges, width, tiles_x)
+        y0, y1, wy = axis_weights(y_edges, height, tiles_y)
+
+        if image.mode == '1':
+            image = image.convert('L')
+        elif image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGB')
+        channels = np.asarray(image)
+        channels = channels[:, :, None] if image.mode == 'L' else channels[:, :, :3]
+        out = np.empty(channels.shape, dtype=np.uint8)
+        rows_per_block = max(1, (1 << 17) // max(1, width))
+
+        def blend_rows(start):
+            stop = min(height, start + rows_per_block)
+            ry0, ry1 = y0[start:stop, None], y1[start:stop, None]
+            rwy = wy[start:stop, None]
+            for c in range(channels.shape[2]):
+                v = channels[start:stop, :, c]
+                top = luts[ry0, x0, v] * (1 - wx) + luts[ry0, x1, v] * wx
+                bottom = luts[ry1, x0, v] * (1 - wx) + luts[ry1, x1, v] * wx
+                blended = top * (1 - rwy) + bottom * rwy
+                out[start:stop, :, c] = np.clip(np.round(blended), 0, 255).astype(np.uint8)
+
+        ContrastEnhancer._run(blend_rows, range(0, height, rows_per_block), workers)
+
+        if image.mode == 'RGBA':
+            return Image.fromarray(np.dstack([out, np.asarray(image)[:, :, 3]]), 'RGBA')
+        if out.shape[2] == 3:
+            return Image.fromarray(out, 'RGB')
+        return Image.fromarray(out[:, :, 0], 'L')
+
+    @staticmethod
+    def _run(func, items, workers):
+        # numpy releases the GIL in the heavy steps, so tasks overlap
+        items = list(items)
+        if workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+                list(pool.map(func, items))
+        else:
+            for item in items:
+                func(item)
+
+    # ---------- Dispatch ----------
+    @staticmethod
+    def enhance(image, method, **params):
+        """Apply one of CONTRAST_METHODS by name (None returns the image unchanged)."""
+        if not method:
+            return image
+        if method == 'equalize':
+            return ContrastEnhancer.equalize(image)
+        if method == 'clahe':
+            return ContrastEnhancer.clahe(image, **params)
+        if method == 'auto_levels':
+            return ContrastEnhancer.auto_levels(image, **params)
+        if method == 'gamma':
+            return ContrastEnhancer.gamma(image, **params)
+        raise ValueError(f"Unknown contrast method: {method}")
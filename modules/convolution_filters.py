@@ -1,14 +1,50 @@
 """
 Manual convolution filters (no library convolution functions).
 Uses pixel_processor for image info and pixel access.
-Handles RGB images, applies kernel to each channel separately.
+Handles RGB images, applies kernel to each channel separately; single-channel
+('L' / '1') images are filtered on their one channel and stay 'L'.
 Border handling: zero-padding.
 No automatic normalization – kernel is applied as given, then clamped to [0,255].
 """
 
 from PIL import Image
-import math
+import numpy as np
 from modules.pixel_processor import get_image_info
+from modules.kernel_registry import Kernel, KernelRegistry
+
+
+def _weighted_taps(slices, weights, dtype):
+    """
+    Sum of slices[i] * weights[i]. Mirrored pairs i, n-1-i with equal or
+    opposite weights share one multiply, and weights of +/-1 need none.
+    """
+    n = len(slices)
+    result = None
+    for i in range((n + 1) // 2):
+        j = n - 1 - i
+        a, b = float(weights[i]), float(weights[j])
+        if i == j or b == 0:
+            term, weight = (slices[i], a) if a else (None, 0.0)
+        elif a == 0:
+            term, weight = slices[j], b
+        elif a == b:
+            term, weight = slices[i] + slices[j], a
+        elif a == -b:
+            term, weight = slices[j] - slices[i], b
+        else:
+            term, weight = slices[i] * dtype(a) + slices[j] * dtype(b), 1.0
+        if term is None:
+            continue
+        if result is None:
+            result = term * dtype(weight) if weight != 1.0 or term.dtype != dtype else term.copy()
+        elif weight == 1.0:
+            result += term
+        elif weight == -1.0:
+            result -= term
+        else:
+            result += term * dtype(weight)
+    return result if result is not None else np.zeros_like(slices[0], dtype=dtype)
+
 
 class ConvolutionFilter:
     def __init__(self):
@@ -28,6 +64,12 @@ class ConvolutionFilter:
         if width is None:
             raise ValueError("Invalid image")
 
+        if pil_image.mode in ('L', '1'):
+            result = self._apply_convolution_single(pil_image.convert('L'), kernel, kernel_size)
+            self.filtered_image = result
+            self.last_kernel = kernel
+            return result
+
         # Ensure RGB mode for processing
         if pil_image.mode not in ('RGB', 'RGBA'):
             pil_image = pil_image.convert('RGB')
@@ -67,50 +109,119 @@ class ConvolutionFilter:
         self.last_kernel = kernel
         return result
 
-    # ---------- Predefined kernels ----------
+    def _apply_convolution_single(self, gray_image, kernel, kernel_size):
+        """Same zero-padded convolution on a single-channel 'L' image, vectorized."""
+        kernel = [row[:kernel_size] for row in kernel[:kernel_size]]
+        response = self.filter_array(np.asarray(gray_image), kernel, border='zero', dtype=np.float64)
+        return Image.fromarray(np.clip(np.round(response), 0, 255).astype(np.uint8), 'L')
+
+    # ---------- Kernel banks ----------
+    def apply_kernel_bank(self, pil_image, kernels, output='image'):
+        """
+        Apply several kernels to the same image in one pass. The image is
+        zero-padded once for the largest kernel; every tap offset used by any
+        kernel is sliced from the padded buffer once and accumulated into each
+        kernel that has a weight there (e.g. Sobel x/y and the Laplacian share
+        their neighbour loads).
+        kernels: Kernel objects (see KernelRegistry), nested lists or registry type names
+        output: 'image' - clamped, rounded images, same as apply_convolution
+                'array' - raw float64 responses (H x W, or H x W x 3 for colour)
+        Returns a list in the order of kernels.
+        """
+        if pil_image is None:
+            return None
+        if output not in ('image', 'array'):
+            raise ValueError(f"Unknown output: {output}")
+        kernels = [KernelRegistry.get(k) if isinstance(k, str) else
+                   k if isinstance(k, Kernel) else KernelRegistry.from_values(k) for k in kernels]
+
+        if pil_image.mode in ('L', '1'):
+            pil_image = pil_image.convert('L')
+        elif pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        pixels = np.asarray(pil_image, dtype=np.float64)
+        height, width = pixels.shape[:2]
+
+        # Step 1: Pad once for the largest kernel
+        pad = max(k.size for k in kernels) // 2
+        padding = ((pad, pad), (pad, pad)) + ((0, 0),) * (pixels.ndim - 2)
+        padded = np.pad(pixels, padding)
+
+        # Step 2: Group the non-zero taps of all kernels by offset
+        taps = {}
+        for index, kernel in enumerate(kernels):
+            for dy, dx, weight in kernel.offsets():
+                taps.setdefault((dy, dx), []).append((index, weight))
+
+        # Step 3: One window load per offset, accumulated into every kernel using it
+        responses = [np.zeros_like(pixels) for _ in kernels]
+        for (dy, dx), users in taps.items():
+            window = padded[pad + dy:pad + dy + height, pad + dx:pad + dx + width]
+            for index, weight in users:
+                responses[index] += window * weight
+
+        if output == 'array':
+            return responses
+        return [Image.fromarray(np.clip(np.round(r), 0, 255).astype(np.uint8), pil_image.mode)
+                for r in responses]
+
+    @staticmethod
+    def filter_array(array, kernel, border='zero', dtype=np.float32):
+        """
+        Correlate a 2D array with a kernel (Kernel, registry type name or nested
+        lists) and return a float array of the same shape. Separable kernels
+        run as a column pass and a row pass over their factors, with mirrored
+        taps of equal (or opposite) weight folded into one multiply.
+        border: 'zero' (as apply_convolution) or 'replicate' (edge pixels
+        repeated, so the frame itself does not show up as an edge)
+        """
+        if isinstance(kernel, str):
+            kernel = KernelRegistry.get(kernel)
+        elif not isinstance(kernel, Kernel):
+            kernel = KernelRegistry.from_values(kernel)
+        if border not in ('zero', 'replicate'):
+            raise ValueError(f"Unknown border: {border}")
+        array = np.asarray(array)
+        height, width = array.shape
+        pad = kernel.size // 2
+        padded = np.pad(array.astype(dtype, copy=False), pad,
+                        mode='constant' if border == 'zero' else 'edge')
+
+        if kernel.separable:
+            column, row = kernel.factors
+            vertical = _weighted_taps([padded[i:i + height] for i in range(kernel.size)], column, dtype)
+            return _weighted_taps([vertical[:, i:i + width] for i in range(kernel.size)], row, dtype)
+
+        result = np.zeros((height, width), dtype=dtype)
+        for dy, dx, weight in kernel.offsets():
+            result += padded[pad + dy:pad + dy + height, pad + dx:pad + dx + width] * dtype(weight)
+        return result
+
+    # ---------- Predefined kernels (cached in KernelRegistry) ----------
     @staticmethod
     def get_smoothing_kernel(size=3):
         """Averaging kernel (all ones, normalized to sum = 1)"""
-        val = 1.0 / (size * size)
-        return [[val for _ in range(size)] for _ in range(size)]
+        return KernelRegistry.get('smoothing', size).to_list()
 
     @staticmethod
     def get_gaussian_kernel(size=3, sigma=1.0):
         """Gaussian kernel (normalized to sum = 1)"""
-        kernel = [[0.0 for _ in range(size)] for _ in range(size)]
-        offset = size // 2
-        total = 0.0
-        for i in range(size):
-            for j in range(size):
-                x = i - offset
-                y = j - offset
-                kernel[i][j] = math.exp(-(x*x + y*y) / (2*sigma*sigma)) / (2*math.pi*sigma*sigma)
-                total += kernel[i][j]
-        for i in range(size):
-            for j in range(size):
-                kernel[i][j] /= total
-        return kernel
+        return KernelRegistry.get('gaussian', size, sigma).to_list()
 
     @staticmethod
     def get_sharpening_kernel():
         """Standard sharpening kernel (sum = 1)"""
-        return [[0, -1, 0],
-                [-1, 5, -1],
-                [0, -1, 0]]
+        return KernelRegistry.get('sharpening').to_list()
 
     @staticmethod
     def get_mean_removal_kernel():
         """High-pass filter (mean removal, sum = 0)"""
-        return [[-1, -1, -1],
-                [-1,  8, -1],
-                [-1, -1, -1]]
+        return KernelRegistry.get('mean_removal').to_list()
 
     @staticmethod
     def get_emboss_kernel():
         """Emboss kernel (south-east direction)"""
-        return [[-2, -1, 0],
-                [-1,  1, 1],
-                [ 0,  1, 2]]
+        return KernelRegistry.get('emboss').to_list()
 
     @staticmethod
     def parse_custom_kernel(kernel_str):
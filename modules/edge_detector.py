@@ -0,0 +1,219 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image, ImageChops
+from modules.component_analyzer import ComponentAnalyzer
+from modules.convolution_filters import ConvolutionFilter
+from modules.grayscale_converter import GrayscaleConverter
+from modules.kernel_registry import KernelRegistry
+
+EDGE_METHODS = ('canny', 'sobel', 'scharr', 'orientation')
+
+# Gradient kernel pairs; Scharr is scaled by 1/4 so both report on the Sobel scale
+_OPERATORS = {
+    'sobel': ('sobel_x', 'sobel_y', 1.0),
+    'scharr': ('scharr_x', 'scharr_y', 0.25),
+}
+
+# Rows per band: few enough numpy calls, small enough that a band stays in cache
+_BAND_ROWS = 64
+
+_TAN_22_5 = np.float32(np.tan(np.pi / 8))
+
+_hue_palette = None   # 256-entry RGB hue ramp for the orientation rendering, built on first use
+
+
+class EdgeDetector:
+    """
+    Gradient magnitude / orientation (Sobel, Scharr) and Canny edge maps on the
+    luma plane. Gradients are computed in row bands (luma, optional Gaussian,
+    both derivative kernels and the magnitude per band) through
+    ConvolutionFilter.filter_array with replicated borders.
+    """
+
+    def __init__(self):
+        self.gx = None
+        self.gy = None
+        self.magnitude = None
+        self.edge_pixels = 0
+        self.thresholds = None   # (low, high) of the last Canny run
+
+    # ---------- Gradients ----------
+    @staticmethod
+    def smoothing_kernel(sigma):
+        """Gaussian covering about +/-1.5 sigma (the classic 5x5 at sigma = 1.4)."""
+        radius = max(1, int(round(1.5 * sigma)))
+        return KernelRegistry.get('gaussian', 2 * radius + 1, sigma)
+
+    @staticmethod
+    def gradients(pil_image, operator='sobel', sigma=None):
+        """
+        (gx, gy, magnitude) float32 arrays of the image luma. gx grows to the
+        right, gy downwards. sigma: optional Gaussian smoothing first.
+        """
+        if operator not in _OPERATORS:
+            raise ValueError(f"Unknown gradient operator: {operator}")
+        name_x, name_y, scale = _OPERATORS[operator]
+        kernel_x, kernel_y = KernelRegistry.get(name_x), KernelRegistry.get(name_y)
+        blur = EdgeDetector.smoothing_kernel(sigma) if sigma else None
+
+        if pil_image.mode in ('L', '1'):
+            pixels = np.asarray(pil_image.convert('L') if pil_image.mode == '1' else pil_image)
+        else:
+            pixels = np.asarray(pil_image if pil_image.mode in ('RGB', 'RGBA') else pil_image.convert('RGB'))
+        height, width = pixels.shape[:2]
+        halo = 1 + (blur.size // 2 if blur is not None else 0)
+        gx = np.empty((height, width), dtype=np.float32)
+        gy = np.empty_like(gx)
+        magnitude = np.empty_like(gx)
+
+        def band(top):
+            bottom = min(height, top + _BAND_ROWS)
+            if top >= halo and bottom + halo <= height:
+                plane = pixels[top - halo:bottom + halo]
+            else:
+                # Rows outside the image repeat the border row, as the column padding does
+                plane = pixels[np.clip(np.arange(top - halo, bottom + halo), 0, height - 1)]
+            if plane.ndim == 3:
+                plane = GrayscaleConverter.luma_array(plane)
+            if blur is not None:
+                plane = ConvolutionFilter.filter_array(plane, blur, border='replicate')
+            inner = slice(halo, halo + bottom - top)
+            x = ConvolutionFilter.filter_array(plane, kernel_x, border='replicate')[inner]
+            y = ConvolutionFilter.filter_array(plane, kernel_y, border='replicate')[inner]
+            if scale != 1.0:
+                x *= np.float32(scale)
+                y *= np.float32(scale)
+            gx[top:bottom], gy[top:bottom] = x, y
+            out = magnitude[top:bottom]
+            np.multiply(x, x, out=out)
+            out += y * y
+            np.sqrt(out, out=out)
+
+        EdgeDetector._run(band, range(0, height, _BAND_ROWS))
+        return gx, gy, magnitude
+
+    @staticmethod
+    def orientation(gx, gy):
+        """Gradient direction in degrees, (-180, 180], 0 = towards +x, 90 = towards +y (down)."""
+        return np.degrees(np.arctan2(gy, gx))
+
+    @staticmethod
+    def _run(func, items):
+        # numpy releases the GIL in the heavy steps, so bands overlap
+        items = list(items)
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+                list(pool.map(func, items))
+        else:
+            for item in items:
+                func(item)
+
+    @staticmethod
+    def _to_levels(values, normalize):
+        """float array -> 'L' image, scaled so the maximum is 255 (normalize) or clipped."""
+        if normalize:
+            peak = float(values.max()) if values.size else 0.0
+            values = values * np.float32(255.0 / peak) if peak > 0 else np.zeros_like(values)
+        return Image.fromarray(np.clip(values, 0, 255).astype(np.uint8), 'L')
+
+    def gradient_magnitude(self, pil_image, operator='sobel', sigma=None, normalize=True):
+        """Gradient magnitude as an 'L' image."""
+        self.gx, self.gy, self.magnitude = self.gradients(pil_image, operator, sigma)
+        return self._to_levels(self.magnitude, normalize)
+
+    def gradient_orientation(self, pil_image, operator='sobel', sigma=None):
+        """RGB rendering: hue = edge orientation (mod 180 degrees), brightness = magnitude."""
+        global _hue_palette
+        self.gx, self.gy, self.magnitude = self.gradients(pil_image, operator, sigma)
+        height, width = self.magnitude.shape
+        # 256 hue steps per half turn; +512 keeps the value positive so the
+        # truncating cast floors and the mask wraps it to one half turn
+        angle = np.arctan2(self.gy, self.gx)
+        angle *= np.float32(256 / np.pi)
+        angle += np.float32(512)
+        hues = Image.frombytes('P', (width, height), (angle.astype(np.int32) & 255).astype(np.uint8).tobytes())
+        if _hue_palette is None:
+            ramp = Image.frombytes('L', (256, 1), bytes(range(256)))
+            full = Image.new('L', (256, 1), 255)
+            _hue_palette = Image.merge('HSV', (ramp, full, full)).convert('RGB').tobytes()
+        hues.putpalette(_hue_palette)
+        value = self._to_levels(self.magnitude, True)
+        return ImageChops.multiply(hues.convert('RGB'), Image.merge('RGB', (value, value, value)))
+
+    # ---------- Canny ----------
+    @staticmethod
+    def _non_maximum_suppression(gx, gy, magnitude, low):
+        """
+        Flat indices (and magnitudes) of pixels with magnitude >= low that are
+        not smaller than both neighbours along their gradient direction,
+        quantized to 0 / 45 / 90 / 135 degrees. Only candidates are visited.
+        """
+        height, width = magnitude.shape
+        stride = width + 2
+        padded = np.zeros((height + 2, stride), dtype=np.float32)
+        padded[1:-1, 1:-1] = magnitude
+        flat = padded.reshape(-1)
+
+        candidates = np.flatnonzero(magnitude >= low if low > 0 else magnitude > 0)
+        at = candidates + (candidates // width) * 2 + stride + 1
+        m = flat[at]
+        dx = gx.reshape(-1)[candidates]
+        dy = gy.reshape(-1)[candidates]
+        ax, ay = np.abs(dx), np.abs(dy)
+
+        # Neighbour step along the gradient: diagonal by default (sign picks the
+        # diagonal), horizontal within 22.5 degrees of x, vertical within 22.5 of y
+        step = np.where((dx > 0) == (dy > 0), stride + 1, stride - 1)
+        step[ay <= ax * _TAN_22_5] = 1
+        step[ax <= ay * _TAN_22_5] = stride
+        keep = (m >= flat[at + step]) & (m > flat[at - step])
+        return candidates[keep], m[keep]
+
+    def canny(self, pil_image, low=50, high=150, sigma=1.4, operator='sobel'):
+        """
+        Canny edge map ('L', edges 255): Gaussian smoothing, gradients,
+        non-maximum suppression, then hysteresis - thin edges at or above `low`
+        are kept when their 8-connected component reaches `high`.
+        """
+        if low > high:
+            low, high = high, low
+        self.gx, self.gy, self.magnitude = self.gradients(pil_image, operator, sigma)
+        height, width = self.magnitude.shape
+        edges, strength = self._non_maximum_suppression(self.gx, self.gy, self.magnitude, low)
+
+        # Hysteresis through connected components of the thin edges
+        thin = np.zeros(height * width, dtype=bool)
+        thin[edges] = True
+        labels, count = ComponentAnalyzer().label(thin.reshape(height, width), connectivity=8)
+        labels = labels.reshape(-1)
+        anchored = np.zeros(count + 1, dtype=bool)
+        anchored[labels[edges[strength >= high]]] = True
+        anchored[0] = False
+        kept = edges[anchored[labels[edges]]]
+
+        result = np.zeros(height * width, dtype=np.uint8)
+        result[kept] = 255
+        self.edge_pixels = len(kept)
+        self.thresholds = (low, high)
+        return Image.fromarray(result.reshape(height, width), 'L')
+
+    # ---------- Dispatch ----------
+    def detect(self, pil_image, method='canny', low=50, high=150, sigma=None, operator='sobel'):
+        """
+        Run one of EDGE_METHODS:
+          'canny'       - binary edge map (low, high, sigma, operator)
+          'sobel'       - Sobel gradient magnitude
+          'scharr'      - Scharr gradient magnitude
+          'orientation' - colour-coded gradient orientation (operator)
+        sigma: Gaussian smoothing; Canny defaults to 1.4, the gradient methods
+        do not smooth unless it is given.
+        """
+        if method == 'canny':
+            return self.canny(pil_image, low, high, 1.4 if sigma is None else sigma, operator)
+        if method in ('sobel', 'scharr'):
+            return self.gradient_magnitude(pil_image, method, sigma)
+        if method == 'orientation':
+            return self.gradient_orientation(pil_image, operator, sigma)
+        raise ValueError(f"Unknown edge method: {method}")
@@ -0,0 +1,197 @@
+"""
+Streaming input and output for image sequences.
+
+FrameSource reads frames lazily from a numbered stack of files (a directory,
+a glob pattern or an explicit list of paths) or from a multi-frame file
+(animated GIF, multi-page TIFF). Iterating it decodes the next frames on a
+background thread into a small bounded queue, so decoding overlaps with
+processing and at most `prefetch` frames are held in memory.
+
+FrameWriter writes results as they arrive, either as numbered files or as
+pages appended to a single multi-page TIFF, so output memory stays flat too.
+
+Example:
+
+    converter = GrayscaleConverter()
+    process_sequence("scans/*.png", converter.convert_to_grayscale, "out.tif")
+"""
+
+import glob
+import os
+import queue
+import re
+import threading
+from PIL import Image, ImageSequence, TiffImagePlugin
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.gif', '.ppm', '.pgm', '.webp')
+_END = object()
+
+
+def natural_key(path):
+    """Sort key that orders frame_2 before frame_10."""
+    name = os.path.basename(path)
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+class FrameSource:
+    """Lazy, prefetching iterator over the frames of an image sequence."""
+
+    def __init__(self, source, prefetch=2, mode=None):
+        self.prefetch = max(1, int(prefetch))
+        self.mode = mode            # optional conversion applied to every frame
+        self.paths = None           # frame files for a numbered stack
+        self.path = None            # single multi-frame file
+        if isinstance(source, (list, tuple)):
+            self.paths = sorted(source, key=natural_key)
+        elif os.path.isdir(source):
+            self.paths = sorted(
+                (os.path.join(source, name) for name in os.listdir(source)
+                 if name.lower().endswith(IMAGE_EXTENSIONS)),
+                key=natural_key
+            )
+        elif glob.has_magic(source):
+            self.paths = sorted(glob.glob(source), key=natural_key)
+        elif os.path.isfile(source):
+            self.path = source
+        else:
+            raise FileNotFoundError(f"No frames found at {source}")
+        if self.paths is not None and not self.paths:
+            raise FileNotFoundError(f"No frames found at {source}")
+
+    def __len__(self):
+        if self.paths is not None:
+            return len(self.paths)
+        with Image.open(self.path) as img:
+            return getattr(img, 'n_frames', 1)
+
+    def _prepare(self, frame):
+        if self.mode and frame.mode != self.mode:
+            return frame.convert(self.mode)
+        if frame.mode == 'P':
+            return frame.convert('RGBA' if 'transparency' in frame.info else 'RGB')
+        return frame
+
+    def frames(self):
+        """Generator of decoded frames, in order, without prefetching."""
+        if self.paths is not None:
+            for path in self.paths:
+                with Image.open(path) as img:
+                    img.load()
+                    yield self._prepare(img)
+        else:
+            with Image.open(self.path) as img:
+                for frame in ImageSequence.Iterator(img):
+                    # copy() detaches the frame from the shared file handle
+                    yield self._prepare(frame.copy())
+
+    def __iter__(self):
+        """Iterate frames while the next ones are decoded on a background thread."""
+        buffer = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            """Queue item unless the consumer has stopped; False once stopped."""
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                for frame in self.frames():
+                    if not put(frame):
+                        return
+                put(_END)
+            except Exception as e:
+                put(e)
+
+        worker = threading.Thread(target=producer, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+
+class FrameWriter:
+    """
+    Incremental writer for processed frames.
+
+    A path ending in .tif/.tiff produces one multi-page TIFF, pages appended as
+    they are written. Any other path is a directory (or a pattern containing
+    '{}' such as 'out/frame_{:05d}.png') that receives one numbered file per frame.
+    """
+
+    def __init__(self, path, compression='tiff_lzw'):
+        self.path = path
+        self.compression = compression
+        self.count = 0
+        self._tiff = None
+        self.pattern = None
+        if path.lower().endswith(('.tif', '.tiff')):
+            directory = os.path.dirname(path)
+        elif '{' in path:
+            self.pattern = path
+            directory = os.path.dirname(path)
+        else:
+            self.pattern = os.path.join(path, 'frame_{:05d}.png')
+            directory = path
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.pattern is None:
+            self._tiff = TiffImagePlugin.AppendingTiffWriter(path, new=True)
+
+    def write(self, pil_image):
+        """Append one frame."""
+        if self._tiff is not None:
+            if pil_image.mode not in ('1', 'L', 'RGB', 'RGBA', 'CMYK', 'I;16', 'F'):
+                pil_image = pil_image.convert('RGB')
+            pil_image.save(self._tiff, format='TIFF', compression=self.compression)
+            self._tiff.newFrame()
+        else:
+            pil_image.save(self.pattern.format(self.count))
+        self.count += 1
+
+    def close(self):
+        if self._tiff is not None:
+            self._tiff.close()
+            self._tiff = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def process_sequence(source, frame_func, output_path=None, prefetch=2, mode=None):
+    """
+    Stream every frame of `source` through frame_func and write the results
+    to output_path (see FrameWriter). frame_func may be any filter method
+    taking a PIL image; if it returns a tuple (e.g. ObjectBoxer.box_objects)
+    the first element is used. Returns the number of frames processed, or a
+    list of results when no output_path is given.
+    """
+    frames = FrameSource(source, prefetch=prefetch, mode=mode)
+    if output_path is None:
+        results = []
+        for frame in frames:
+            result = frame_func(frame)
+            results.append(result[0] if isinstance(result, tuple) else result)
+        return results
+
+    with FrameWriter(output_path) as writer:
+        for frame in frames:
+            result = frame_func(frame)
+            writer.write(result[0] if isinstance(result, tuple) else result)
+        return writer.count
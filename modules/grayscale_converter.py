@@ -9,29 +9,55 @@ class GrayscaleConverter:
         self.height = 0
 
     def convert_to_grayscale(self, pil_image):
-        """Convert PIL Image to grayscale using process_pixels."""
+        """Convert PIL Image to a single-channel ('L') grayscale image using process_pixels."""
         if not pil_image:
             return None
 
+        self.width, self.height = pil_image.size
+
+        # Already single-channel: nothing to compute
+        if pil_image.mode in ('L', '1'):
+            self.grayscale_image = pil_image.convert('L') if pil_image.mode == '1' else pil_image.copy()
+            return self.grayscale_image
+
         # Ensure RGB mode for consistent pixel access
         if pil_image.mode not in ('RGB', 'RGBA'):
             pil_image = pil_image.convert('RGB')
 
-        self.width, self.height = pil_image.size
-
         def grayscale_transform(x, y, pixel):
             # pixel is a tuple of length 3 or 4; take first three
-            if len(pixel) >= 3:
-                r, g, b = pixel[0], pixel[1], pixel[2]
-            else:
-                r = g = b = pixel[0]
+            r, g, b = pixel[0], pixel[1], pixel[2]
             gray = int(0.299 * r + 0.587 * g + 0.114 * b)
             gray = max(0, min(255, gray))
-            return (gray, gray, gray)
+            return (gray,)
 
-        self.grayscale_image = process_pixels(pil_image, grayscale_transform, output_mode='RGB')
+        self.grayscale_image = process_pixels(pil_image, grayscale_transform, output_mode='L')
         return self.grayscale_image
 
+    @staticmethod
+    def luma(pil_image):
+        """
+        Grayscale values as a uint8 numpy array, same formula and truncation as
+        convert_to_grayscale, computed in one vectorized pass.
+        """
+        import numpy as np
+        if pil_image.mode in ('L', '1'):
+            return np.asarray(pil_image.convert('L') if pil_image.mode == '1' else pil_image)
+        if pil_image.mode not in ('RGB', 'RGBA'):
+            pil_image = pil_image.convert('RGB')
+        return GrayscaleConverter.luma_array(np.asarray(pil_image))
+
+    @staticmethod
+    def luma_array(rgb):
+        """luma() of an H x W x 3 (or 4) uint8 array, e.g. one band of a larger image."""
+        import numpy as np
+        # Same float64 products and summation order as convert_to_grayscale;
+        # the sum never leaves [0, 255], so truncating astype needs no clip
+        gray = np.multiply(rgb[..., 0], 0.299)
+        gray += np.multiply(rgb[..., 1], 0.587)
+        gray += np.multiply(rgb[..., 2], 0.114)
+        return gray.astype(np.uint8)
+
     def get_grayscale_stats(self):
         """Get statistics using PixelStats utility."""
         if not self.grayscale_image:
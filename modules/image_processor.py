@@ -67,7 +67,7 @@ class ImageProcessor:
         """
         Return number of foreground pixels (object area).
         For background removal (RGBA): count non‑transparent pixels (alpha > 0).
-        For Black & White (RGB binary): count white pixels (value 255).
+        For Black & White / threshold (binary L, 1 or RGB): count white pixels (value 255).
         For other filters: return total image pixels.
         """
         if pil_image is None:
@@ -89,9 +89,18 @@ class ImageProcessor:
                 # Fallback: treat entire image as object
                 return width * height
 
-        elif filter_type == "custom_bw":
-            # Expect RGB image with values 0 or 255
-            if pil_image.mode == 'RGB':
+        elif filter_type in ("custom_bw", "threshold"):
+            # Binary output: 'L' (or '1') with values 0 / 255
+            if pil_image.mode in ('L', '1'):
+                gray = pil_image.convert('L') if pil_image.mode == '1' else pil_image
+                pixels = gray.load()
+                count = 0
+                for y in range(height):
+                    for x in range(width):
+                        if pixels[x, y] == 255:
+                            count += 1
+                return count
+            elif pil_image.mode == 'RGB':
                 pixels = pil_image.load()
                 count = 0
                 for y in range(height):
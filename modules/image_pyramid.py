@@ -0,0 +1,140 @@
+import threading
+import weakref
+from PIL import Image
+
+# Modes Image.reduce() cannot handle, and what to reduce them as
+_REDUCE_AS = {'1': 'L', 'I;16': 'I'}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ImagePyramid:
+    """
+    Successive 2x reductions of an image, built lazily. Level 0 is the source,
+    level n is about 1/2^n of its width and height (sizes round up).
+
+    reduction: 'box'     - average each 2x2 block (display, colour sampling)
+               'nearest' - keep one pixel per block, so values are never
+                           mixed (histograms, Otsu, binary images)
+
+    Use ImagePyramid.get(image) to share one pyramid per source image. The
+    source is held weakly and treated as immutable.
+    """
+
+    def __init__(self, image, reduction='box'):
+        if reduction not in ('box', 'nearest'):
+            raise ValueError(f"Unknown reduction: {reduction}")
+        self.reduction = reduction
+        self.size = image.size
+        self._source = weakref.ref(image)
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get(image, reduction='box'):
+        """Cached pyramid for this image object (dropped when the image is freed)."""
+        key = (id(image), reduction)
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0]() is image:
+                return entry[1]
+            pyramid = ImagePyramid(image, reduction)
+            ref = weakref.ref(image, lambda _ref, key=key: ImagePyramid._evict(key, _ref))
+            _cache[key] = (ref, pyramid)
+            return pyramid
+
+    @staticmethod
+    def _evict(key, ref):
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0] is ref:
+                del _cache[key]
+
+    @property
+    def max_level(self):
+        """Coarsest level (its shorter side is 1 pixel)."""
+        width, height = self.size
+        level = 0
+        while min(width, height) > 1:
+            width, height = (width + 1) // 2, (height + 1) // 2
+            level += 1
+        return level
+
+    def level_size(self, level):
+        """(width, height) of a level without building it."""
+        width, height = self.size
+        for _ in range(level):
+            width, height = (width + 1) // 2, (height + 1) // 2
+        return width, height
+
+    def scale(self, level):
+        """(sx, sy): source pixels per level pixel along each axis."""
+        width, height = self.level_size(level)
+        return self.size[0] / width, self.size[1] / height
+
+    def level(self, level):
+        """Image at the given level (clamped to [0, max_level]), built on demand."""
+        level = max(0, min(int(level), self.max_level))
+        source = self._source()
+        if source is None:
+            raise ReferenceError("The source image of this pyramid no longer exists")
+        if level == 0:
+            return source
+        with self._lock:
+            if level in self._levels:
+                return self._levels[level]
+            # Start from the finest level already built
+            current = max((n for n in self._levels if n < level), default=0)
+            image = source if current == 0 else self._levels[current]
+            while current < level:
+                image = self._reduce(image)
+                current += 1
+                self._levels[current] = image
+            return image
+
+    def _reduce(self, image):
+        width, height = image.size
+        if self.reduction == 'nearest':
+            # Samples land inside each 2x2 block (also for odd sizes)
+            return image.resize(((width + 1) // 2, (height + 1) // 2), Image.NEAREST)
+        if image.mode == 'P':
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        if image.mode in _REDUCE_AS:
+            image = image.convert(_REDUCE_AS[image.mode])
+        return image.reduce(2)
+
+    def level_for_size(self, max_size):
+        """
+        Coarsest level that still has at least as many pixels as the source
+        needs when fitted (aspect kept) into max_size, so a final resize only
+        ever shrinks it.
+        """
+        width, height = self.size
+        factor = min(max_size[0] / width, max_size[1] / height)
+        target_w, target_h = width * factor, height * factor
+        level = 0
+        while level < self.max_level:
+            next_w, next_h = self.level_size(level + 1)
+            if next_w < target_w or next_h < target_h:
+                break
+            level += 1
+        return level
+
+    def for_size(self, max_size):
+        """Image at level_for_size(max_size)."""
+        return self.level(self.level_for_size(max_size))
+
+    def level_for_pixels(self, max_pixels):
+        """Finest level with at most max_pixels pixels."""
+        level = 0
+        while level < self.max_level:
+            width, height = self.level_size(level)
+            if width * height <= max_pixels:
+                break
+            level += 1
+        return level
+
+    def for_pixels(self, max_pixels):
+        """Image at level_for_pixels(max_pixels)."""
+        return self.level(self.level_for_pixels(max_pixels))
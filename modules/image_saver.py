@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import ImageChops
+
+# Encoder settings per profile. PIL's default PNG level (6) is slow on large
+# RGBA outputs; png_fast trades a slightly larger file for a much faster save.
+SAVE_PROFILES = {
+    'png_fast': {'format': 'PNG', 'compress_level': 1},
+    'png_optimized': {'format': 'PNG', 'optimize': True},
+    'jpeg': {'format': 'JPEG', 'quality': 90, 'subsampling': '4:2:0'},
+    'jpeg_high': {'format': 'JPEG', 'quality': 95, 'subsampling': '4:4:4'},
+    'webp_lossless': {'format': 'WEBP', 'lossless': True, 'quality': 80, 'method': 4},
+    'tiff_lzw': {'format': 'TIFF', 'compression': 'tiff_lzw'},
+    'tiff_deflate': {'format': 'TIFF', 'compression': 'tiff_adobe_deflate'},
+    'bmp': {'format': 'BMP'},
+}
+
+_EXTENSION_PROFILES = {
+    '.png': 'png_fast',
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+    '.webp': 'webp_lossless',
+    '.tif': 'tiff_lzw',
+    '.tiff': 'tiff_lzw',
+    '.bmp': 'bmp',
+}
+
+_FORMAT_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'WEBP': '.webp', 'TIFF': '.tiff', 'BMP': '.bmp'}
+
+# Formats that store mode '1' natively (8 pixels per byte)
+_BILEVEL_FORMATS = ('PNG', 'TIFF', 'BMP')
+
+_executor = None
+
+
+class ImageSaver:
+    """Save images with format-tuned encoder profiles, optionally in the background."""
+
+    @staticmethod
+    def profile_for_path(file_path):
+        """Default profile for a file extension (png_fast for unknown extensions)."""
+        ext = os.path.splitext(file_path)[1].lower()
+        return _EXTENSION_PROFILES.get(ext, 'png_fast')
+
+    @staticmethod
+    def ensure_extension(file_path, profile):
+        """Append the profile's extension unless the path already has a matching one."""
+        file_format = SAVE_PROFILES[profile]['format']
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in _EXTENSION_PROFILES and SAVE_PROFILES[_EXTENSION_PROFILES[ext]]['format'] == file_format:
+            return file_path
+        return file_path + _FORMAT_EXTENSIONS[file_format]
+
+    @staticmethod
+    def check_extension(file_path, file_format):
+        """Raise ValueError if the path's extension belongs to a different format."""
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in _EXTENSION_PROFILES and SAVE_PROFILES[_EXTENSION_PROFILES[ext]]['format'] != file_format:
+            raise ValueError(f"Cannot save {file_format} data to a '{ext}' file")
+
+    @staticmethod
+    def is_binary_mask(pil_image):
+        """True if the image only holds black and white (all channels equal)."""
+        if pil_image.mode == '1':
+            return True
+        if pil_image.mode not in ('L', 'RGB'):
+            return False
+        bands = pil_image.split()
+        for band in bands[1:]:
+            if ImageChops.difference(bands[0], band).getbbox() is not None:
+                return False
+        histogram = bands[0].histogram()
+        return sum(histogram[1:255]) == 0
+
+    @staticmethod
+    def prepare(pil_image, file_format, pack_masks=True):
+        """Convert the image to a mode the encoder can store (and pack masks to 1 bit)."""
+        if pack_masks and file_format in _BILEVEL_FORMATS and ImageSaver.is_binary_mask(pil_image):
+            if pil_image.mode == '1':
+                return pil_image
+            return pil_image.getchannel(0).point(lambda v: 255 if v else 0, '1')
+        if file_format == 'JPEG' and pil_image.mode not in ('L', 'RGB', 'CMYK'):
+            return pil_image.convert('RGB')
+        if file_format == 'BMP' and pil_image.mode not in ('1', 'L', 'P', 'RGB'):
+            return pil_image.convert('RGBA' if 'A' in pil_image.getbands() else 'RGB')
+        if file_format == 'WEBP' and pil_image.mode not in ('RGB', 'RGBA'):
+            return pil_image.convert('RGBA' if 'A' in pil_image.getbands() else 'RGB')
+        return pil_image
+
+    @staticmethod
+    def save(pil_image, file_path, profile=None, pack_masks=True, **overrides):
+        """
+        Save with a named profile (see SAVE_PROFILES; chosen from the extension
+        when omitted). Extra keyword arguments override the profile's settings.
+        Raises ValueError if the extension names another format than the
+        profile's (e.g. a JPEG profile for 'out.png').
+        """
+        if profile is None:
+            profile = ImageSaver.profile_for_path(file_path)
+        if profile not in SAVE_PROFILES:
+            raise ValueError(f"Unknown save profile: {profile}")
+        options = dict(SAVE_PROFILES[profile])
+        options.update(overrides)
+        file_format = options.pop('format')
+        ImageSaver.check_extension(file_path, file_format)
+        image = ImageSaver.prepare(pil_image, file_format, pack_masks)
+        image.save(file_path, format=file_format, **options)
+        return file_path
+
+    @staticmethod
+    def save_async(pil_image, file_path, profile=None, pack_masks=True, **overrides):
+        """Save on a background thread; returns a concurrent.futures.Future of the path."""
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-saver')
+        # Snapshot the pixels so later edits to the source cannot race the encoder
+        image = pil_image.copy()
+        return _executor.submit(ImageSaver.save, image, file_path, profile, pack_masks, **overrides)
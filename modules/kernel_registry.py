@@ -0,0 +1,157 @@
+"""
+Registry of convolution kernels, built once and cached as read-only numpy
+arrays keyed by (type, size, sigma). Each entry carries the properties the
+filters and the controls care about: sum, separable (rank one, with its
+column/row factors), symmetric (unchanged by a 180-degree turn, so
+correlation and convolution agree) and normalized (sum == 1).
+"""
+
+import math
+import threading
+import numpy as np
+
+
+class Kernel:
+    """A cached kernel: values plus precomputed properties."""
+
+    def __init__(self, name, values):
+        array = np.array(values, dtype=np.float64)
+        if array.ndim != 2 or array.shape[0] != array.shape[1] or array.shape[0] % 2 == 0:
+            raise ValueError("Kernel must be a square array with an odd size")
+        array.setflags(write=False)
+        self.name = name
+        self.array = array
+        self.size = array.shape[0]
+        self.sum = float(array.sum())
+        self.normalized = math.isclose(self.sum, 1.0, abs_tol=1e-9)
+        self.symmetric = bool(np.allclose(array, array[::-1, ::-1]))
+        self.separable, self.factors = self._factorize(array)
+
+    @staticmethod
+    def _factorize(array):
+        """(True, (column, row)) if array == outer(column, row), else (False, None)."""
+        s = np.linalg.svd(array, compute_uv=False)
+        if s[0] == 0 or s[1:].max(initial=0.0) > 1e-10 * s[0]:
+            return False, None
+        # Take the factors from the pivot's column and row rather than the SVD
+        # vectors, so integer kernels keep exact (and exactly symmetric) factors
+        i, j = np.unravel_index(np.argmax(np.abs(array)), array.shape)
+        column, row = array[:, j].copy(), array[i, :] / array[i, j]
+        column.setflags(write=False)
+        row.setflags(write=False)
+        return True, (column, row)
+
+    def to_list(self):
+        """Nested lists, the format ConvolutionFilter.apply_convolution takes."""
+        return self.array.tolist()
+
+    def offsets(self):
+        """(dy, dx, weight) for every non-zero tap, relative to the centre."""
+        pad = self.size // 2
+        rows, cols = np.nonzero(self.array)
+        return [(int(r) - pad, int(c) - pad, float(self.array[r, c])) for r, c in zip(rows, cols)]
+
+    def describe(self):
+        """Short property summary, e.g. 'sum 1.0000 · separable · symmetric'."""
+        parts = [f"sum {self.sum:.4f}"]
+        if self.separable:
+            parts.append("separable")
+        if self.symmetric:
+            parts.append("symmetric")
+        return " · ".join(parts)
+
+
+def _smoothing(size, sigma):
+    return np.full((size, size), 1.0 / (size * size))
+
+
+def _gaussian(size, sigma):
+    # Same formula as the original nested-list builder, normalized to sum = 1
+    offset = size // 2
+    coords = np.arange(size) - offset
+    x, y = np.meshgrid(coords, coords, indexing='ij')
+    kernel = np.exp(-(x * x + y * y) / (2 * sigma * sigma)) / (2 * math.pi * sigma * sigma)
+    return kernel / kernel.sum()
+
+
+def _fixed(values):
+    def build(size, sigma):
+        return values
+    return build
+
+
+_BUILDERS = {
+    'smoothing': _smoothing,
+    'gaussian': _gaussian,
+    'sharpening': _fixed([[0, -1, 0], [-1, 5, -1], [0, -1, 0]]),
+    'mean_removal': _fixed([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]]),
+    'emboss': _fixed([[-2, -1, 0], [-1, 1, 1], [0, 1, 2]]),
+    'sobel_x': _fixed([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]]),
+    'sobel_y': _fixed([[-1, -2, -1], [0, 0, 0], [1, 2, 1]]),
+    'scharr_x': _fixed([[-3, 0, 3], [-10, 0, 10], [-3, 0, 3]]),
+    'scharr_y': _fixed([[-3, -10, -3], [0, 0, 0], [3, 10, 3]]),
+    'laplacian': _fixed([[0, 1, 0], [1, -4, 1], [0, 1, 0]]),
+}
+
+# Kernel types whose size is fixed at 3
+_FIXED_SIZE = {'sharpening', 'mean_removal', 'emboss', 'sobel_x', 'sobel_y', 'scharr_x', 'scharr_y', 'laplacian'}
+
+# Display name -> (type, size, sigma), shared by the convolution controls and batch
+KERNEL_PRESETS = {
+    "Smoothing (Average)": ('smoothing', 3, None),
+    "Gaussian Blur": ('gaussian', 3, 1.0),
+    "Sharpening": ('sharpening', 3, None),
+    "Mean Removal (High-pass)": ('mean_removal', 3, None),
+    "Emboss": ('emboss', 3, None),
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class KernelRegistry:
+    """Build-once access to named kernels."""
+
+    @staticmethod
+    def kernel_types():
+        return tuple(_BUILDERS)
+
+    @staticmethod
+    def get(kernel_type, size=3, sigma=None):
+        """Cached Kernel for (kernel_type, size, sigma); sigma defaults to 1.0 for 'gaussian'."""
+        if kernel_type not in _BUILDERS:
+            raise ValueError(f"Unknown kernel type: {kernel_type}")
+        if kernel_type in _FIXED_SIZE:
+            size = 3
+        if kernel_type == 'gaussian':
+            sigma = 1.0 if sigma is None else float(sigma)
+        else:
+            sigma = None
+        key = (kernel_type, int(size), sigma)
+        with _cache_lock:
+            kernel = _cache.get(key)
+            if kernel is None:
+                kernel = Kernel(kernel_type, _BUILDERS[kernel_type](int(size), sigma))
+                _cache[key] = kernel
+        return kernel
+
+    @staticmethod
+    def preset(display_name):
+        """Kernel for one of the KERNEL_PRESETS display names, or None."""
+        spec = KERNEL_PRESETS.get(display_name)
+        return KernelRegistry.get(*spec) if spec else None
+
+    @staticmethod
+    def register(kernel_type, builder, fixed_size=False):
+        """Add a kernel type; builder(size, sigma) returns a square array or nested lists."""
+        with _cache_lock:
+            _BUILDERS[kernel_type] = builder
+            if fixed_size:
+                _FIXED_SIZE.add(kernel_type)
+            for key in [k for k in _cache if k[0] == kernel_type]:
+                del _cache[key]
+
+    @staticmethod
+    def from_values(values, name='custom'):
+        """Uncached Kernel for user-supplied values (e.g. the custom 3x3 entries)."""
+        return Kernel(name, values)
@@ -1,14 +1,22 @@
-from modules.pixel_processor import process_pixels
-
 class ImageMirror:
     def __init__(self):
         self.mirrored_image = None
         self.mirror_type = "horizontal"
 
+    @staticmethod
+    def _native_mode(pil_image):
+        """Keep L/RGB/RGBA as they are ('1' is read as 'L'); other modes become RGB."""
+        if pil_image.mode == '1':
+            return pil_image.convert('L')
+        if pil_image.mode not in ('L', 'RGB', 'RGBA'):
+            return pil_image.convert('RGB')
+        return pil_image
+
     def mirror_horizontal(self, pil_image):
         """Mirror horizontally using manual pixel mapping."""
         def h_mirror_transform(x, y, pixel):
             pass
+        pil_image = self._native_mode(pil_image)
         width, height = pil_image.size
         # Convert PIL to list of lists of tuples
         pixels = pil_image.load()
@@ -17,7 +25,7 @@ class ImageMirror:
         mirrored_list = [row[::-1] for row in img_list]
         # Create new PIL image from list
         from PIL import Image
-        result = Image.new('RGB', (width, height))
+        result = Image.new(pil_image.mode, (width, height))
         res_pixels = result.load()
         for y in range(height):
             for x in range(width):
@@ -27,13 +35,14 @@ class ImageMirror:
 
     def mirror_vertical(self, pil_image):
         """Mirror vertically using manual pixel mapping."""
+        pil_image = self._native_mode(pil_image)
         width, height = pil_image.size
         pixels = pil_image.load()
         img_list = [[pixels[x, y] for x in range(width)] for y in range(height)]
         # Reverse rows
         mirrored_list = img_list[::-1]
         from PIL import Image
-        result = Image.new('RGB', (width, height))
+        result = Image.new(pil_image.mode, (width, height))
         res_pixels = result.load()
         for y in range(height):
             for x in range(width):
@@ -0,0 +1,175 @@
+"""
+Binary morphology on bit-packed masks.
+
+Rectangular structuring elements are separable, so each operation is a
+running AND (erosion) or OR (dilation) along rows and then along columns.
+Both passes use the van Herk / Gil-Werman scheme: the axis is cut into blocks
+of the window length, prefix and suffix accumulations are taken inside every
+block, and each output is one combination of a suffix and a prefix value, so
+the cost does not depend on the element size. The passes run on masks packed
+eight pixels per byte across the other axis (np.packbits), so every numpy
+operation moves eight pixels at a time.
+
+Pixels outside the image are ignored (they never erode the border and never
+dilate into it).
+"""
+
+import numpy as np
+from modules.component_analyzer import ComponentAnalyzer
+
+MORPHOLOGY_OPERATIONS = ('erode', 'dilate', 'open', 'close', 'fill_holes', 'area_open')
+
+
+def _running(packed, length, axis, op):
+    """van Herk / Gil-Werman running op over a centred window of `length` along axis (0 or 1)."""
+    if length <= 1:
+        return packed
+    moved = np.moveaxis(packed, axis, 0)
+    n = moved.shape[0]
+    before = length // 2
+    identity = 0xFF if op is np.bitwise_and else 0
+    total = -(-(n + length - 1) // length) * length
+    padded = np.full((total,) + moved.shape[1:], identity, dtype=np.uint8)
+    padded[before:before + n] = moved
+
+    blocks = padded.reshape((total // length, length) + moved.shape[1:])
+    prefix = op.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    # Window [i, i + length - 1] = suffix of its first block ∘ prefix of the next
+    result = op(suffix[:n], prefix[length - 1:length - 1 + n])
+    return np.ascontiguousarray(np.moveaxis(result, 0, axis))
+
+
+def _pack_rows(mask):
+    """np.packbits(mask, axis=0) built from contiguous row shifts (much faster)."""
+    height, width = mask.shape
+    groups = -(-height // 8)
+    padded = np.zeros((groups * 8, width), dtype=np.uint8)
+    padded[:height] = mask
+    padded = padded.reshape(groups, 8, width)
+    packed = padded[:, 0] << 7
+    for bit in range(1, 8):
+        packed |= padded[:, bit] << (7 - bit)
+    return packed
+
+
+def _unpack_rows(packed, height):
+    groups, width = packed.shape
+    out = np.empty((groups, 8, width), dtype=np.uint8)
+    for bit in range(8):
+        np.bitwise_and(packed >> (7 - bit), 1, out=out[:, bit])
+    return out.reshape(groups * 8, width)[:height].view(bool)
+
+
+def _rect(mask, size, ops):
+    """
+    Apply rectangle erosions/dilations (ops: np.bitwise_and / np.bitwise_or)
+    in sequence. Passes alternate row, column, column, row, ... so two
+    neighbouring column passes share one packing of the mask.
+    """
+    width, height = size
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    packed = None
+    for index, op in enumerate(ops):
+        axes = ('rows', 'columns') if index % 2 == 0 else ('columns', 'rows')
+        for axis in axes:
+            if axis == 'rows' and width > 1:
+                if packed is not None:
+                    mask = np.unpackbits(packed, axis=1, count=cols).view(bool)
+                    packed = None
+                # Eight rows per byte: the window slides along axis 1
+                mask = _unpack_rows(_running(_pack_rows(mask), width, 1, op), rows)
+            elif axis == 'columns' and height > 1:
+                if packed is None:
+                    packed = np.packbits(mask, axis=1)
+                # Eight columns per byte: the window slides along axis 0
+                packed = _running(packed, height, 0, op)
+    if packed is not None:
+        mask = np.unpackbits(packed, axis=1, count=cols).view(bool)
+    return mask
+
+
+class Morphology:
+    """Erosion, dilation and derived operations on binary masks (bool arrays)."""
+
+    @staticmethod
+    def to_mask(image):
+        """Foreground mask of a PIL image or array: alpha > 0 for RGBA/LA, else non-zero luma."""
+        if hasattr(image, 'mode'):
+            if image.mode in ('RGBA', 'LA'):
+                return np.asarray(image.getchannel('A')) > 0
+            if image.mode not in ('L', '1'):
+                image = image.convert('L')
+        return np.asarray(image) != 0
+
+    @staticmethod
+    def _size(size):
+        if isinstance(size, int):
+            return size, size
+        return int(size[0]), int(size[1])
+
+    @staticmethod
+    def erode(mask, size=3):
+        """Erosion by a size (or (width, height)) rectangle."""
+        return _rect(mask, Morphology._size(size), [np.bitwise_and])
+
+    @staticmethod
+    def dilate(mask, size=3):
+        """Dilation by a size (or (width, height)) rectangle."""
+        return _rect(mask, Morphology._size(size), [np.bitwise_or])
+
+    @staticmethod
+    def open(mask, size=3):
+        """Erode then dilate: removes specks and thin spurs smaller than the element."""
+        return _rect(mask, Morphology._size(size), [np.bitwise_and, np.bitwise_or])
+
+    @staticmethod
+    def close(mask, size=3):
+        """Dilate then erode: bridges small gaps and fills small dents."""
+        return _rect(mask, Morphology._size(size), [np.bitwise_or, np.bitwise_and])
+
+    @staticmethod
+    def fill_holes(mask):
+        """Fill background regions that do not touch the image border."""
+        mask = np.asarray(mask, dtype=bool)
+        analyzer = ComponentAnalyzer()
+        labels, count = analyzer.label(~mask, connectivity=4)
+        border = np.concatenate((labels[0], labels[-1], labels[:, 0], labels[:, -1]))
+        outside = np.zeros(count + 1, dtype=bool)
+        outside[np.unique(border)] = True
+        outside[0] = True
+        return mask | ~outside[labels]
+
+    @staticmethod
+    def area_open(mask, min_area, connectivity=8):
+        """Remove connected components with fewer than min_area pixels."""
+        mask = np.asarray(mask, dtype=bool)
+        if min_area <= 1:
+            return mask
+        analyzer = ComponentAnalyzer()
+        labels, count = analyzer.label(mask, connectivity=connectivity)
+        areas = np.bincount(labels.ravel(), minlength=count + 1)
+        keep = areas >= min_area
+        keep[0] = False
+        return keep[labels]
+
+    @staticmethod
+    def apply(mask, operation, size=3):
+        """
+        Run one of MORPHOLOGY_OPERATIONS by name. size is the element size
+        (int or (width, height)), or the minimum area for 'area_open'.
+        """
+        if operation == 'erode':
+            return Morphology.erode(mask, size)
+        if operation == 'dilate':
+            return Morphology.dilate(mask, size)
+        if operation == 'open':
+            return Morphology.open(mask, size)
+        if operation == 'close':
+            return Morphology.close(mask, size)
+        if operation == 'fill_holes':
+            return Morphology.fill_holes(mask)
+        if operation == 'area_open':
+            return Morphology.area_open(mask, size)
+        raise ValueError(f"Unknown morphology operation: {operation}")
@@ -1,36 +1,82 @@
 from PIL import Image
+import numpy as np
 from modules.background_remover import BackgroundRemover
 from modules.grayscale_converter import GrayscaleConverter
-from modules.pixel_processor import get_image_info, process_pixels
+from modules.pixel_processor import get_image_info
+from modules.component_analyzer import ComponentAnalyzer, clip_box
+from modules.morphology import Morphology
+from modules.object_index import ObjectIndex
+from modules.overlay_renderer import OverlayRenderer
 
 class ObjectBoxer:
     def __init__(self):
         self.result_image = None
         self.object_area = 0
         self.objects = []
+        self.label_map = None
+        self.properties = None   # columnar region properties (see ComponentAnalyzer.measure)
+        self.index = None
+        self.dropped_objects = 0   # components removed by the area / count limits
 
-    def box_objects(self, pil_image, threshold=128, include_full_image=False):
+    def box_objects(self, pil_image, threshold=128, include_full_image=False, store=None,
+                    cleanup=None, cleanup_size=3, method='background', roi=None,
+                    min_area=0, max_area=None, max_objects=None):
+        """
+        Detect foreground objects, box them and return (image, object_area).
+        If an IntermediateStore is given, the foreground mask, label map and
+        luma plane are kept in it (disk-backed) instead of as Python lists.
+        cleanup: optional Morphology operation ('open', 'close', 'area_open', ...)
+        applied to the foreground mask before labeling, with cleanup_size as
+        its element size (minimum area for 'area_open').
+        method: 'background' - foreground is what BackgroundRemover keeps
+                'threshold'  - foreground is the side of `threshold` (luma)
+                               that most border pixels are not on
+        roi: (left, top, right, bottom) box; only pixels inside it are segmented
+        and labeled. min_area / max_area / max_objects limit the components
+        kept (see ComponentAnalyzer.label).
+        """
         # Use pixel_processor to get dimensions
         width, height, channels, total_pixels, mode = get_image_info(pil_image)
+        if method not in ('background', 'threshold'):
+            raise ValueError(f"Unknown segmentation method: {method}")
+        box = clip_box(roi, width, height) if roi is not None else (0, 0, width, height)
+        region = pil_image if box == (0, 0, width, height) else pil_image.crop(box)
+        if region.width == 0 or region.height == 0:
+            raise Exception("Region of interest is empty - cannot detect objects")
 
-        # Step 1: Background removal
-        bg_remover = BackgroundRemover()
-        rgba_img = bg_remover.remove_background(pil_image, tolerance=30)
-        if rgba_img is None:
-            raise Exception("Background removal failed - cannot detect objects")
-
-        # Step 2: Create foreground mask using process_pixels
-        def mask_transform(x, y, pixel):
-            return (1 if pixel[3] > 0 else 0,)
-        mask_img = process_pixels(rgba_img, mask_transform, output_mode='L')
-        mask_pixels = mask_img.load()
-        fg_mask = [[0 for _ in range(width)] for _ in range(height)]
-        for y in range(height):
-            for x in range(width):
-                fg_mask[y][x] = mask_pixels[x, y]
-
-        # Step 3: Connected component labeling (manual loops)
-        objects = self._label_components(fg_mask)
+        # Step 1 + 2: Foreground mask of the region
+        if method == 'threshold':
+            foreground = GrayscaleConverter.luma(region) >= threshold
+            border = np.concatenate((foreground[0], foreground[-1], foreground[:, 0], foreground[:, -1]))
+            if np.count_nonzero(border) * 2 > border.size:
+                foreground = ~foreground   # background is bright: objects are the dark side
+        else:
+            # Background removal; foreground = opaque pixels
+            bg_remover = BackgroundRemover()
+            rgba_img = bg_remover.remove_background(region, tolerance=30)
+            if rgba_img is None:
+                raise Exception("Background removal failed - cannot detect objects")
+            foreground = np.asarray(rgba_img.getchannel('A')) > 0
+
+        # Step 2b: Optional morphological cleanup, so specks do not become objects
+        if cleanup:
+            foreground = Morphology.apply(foreground, cleanup, cleanup_size)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        mask[box[1]:box[3], box[0]:box[2]] = foreground
+
+        # Step 3: Connected component labeling (ROI only, size limits applied) and region properties
+        analyzer = ComponentAnalyzer()
+        labels, _ = analyzer.label(mask, roi=box, min_area=min_area, max_area=max_area,
+                                   max_objects=max_objects)
+        if analyzer.dropped:
+            mask = (labels > 0).astype(np.uint8)
+        mask_img = Image.fromarray(mask, 'L')
+        if store is not None:
+            store.put('mask', mask_img)
+        self.dropped_objects = analyzer.dropped
+        self.properties = analyzer.measure(pil_image)
+        self.label_map = store.put('labels', labels) if store is not None else labels
+        objects = analyzer.to_objects()
 
         # Compute total area of real objects only
         total_object_pixels = sum(obj['area'] for obj in objects)
@@ -47,91 +93,42 @@ class ObjectBoxer:
             objects.append(full_object)
 
         self.object_area = total_object_pixels   # store only real objects' area
-        self.objects = objects
+        self.set_objects(objects, self.label_map)
 
-        # Step 4: Convert full image to grayscale
+        # Step 4: Convert full image to grayscale ('L'); expand to RGB only for the colour output
         converter = GrayscaleConverter()
         grayscale_full = converter.convert_to_grayscale(pil_image)
-        if grayscale_full.mode != 'RGB':
-            grayscale_full = grayscale_full.convert('RGB')
-        result = grayscale_full.copy()
-        result_pixels = result.load()
+        if store is not None:
+            store.put('luma', grayscale_full)
+        grayscale_full = grayscale_full.convert('RGB')
 
         # Step 5: Prepare original RGB
         if pil_image.mode != 'RGB':
             original_rgb = pil_image.convert('RGB')
         else:
             original_rgb = pil_image
-        original_pixels = original_rgb.load()
 
-        # Step 6: Restore foreground color
-        for y in range(height):
-            for x in range(width):
-                if fg_mask[y][x] == 1:
-                    result_pixels[x, y] = original_pixels[x, y]
+        # Step 6: Restore foreground color (one masked composite)
+        result = OverlayRenderer.composite_foreground(grayscale_full, original_rgb, mask_img)
 
-        # Step 7: Draw bounding boxes for all objects
-        for obj in objects:
-            self._draw_box_manual(result, obj['bbox'], color=(255, 0, 0), thickness=2)
+        # Step 7: Draw bounding boxes for all objects (batched)
+        result = OverlayRenderer.draw_boxes(result, objects, color=(255, 0, 0), thickness=2)
 
         self.result_image = result
         return result, total_object_pixels
 
-    def _draw_box_manual(self, image, bbox, color=(255, 0, 0), thickness=2):
-        x1, y1, x2, y2 = bbox
-        pixels = image.load()
-        width, height = image.size
-        for t in range(thickness):
-            for x in range(x1, x2 + 1):
-                if 0 <= x < width:
-                    if 0 <= y1 + t < height:
-                        pixels[x, y1 + t] = color
-                    if 0 <= y2 - t < height:
-                        pixels[x, y2 - t] = color
-            for y in range(y1, y2 + 1):
-                if 0 <= y < height:
-                    if 0 <= x1 + t < width:
-                        pixels[x1 + t, y] = color
-                    if 0 <= x2 - t < width:
-                        pixels[x2 - t, y] = color
-
-    def _label_components(self, mask):
-        height = len(mask)
-        width = len(mask[0]) if height > 0 else 0
-        labels = [[0 for _ in range(width)] for _ in range(height)]
-        current_label = 1
-        objects = []
-        for y in range(height):
-            for x in range(width):
-                if mask[y][x] == 1 and labels[y][x] == 0:
-                    queue = [(y, x)]
-                    labels[y][x] = current_label
-                    min_x = max_x = x
-                    min_y = max_y = y
-                    sum_x = sum_y = 0.0
-                    pixel_count = 0
-                    while queue:
-                        cy, cx = queue.pop(0)
-                        min_x = min(min_x, cx)
-                        max_x = max(max_x, cx)
-                        min_y = min(min_y, cy)
-                        max_y = max(max_y, cy)
-                        sum_x += cx
-                        sum_y += cy
-                        pixel_count += 1
-                        for dy, dx in [(-1,0),(1,0),(0,-1),(0,1)]:
-                            ny, nx = cy + dy, cx + dx
-                            if 0 <= ny < height and 0 <= nx < width:
-                                if mask[ny][nx] == 1 and labels[ny][nx] == 0:
-                                    labels[ny][nx] = current_label
-                                    queue.append((ny, nx))
-                    centroid_x = sum_x / pixel_count
-                    centroid_y = sum_y / pixel_count
-                    objects.append({
-                        'label': current_label,
-                        'bbox': (min_x, min_y, max_x, max_y),
-                        'centroid': (centroid_x, centroid_y),
-                        'area': pixel_count
-                    })
-                    current_label += 1
-        return objects
\ No newline at end of file
+    def set_objects(self, objects, label_map=None):
+        """Replace the detected objects and rebuild the hover lookup index."""
+        self.objects = objects
+        self.label_map = label_map
+        self.index = ObjectIndex(objects, label_map)
+
+    def object_at(self, x, y):
+        """Return the detected object at image pixel (x, y), or None."""
+        if self.index is None:
+            return None
+        return self.index.query(x, y)
+
+    def get_region_properties(self):
+        """Return columnar region properties of the last boxed image."""
+        return self.properties
@@ -0,0 +1,48 @@
+class ObjectIndex:
+    """
+    Point lookup over detected objects.
+
+    When a label map is available the pixel's own label identifies the exact
+    object under the cursor. Otherwise (or on a background pixel) a uniform
+    grid over the bounding boxes returns the smallest box containing the point,
+    so a lookup touches only the objects registered in one grid cell.
+    """
+
+    def __init__(self, objects, label_map=None, cell_size=64):
+        self.objects = [obj for obj in objects if not obj.get('is_full_image')]
+        self.label_map = label_map
+        self.cell_size = max(1, int(cell_size))
+        self._by_label = {obj['label']: obj for obj in self.objects if 'label' in obj}
+        self._grid = {}
+        cs = self.cell_size
+        for i, obj in enumerate(self.objects):
+            x1, y1, x2, y2 = obj['bbox']
+            for gy in range(y1 // cs, y2 // cs + 1):
+                for gx in range(x1 // cs, x2 // cs + 1):
+                    self._grid.setdefault((gx, gy), []).append(i)
+
+    def query(self, x, y):
+        """Return the object at image pixel (x, y), or None."""
+        if self.label_map is not None:
+            height, width = self.label_map.shape[:2]
+            if 0 <= x < width and 0 <= y < height:
+                obj = self._by_label.get(int(self.label_map[y, x]))
+                if obj is not None:
+                    return obj
+        return self.query_bbox(x, y)
+
+    def query_bbox(self, x, y):
+        """Return the smallest-area object whose bounding box contains (x, y)."""
+        best = None
+        best_box_area = None
+        for i in self._grid.get((x // self.cell_size, y // self.cell_size), ()):
+            obj = self.objects[i]
+            x1, y1, x2, y2 = obj['bbox']
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                box_area = (x2 - x1 + 1) * (y2 - y1 + 1)
+                if best is None or box_area < best_box_area:
+                    best, best_box_area = obj, box_area
+        return best
+
+    def __len__(self):
+        return len(self.objects)
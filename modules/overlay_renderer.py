@@ -0,0 +1,135 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+class OverlayRenderer:
+    """
+    Batched drawing of detection overlays (foreground restore, boxes,
+    centroids, labels). Boxes are rasterised for all objects with a single
+    numpy assignment; markers and text share one ImageDraw pass. Overlays can
+    also be rendered as a separate transparent layer at display resolution
+    instead of being burned into the full-resolution image.
+    """
+
+    @staticmethod
+    def composite_foreground(background, foreground, mask):
+        """Take `foreground` where mask is non-zero, `background` elsewhere (one masked paste)."""
+        if mask.mode != 'L':
+            mask = mask.convert('L')
+        binary_mask = mask.point([0] + [255] * 255)
+        if foreground.mode != background.mode:
+            foreground = foreground.convert(background.mode)
+        return Image.composite(foreground, background, binary_mask)
+
+    @staticmethod
+    def _box_edge_pixels(boxes, thickness, width, height):
+        """(ys, xs) of every in-bounds box edge pixel, edges drawn inward from the bbox."""
+        if len(boxes) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        x1, y1, x2, y2 = (boxes[:, i] for i in range(4))
+        fixed, lo, hi, horizontal = [], [], [], []
+        for t in range(thickness):
+            for row in (y1 + t, y2 - t):
+                fixed.append(row)
+                lo.append(x1)
+                hi.append(x2)
+                horizontal.append(np.ones(len(boxes), dtype=bool))
+            for col in (x1 + t, x2 - t):
+                fixed.append(col)
+                lo.append(y1)
+                hi.append(y2)
+                horizontal.append(np.zeros(len(boxes), dtype=bool))
+        fixed = np.concatenate(fixed)
+        lo = np.concatenate(lo)
+        hi = np.concatenate(hi)
+        horizontal = np.concatenate(horizontal)
+
+        # Keep segments whose fixed coordinate is inside the image, clip their span
+        limit_fixed = np.where(horizontal, height, width)
+        limit_span = np.where(horizontal, width, height)
+        keep = (fixed >= 0) & (fixed < limit_fixed)
+        fixed, horizontal = fixed[keep], horizontal[keep]
+        lo = np.maximum(lo[keep], 0)
+        hi = np.minimum(hi[keep], limit_span[keep] - 1)
+        lengths = np.maximum(hi - lo + 1, 0)
+        total = int(lengths.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        span = np.repeat(lo, lengths) + (np.arange(total) - offsets)
+        fixed = np.repeat(fixed, lengths)
+        horizontal = np.repeat(horizontal, lengths)
+        ys = np.where(horizontal, fixed, span)
+        xs = np.where(horizontal, span, fixed)
+        return ys, xs
+
+    @staticmethod
+    def draw_boxes(image, objects, color=(255, 0, 0), thickness=2):
+        """Return a copy of `image` with every object's bbox drawn in one pass."""
+        boxes = np.array([obj['bbox'] for obj in objects], dtype=np.int64).reshape(-1, 4)
+        pixels = np.array(image)
+        height, width = pixels.shape[:2]
+        ys, xs = OverlayRenderer._box_edge_pixels(boxes, thickness, width, height)
+        if pixels.ndim == 3:
+            pixels[ys, xs] = np.array(color, dtype=pixels.dtype)[:pixels.shape[2]]
+        else:
+            pixels[ys, xs] = color[0] if isinstance(color, tuple) else color
+        return Image.fromarray(pixels, image.mode)
+
+    @staticmethod
+    def _draw_markers(draw, objects, scale_x=1.0, scale_y=1.0, centroids=True, labels=False,
+                      marker_size=8, color='lime', label_color='yellow', line_width=2):
+        for obj in objects:
+            if obj.get('is_full_image'):
+                continue
+            cx, cy = obj['centroid']
+            cx, cy = cx * scale_x, cy * scale_y
+            if centroids:
+                draw.line([(cx - marker_size, cy), (cx + marker_size, cy)], fill=color, width=line_width)
+                draw.line([(cx, cy - marker_size), (cx, cy + marker_size)], fill=color, width=line_width)
+                draw.ellipse([cx - 3, cy - 3, cx + 3, cy + 3], fill=color)
+            if labels and 'label' in obj:
+                x1, y1 = obj['bbox'][0] * scale_x, obj['bbox'][1] * scale_y
+                draw.text((x1 + 2, y1 + 2), str(obj['label']), fill=label_color)
+
+    @staticmethod
+    def render(image, objects, boxes=True, centroids=False, labels=False,
+               box_color=(255, 0, 0), thickness=2):
+        """Burn boxes, centroid markers and labels into a copy of a full-resolution image."""
+        result = image.copy()
+        if boxes:
+            result = OverlayRenderer.draw_boxes(result, objects, box_color, thickness)
+        if centroids or labels:
+            draw = ImageDraw.Draw(result)
+            OverlayRenderer._draw_markers(draw, objects, centroids=centroids, labels=labels)
+        return result
+
+    @staticmethod
+    def fit_size(image_size, max_size):
+        """Largest size with the image's aspect ratio that fits in max_size."""
+        w, h = image_size
+        max_w, max_h = max_size
+        scale = min(max_w / w, max_h / h)
+        return max(1, int(w * scale)), max(1, int(h * scale))
+
+    @staticmethod
+    def render_layer(objects, image_size, display_size, boxes=True, centroids=True, labels=False,
+                     box_color=(255, 0, 0, 255), thickness=2):
+        """
+        Transparent RGBA overlay at display resolution for objects detected on
+        an image of `image_size`. Composite it over the scaled display image.
+        """
+        layer = Image.new('RGBA', display_size, (0, 0, 0, 0))
+        scale_x = display_size[0] / image_size[0]
+        scale_y = display_size[1] / image_size[1]
+        draw = ImageDraw.Draw(layer)
+        if boxes:
+            for obj in objects:
+                x1, y1, x2, y2 = obj['bbox']
+                draw.rectangle([x1 * scale_x, y1 * scale_y, (x2 + 1) * scale_x - 1, (y2 + 1) * scale_y - 1],
+                               outline=box_color, width=thickness)
+        OverlayRenderer._draw_markers(draw, objects, scale_x, scale_y, centroids=centroids, labels=labels)
+        return layer
@@ -23,16 +23,22 @@ def process_pixels(pil_image, pixel_transform, output_mode='RGB'):
     and return a new PIL image of the specified output_mode.
 
     Args:
-        pil_image (PIL.Image): Input image (will be converted to RGB if needed).
+        pil_image (PIL.Image): Input image. 'L', 'RGB' and 'RGBA' are processed
+                               natively ('1' is read as 'L'); other modes are
+                               converted to RGB.
         pixel_transform (callable): Function that takes (x, y, pixel) and returns
                                     a tuple of values for the output pixel.
+                                    pixel is always a tuple; single-channel
+                                    images give a 1-tuple (gray,).
         output_mode (str): Mode of the output image (e.g., 'RGB', 'RGBA', 'L').
 
     Returns:
         PIL.Image: New image with transformed pixels.
     """
-    # Ensure we have RGB or RGBA for consistent pixel access
-    if pil_image.mode not in ('RGB', 'RGBA'):
+    # Keep single-channel images single-channel; everything else becomes RGB(A)
+    if pil_image.mode == '1':
+        pil_image = pil_image.convert('L')
+    elif pil_image.mode not in ('L', 'RGB', 'RGBA'):
         pil_image = pil_image.convert('RGB')
 
     width, height = pil_image.size
@@ -43,10 +49,15 @@ def process_pixels(pil_image, pixel_transform, output_mode='RGB'):
     dst = result.load()
 
     # Manual double loop – every pixel is processed individually
-    for y in range(height):
-        for x in range(width):
-            pixel = src[x, y]
-            new_pixel = pixel_transform(x, y, pixel)
-            dst[x, y] = new_pixel
-
-    return result
\ No newline at end of file
+    if pil_image.mode == 'L':
+        for y in range(height):
+            for x in range(width):
+                dst[x, y] = pixel_transform(x, y, (src[x, y],))
+    else:
+        for y in range(height):
+            for x in range(width):
+                pixel = src[x, y]
+                new_pixel = pixel_transform(x, y, pixel)
+                dst[x, y] = new_pixel
+
+    return result
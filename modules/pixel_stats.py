@@ -22,6 +22,15 @@ class PixelStats:
         If image is not grayscale, convert using luminosity method manually.
         Returns total sum and count.
         """
+        if image.mode in ('L', '1'):
+            img = image.convert('L') if image.mode == '1' else image
+            pixels = img.load()
+            w, h = img.size
+            total = 0
+            for y in range(h):
+                for x in range(w):
+                    total += pixels[x, y]
+            return total, w * h
         if image.mode not in ('RGB', 'RGBA'):
             img = image.convert('RGB')
         else:
@@ -47,8 +56,17 @@ class PixelStats:
     def get_histogram(image):
         """
         Return histogram of grayscale values as list of 256 ints.
-        Uses manual luminosity conversion.
+        Uses manual luminosity conversion (single-channel images are counted directly).
         """
+        if image.mode in ('L', '1'):
+            img = image.convert('L') if image.mode == '1' else image
+            pixels = img.load()
+            w, h = img.size
+            hist = [0] * 256
+            for y in range(h):
+                for x in range(w):
+                    hist[pixels[x, y]] += 1
+            return hist
         if image.mode not in ('RGB', 'RGBA'):
             img = image.convert('RGB')
         else:
@@ -74,8 +92,12 @@ class PixelStats:
     def get_rgb_histograms(image):
         """
         Return three histograms (r, g, b) as lists of 256 ints.
-        If image has alpha, it is ignored.
+        If image has alpha, it is ignored. Single-channel images give three
+        identical histograms.
         """
+        if image.mode in ('L', '1'):
+            hist = PixelStats.get_histogram(image)
+            return hist, list(hist), list(hist)
         # Ensure RGB mode
         if image.mode not in ('RGB', 'RGBA'):
             img = image.convert('RGB')
@@ -102,12 +124,20 @@ class PixelStats:
     def count_pixels_by_condition(image, condition_func):
         """
         Count pixels that satisfy condition_func(pixel).
-        Pixel is passed as tuple (r,g,b) or (r,g,b,a).
+        Pixel is passed as tuple (r,g,b), (r,g,b,a) or (gray,) for single-channel images.
         Returns count.
         """
+        if image.mode == '1':
+            image = image.convert('L')
         pixels = image.load()
         w, h = image.size
         count = 0
+        if image.mode in ('L', 'I', 'F'):
+            for y in range(h):
+                for x in range(w):
+                    if condition_func((pixels[x, y],)):
+                        count += 1
+            return count
         for y in range(h):
             for x in range(w):
                 pixel = pixels[x, y]
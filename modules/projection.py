@@ -0,0 +1,209 @@
+import numpy as np
+from PIL import Image
+
+
+class ProjectionAnalyzer:
+    """
+    Row / column projection profiles of binary images, computed with numpy.
+    Foreground is every pixel >= threshold (white on black, as produced by the
+    Black & White and Threshold filters). Usable without the GUI.
+    """
+
+    @staticmethod
+    def to_binary(image, threshold=128):
+        """PIL image or 2-D array -> bool array (True = foreground)."""
+        if isinstance(image, Image.Image):
+            if image.mode == '1':
+                return np.asarray(image, dtype=bool)
+            if image.mode != 'L':
+                image = image.convert('L')
+            return np.asarray(image) >= threshold
+        array = np.asarray(image)
+        if array.dtype == bool:
+            return array
+        if array.ndim == 3:
+            array = array[:, :, 0]
+        return array >= threshold
+
+    @staticmethod
+    def _crop(binary, region):
+        """Restrict to region = (left, top, right, bottom); None keeps everything."""
+        if region is None:
+            return binary
+        left, top, right, bottom = region
+        return binary[top:bottom, left:right]
+
+    @staticmethod
+    def row_profile(image, threshold=128, region=None):
+        """Foreground pixels per row (horizontal projection)."""
+        binary = ProjectionAnalyzer._crop(ProjectionAnalyzer.to_binary(image, threshold), region)
+        return np.count_nonzero(binary, axis=1)
+
+    @staticmethod
+    def column_profile(image, threshold=128, region=None):
+        """Foreground pixels per column (vertical projection)."""
+        binary = ProjectionAnalyzer._crop(ProjectionAnalyzer.to_binary(image, threshold), region)
+        return np.count_nonzero(binary, axis=0)
+
+    @staticmethod
+    def profiles(image, threshold=128, region=None):
+        """(row_profile, column_profile) from a single binarisation."""
+        binary = ProjectionAnalyzer._crop(ProjectionAnalyzer.to_binary(image, threshold), region)
+        return np.count_nonzero(binary, axis=1), np.count_nonzero(binary, axis=0)
+
+    @staticmethod
+    def windowed(profile, window):
+        """
+        Moving sum over `window` neighbouring entries (centred, same length).
+        Sums ink over a band of rows/columns, e.g. a text line height.
+        """
+        profile = np.asarray(profile, dtype=np.int64)
+        window = int(window)
+        if window <= 1 or profile.size == 0:
+            return profile.copy()
+        before = window // 2
+        after = window - before - 1
+        padded = np.concatenate(([0], np.cumsum(np.pad(profile, (before, after)))))
+        return padded[window:] - padded[:-window]
+
+    @staticmethod
+    def smooth(profile, window=5, method='box'):
+        """
+        Smoothed profile (float). method: 'box' (moving average over `window`)
+        or 'gaussian' (sigma = window / 3). Edges are padded by replication.
+        """
+        profile = np.asarray(profile, dtype=np.float64)
+        window = int(window)
+        if window <= 1 or profile.size == 0:
+            return profile.copy()
+        if method == 'box':
+            kernel = np.ones(window)
+        elif method == 'gaussian':
+            sigma = window / 3.0
+            radius = max(1, int(round(3 * sigma)))
+            offsets = np.arange(-radius, radius + 1)
+            kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        else:
+            raise ValueError(f"Unknown smoothing method: {method}")
+        kernel /= kernel.sum()
+        before = len(kernel) // 2
+        after = len(kernel) - before - 1
+        padded = np.pad(profile, (before, after), mode='edge')
+        return np.convolve(padded, kernel, mode='valid')
+
+    @staticmethod
+    def downsample(profile, bins):
+        """
+        Max-pool a profile into at most `bins` buckets (e.g. the plot width in
+        pixels) so thin peaks survive. Returns (positions, values), positions
+        being bucket centres in profile indices.
+        """
+        profile = np.asarray(profile)
+        n = profile.size
+        bins = max(1, int(bins))
+        if n <= bins:
+            return np.arange(n, dtype=np.float64), profile
+        edges = np.linspace(0, n, bins + 1).astype(np.intp)
+        edges = np.unique(edges[:-1])
+        values = np.maximum.reduceat(profile, edges)
+        positions = (edges + np.append(edges[1:], n) - 1) / 2.0
+        return positions, values
+
+    @staticmethod
+    def find_peaks(profile, min_height=None, min_distance=1):
+        """
+        Indices of local maxima (a plateau reports its centre). Peaks lower than
+        min_height are dropped; of peaks closer than min_distance the highest wins.
+        """
+        profile = np.asarray(profile, dtype=np.float64)
+        if profile.size < 3:
+            return np.array([], dtype=np.intp)
+
+        # Collapse plateaus: keep the first index of each run of equal values
+        change = np.flatnonzero(np.diff(profile) != 0) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [profile.size])) - 1
+        values = profile[starts]
+        if values.size < 3:
+            return np.array([], dtype=np.intp)
+        is_peak = (values[1:-1] > values[:-2]) & (values[1:-1] > values[2:])
+        runs = np.flatnonzero(is_peak) + 1
+        peaks = (starts[runs] + ends[runs]) // 2
+
+        if min_height is not None:
+            peaks = peaks[profile[peaks] >= min_height]
+        if min_distance > 1 and peaks.size > 1:
+            # Greedy: accept peaks from highest to lowest, skipping close neighbours
+            keep = np.ones(peaks.size, dtype=bool)
+            for i in np.argsort(-profile[peaks], kind='stable'):
+                if not keep[i]:
+                    continue
+                close = np.abs(peaks - peaks[i]) < min_distance
+                close[i] = False
+                keep &= ~close
+            peaks = peaks[keep]
+        return peaks
+
+    @staticmethod
+    def find_valleys(profile, max_height=None, min_distance=1):
+        """Indices of local minima (see find_peaks)."""
+        profile = np.asarray(profile, dtype=np.float64)
+        min_height = None if max_height is None else -max_height
+        return ProjectionAnalyzer.find_peaks(-profile, min_height, min_distance)
+
+    @staticmethod
+    def _runs(mask):
+        """(start, end) pairs (end exclusive) of consecutive True entries."""
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    @staticmethod
+    def segment(profile, threshold=0, min_size=1, min_gap=1):
+        """
+        Split a profile into segments where it exceeds threshold, e.g. text lines
+        from a row profile or parts from a column profile.
+        Gaps narrower than min_gap are bridged; segments shorter than min_size
+        are dropped. Returns a list of (start, end) with end exclusive.
+        """
+        profile = np.asarray(profile)
+        starts, ends = ProjectionAnalyzer._runs(profile > threshold)
+        if starts.size and min_gap > 1:
+            bridged = (starts[1:] - ends[:-1]) < min_gap
+            starts = np.concatenate((starts[:1], starts[1:][~bridged]))
+            ends = np.concatenate((ends[:-1][~bridged], ends[-1:]))
+        keep = (ends - starts) >= min_size
+        return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+    @staticmethod
+    def find_gaps(profile, threshold=0, min_size=1):
+        """
+        Runs where the profile is at or below threshold (gaps between lines or
+        parts), excluding the margins before the first and after the last segment.
+        Returns a list of (start, end) with end exclusive.
+        """
+        profile = np.asarray(profile)
+        starts, ends = ProjectionAnalyzer._runs(profile <= threshold)
+        inner = (starts > 0) & (ends < profile.size) & ((ends - starts) >= min_size)
+        return list(zip(starts[inner].tolist(), ends[inner].tolist()))
+
+    @staticmethod
+    def segment_lines(image, threshold=128, axis='rows', smooth_window=1,
+                      min_count=0, min_size=1, min_gap=1, region=None):
+        """
+        Segment a binary image along rows (text lines) or columns (part gaps).
+        The profile is optionally box-smoothed before thresholding at min_count.
+        Returns a list of (start, end) in image coordinates.
+        """
+        if axis not in ('rows', 'columns'):
+            raise ValueError(f"axis must be 'rows' or 'columns', not {axis!r}")
+        if axis == 'rows':
+            profile = ProjectionAnalyzer.row_profile(image, threshold, region)
+        else:
+            profile = ProjectionAnalyzer.column_profile(image, threshold, region)
+        if smooth_window > 1:
+            profile = ProjectionAnalyzer.smooth(profile, smooth_window)
+        segments = ProjectionAnalyzer.segment(profile, min_count, min_size, min_gap)
+        if region is not None:
+            offset = region[1] if axis == 'rows' else region[0]
+            segments = [(start + offset, end + offset) for start, end in segments]
+        return segments
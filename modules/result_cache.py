@@ -0,0 +1,164 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of filter results.
+
+    Keys combine a content hash of the source image with the filter name and
+    its parameters, so re-running the same filter on the same pixels returns
+    the stored result instead of recomputing it. The memory tier is evicted
+    by total pixel bytes; an optional on-disk tier (cache_dir) persists
+    results between runs, e.g. for batch processing.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, cache_dir=None, max_disk_bytes=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (image, extras, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ---------- Keys ----------
+    @staticmethod
+    def image_digest(pil_image):
+        """Fast content hash of an image (mode, size and raw pixel bytes)."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{pil_image.mode}:{pil_image.size[0]}x{pil_image.size[1]}".encode())
+        h.update(pil_image.tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(pil_image, filter_name, params=None):
+        """Key for (image content, filter, parameters). Params must be repr-stable."""
+        items = sorted((params or {}).items())
+        h = hashlib.blake2b(digest_size=20)
+        h.update(ResultCache.image_digest(pil_image).encode())
+        h.update(filter_name.encode())
+        h.update(repr(items).encode())
+        return h.hexdigest()
+
+    # ---------- Lookup / store ----------
+    def get(self, key):
+        """Return (image, extras) for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+
+        loaded = self._load_from_disk(key)
+        with self._lock:
+            if loaded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._store_in_memory(key, loaded[0], loaded[1])
+        return loaded
+
+    def put(self, key, pil_image, extras=None):
+        """Store a result (and optional picklable extras such as object lists)."""
+        extras = extras or {}
+        self._store_in_memory(key, pil_image, extras)
+        if self.cache_dir:
+            self._save_to_disk(key, pil_image, extras)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    # ---------- Memory tier ----------
+    @staticmethod
+    def _image_bytes(pil_image):
+        w, h = pil_image.size
+        return w * h * len(pil_image.getbands())
+
+    def _store_in_memory(self, key, pil_image, extras):
+        nbytes = self._image_bytes(pil_image)
+        nbytes += sum(getattr(value, 'nbytes', 0) for value in extras.values())
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (pil_image, extras, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    # ---------- Disk tier ----------
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _save_to_disk(self, key, pil_image, extras):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        payload = {
+            'mode': pil_image.mode,
+            'size': pil_image.size,
+            'data': pil_image.tobytes(),
+            'extras': extras
+        }
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        if self.max_disk_bytes:
+            self._trim_disk()
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        os.utime(path)   # keep recently used entries alive in _trim_disk
+        image = Image.frombytes(payload['mode'], payload['size'], payload['data'])
+        return image, payload['extras']
+
+    def _trim_disk(self):
+        """Delete least recently used disk entries beyond max_disk_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,150 @@
+import numpy as np
+from PIL import Image
+from modules.component_analyzer import clip_box
+from modules.grayscale_converter import GrayscaleConverter
+
+
+class ROIProcessor:
+    """
+    Non-destructive region of interest. Filters run on the ROI crop only and
+    their result is composited back into an untouched copy of the full frame,
+    so cost follows the size of the region, not of the image.
+
+    box:  (left, top, right, bottom), right/bottom exclusive as in Image.crop
+    mask: optional full-frame mask (PIL image or array, non-zero = inside);
+          only masked pixels are replaced and counted in statistics.
+    With neither, the ROI is the whole image.
+    """
+
+    def __init__(self, box=None, mask=None):
+        self.box = tuple(int(v) for v in box) if box is not None else None
+        self.mask = mask
+
+    def _mask_array(self):
+        if self.mask is None:
+            return None
+        return np.asarray(self.mask.convert('L') if hasattr(self.mask, 'mode') else self.mask) != 0
+
+    def bounds(self, size):
+        """ROI rectangle clipped to an image of this size (mask bounding box included)."""
+        width, height = size
+        left, top, right, bottom = clip_box(self.box, width, height) if self.box else (0, 0, width, height)
+        mask = self._mask_array()
+        if mask is not None:
+            if mask.shape != (height, width):
+                raise ValueError("ROI mask must match the image size")
+            rows = np.nonzero(mask[top:bottom, left:right].any(axis=1))[0]
+            cols = np.nonzero(mask[top:bottom, left:right].any(axis=0))[0]
+            if len(rows) == 0:
+                return left, top, left, top
+            left, top, right, bottom = (left + cols[0], top + rows[0], left + cols[-1] + 1, top + rows[-1] + 1)
+        return int(left), int(top), int(right), int(bottom)
+
+    def is_full_frame(self, size):
+        return self.mask is None and self.bounds(size) == (0, 0, size[0], size[1])
+
+    def crop(self, image):
+        """The ROI rectangle of image (the image itself for a full-frame ROI)."""
+        if self.is_full_frame(image.size):
+            return image
+        return image.crop(self.bounds(image.size))
+
+    def region_mask(self, size):
+        """Mask cropped to bounds(size) as a bool array, or None for a plain rectangle."""
+        mask = self._mask_array()
+        if mask is None:
+            return None
+        left, top, right, bottom = self.bounds(size)
+        return mask[top:bottom, left:right]
+
+    # ---------- Filtering ----------
+    def apply(self, image, filter_func, *args, **kwargs):
+        """Run filter_func(region, *args, **kwargs) on the ROI and composite it into the frame."""
+        if self.is_full_frame(image.size):
+            return filter_func(image, *args, **kwargs)
+        box = self.bounds(image.size)
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return image.copy()
+        result = filter_func(image.crop(box), *args, **kwargs)
+        if isinstance(result, tuple):
+            result = result[0]
+        if result is None:
+            return None
+        return self.composite(image, result, box)
+
+    @staticmethod
+    def _frame_mode(frame_mode, result_mode):
+        modes = (frame_mode, result_mode)
+        if 'RGBA' in modes:
+            return 'RGBA'
+        if 'RGB' in modes or any(m not in ('L', '1') for m in modes):
+            return 'RGB'
+        return 'L'
+
+    def composite(self, image, result, box=None):
+        """
+        Paste result into a copy of image at box (default: this ROI). Modes are
+        widened to fit both (L < RGB < RGBA); a result of a different size
+        (e.g. rotate with expand) is centred on the box and clipped to it.
+        """
+        box = box or self.bounds(image.size)
+        box_w, box_h = box[2] - box[0], box[3] - box[1]
+        mode = self._frame_mode(image.mode, result.mode)
+        frame = image.convert(mode) if image.mode != mode else image.copy()
+        if result.mode != mode:
+            result = result.convert(mode)
+        if result.size != (box_w, box_h):
+            dx, dy = (result.width - box_w) // 2, (result.height - box_h) // 2
+            canvas = frame.crop(box)
+            canvas.paste(result, (-dx, -dy))
+            result = canvas
+
+        mask = self.region_mask(image.size)
+        if mask is None:
+            frame.paste(result, box[:2])
+        else:
+            frame.paste(result, box[:2], Image.fromarray(mask.astype(np.uint8) * 255, 'L'))
+        return frame
+
+    # ---------- Statistics over the ROI ----------
+    def histogram(self, image):
+        """256-bin luma histogram of the ROI (mask pixels only, if a mask is set)."""
+        luma = GrayscaleConverter.luma(self.crop(image))
+        mask = self.region_mask(image.size)
+        values = luma[mask] if mask is not None else luma.ravel()
+        return np.bincount(values, minlength=256).tolist()
+
+    def rgb_histograms(self, image):
+        """(r, g, b) histograms of the ROI; single-channel images give three identical ones."""
+        region = self.crop(image)
+        if region.mode in ('L', '1'):
+            hist = self.histogram(image)
+            return hist, list(hist), list(hist)
+        pixels = np.asarray(region if region.mode in ('RGB', 'RGBA') else region.convert('RGB'))
+        mask = self.region_mask(image.size)
+        hists = []
+        for c in range(3):
+            channel = pixels[:, :, c]
+            values = channel[mask] if mask is not None else channel.ravel()
+            hists.append(np.bincount(values, minlength=256).tolist())
+        return tuple(hists)
+
+    def stats(self, image):
+        """min, max, mean, std and pixel count of ROI luma (same keys as PixelStats.get_grayscale_stats)."""
+        hist = np.asarray(self.histogram(image), dtype=np.float64)
+        total = hist.sum()
+        if total == 0:
+            return None
+        levels = np.arange(256)
+        mean = float((levels * hist).sum() / total)
+        std = float(np.sqrt(((levels - mean) ** 2 * hist).sum() / total))
+        occupied = np.nonzero(hist)[0]
+        left, top, right, bottom = self.bounds(image.size)
+        return {
+            'min': int(occupied[0]),
+            'max': int(occupied[-1]),
+            'mean': mean,
+            'std': std,
+            'total_pixels': int(total),
+            'roi': (left, top, right, bottom)
+        }
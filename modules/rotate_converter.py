@@ -1,70 +1,277 @@
 from PIL import Image
 import math
-from modules.pixel_processor import process_pixels, get_image_info
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from modules.pixel_processor import get_image_info
+
+RESAMPLE_MODES = ('nearest', 'bilinear', 'bicubic')
+
+# Interpolating modes step source coordinates in fixed point with this many
+# fraction bits; the fraction is the bilinear weight and indexes the bicubic table
+_FRACTION_BITS = 8
+_FRACTION_STEPS = 1 << _FRACTION_BITS
+
+# Source border (replicated edge pixels) so every bicubic tap of an in-image
+# position is a valid index without clipping
+_BORDER = 2
+
+# Two 8-bit channels per 16-bit lane of a packed pixel, for bilinear blending
+_EVEN_LANES = np.uint32(0x00FF00FF)
+_ODD_LANES = np.uint32(0xFF00FF00)
+_LANE_HALF = np.uint32(0x00800080)
+
+_cubic_table = None   # (4 x steps) float32 Keys weights per coordinate fraction, built on first use
+
+
+def _cubic_weights(t):
+    """Keys cubic convolution weights (a = -0.5) for taps at offsets -1, 0, 1, 2."""
+    a = -0.5
+
+    def near(d):     # |d| < 1
+        return ((a + 2) * d - (a + 3)) * d * d + 1
+
+    def far(d):      # 1 <= |d| < 2
+        return ((a * d - 5 * a) * d + 8 * a) * d - 4 * a
+
+    return far(1 + t), near(t), near(1 - t), far(2 - t)
+
+
+def _lerp_packed(a, b, w, inv_w):
+    """
+    Per-channel (a * inv_w + b * w) / 256 of packed uint32 pixels, rounded.
+    Even and odd channel bytes are blended two at a time in 16-bit lanes.
+    """
+    even = ((a & _EVEN_LANES) * inv_w + (b & _EVEN_LANES) * w + _LANE_HALF) >> 8
+    even &= _EVEN_LANES
+    odd = ((a >> 8) & _EVEN_LANES) * inv_w + ((b >> 8) & _EVEN_LANES) * w + _LANE_HALF
+    odd &= _ODD_LANES
+    return even | odd
+
 
 class ImageRotator:
     def __init__(self):
         self.rotated_image = None
         self.angle = 0
+        self.resample = 'nearest'
+        self.expand = False
 
-    def rotate_image(self, pil_image, angle):
+    def rotate_image(self, pil_image, angle, resample='nearest', expand=False):
         """
-        Rotate a PIL image around its center by the given angle (degrees),
-        keeping the same dimensions. Empty areas become black (RGB) or transparent (RGBA).
-        Uses pixel_processor to access all source pixels.
+        Rotate a PIL image around its center by the given angle (degrees).
+        Empty areas become black (L/RGB) or transparent (RGBA).
+
+        resample: 'nearest', 'bilinear' or 'bicubic'.
+        expand:   enlarge the canvas so the whole rotated image fits
+                  (otherwise the original dimensions are kept).
+
+        Source coordinates are an inverse rotation of each output pixel. The
+        column and row terms of that rotation are tabulated once, so every
+        output row is its row offset plus the shared column table, evaluated
+        for a block of rows at a time with numpy (in fixed point for the
+        interpolating modes). Columns a block cannot map into the source are
+        left black without being sampled.
         """
         if not pil_image:
             return None
+        if resample not in RESAMPLE_MODES:
+            raise ValueError(f"Unknown resample mode: {resample}")
 
-        # Ensure we work with RGB or RGBA
+        # Work with L, RGB or RGBA ('1' is read as 'L')
         original_mode = pil_image.mode
-        if original_mode not in ('RGB', 'RGBA'):
+        if original_mode == '1':
+            pil_image = pil_image.convert('L')
+            original_mode = 'L'
+        elif original_mode not in ('L', 'RGB', 'RGBA'):
             pil_image = pil_image.convert('RGB')
             original_mode = 'RGB'
 
         # Get image dimensions via pixel_processor
         width, height, _, _, _ = get_image_info(pil_image)
+        channels = len(original_mode)
+
         rads = math.radians(angle)
+        cos_a, sin_a = math.cos(rads), math.sin(rads)
         midx, midy = width // 2, height // 2
 
-        # ---- Use process_pixels to extract all source pixels into a 2D list ----
-        src_pixels_2d = []
+        if expand:
+            out_w = max(1, int(math.ceil(abs(width * cos_a) + abs(height * sin_a) - 1e-6)))
+            out_h = max(1, int(math.ceil(abs(width * sin_a) + abs(height * cos_a) - 1e-6)))
+        else:
+            out_w, out_h = width, height
+        out_midx, out_midy = out_w // 2, out_h // 2
 
-        def collect_pixel(x, y, pixel):
-            # This callback is called for each pixel in order (row by row)
-            if y >= len(src_pixels_2d):
-                src_pixels_2d.append([])
-            src_pixels_2d[y].append(pixel)
-            return pixel  # dummy return, we don't use the output image
+        # ---- Coordinate tables: trig terms per output column and per output row ----
+        dx = np.arange(out_w, dtype=np.float64) - out_midx
+        dy = np.arange(out_h, dtype=np.float64) - out_midy
+        col_cos, col_sin = dx * cos_a, dx * sin_a
+        row_sin, row_cos = dy * sin_a, dy * cos_a
+        if resample != 'nearest':
+            # Fixed point: each output coordinate is then one integer add of two table entries
+            scale = float(_FRACTION_STEPS)
+            col_x = np.rint(col_cos * scale).astype(np.int32)
+            col_y = np.rint(-col_sin * scale).astype(np.int32)
+            row_x = np.rint((row_sin + midx) * scale).astype(np.int32)
+            row_y = np.rint((row_cos + midy) * scale).astype(np.int32)
 
-        # Run process_pixels (it iterates over all pixels and calls collect_pixel)
-        process_pixels(pil_image, collect_pixel, output_mode=original_mode)
+        # Output columns of each row that can land inside the source
+        starts, stops = self._row_spans(width, height, cos_a, sin_a, row_sin + midx, row_cos + midy, out_midx, out_w)
 
-        # ---- Create output image and fill using inverse mapping ----
-        result = Image.new(original_mode, (width, height))
-        dst_pixels = result.load()  # writing directly is still needed
+        # ---- Pixels packed one word per pixel so a gather moves whole pixels ----
+        if channels == 1:
+            pixels = np.asarray(pil_image)
+        else:
+            # PIL's raw codec pads RGB to RGBX in C
+            raw = pil_image.tobytes('raw', 'RGBX' if channels == 3 else 'RGBA')
+            pixels = np.frombuffer(raw, dtype=np.uint32).reshape(height, width)
+        if resample == 'nearest':
+            flat = pixels.reshape(-1)
+        else:
+            flat = np.pad(pixels, _BORDER, mode='edge').reshape(-1)
+        result = np.zeros((out_h, out_w), dtype=flat.dtype)
 
-        for y in range(height):
-            for x in range(width):
-                dx = x - midx
-                dy = y - midy
+        # ---- Fill the output in blocks of rows (numpy releases the GIL, so blocks run in parallel) ----
+        rows_per_block = max(1, (1 << 18) // out_w)
 
-                # Inverse rotation
-                src_x = dx * math.cos(rads) + dy * math.sin(rads) + midx
-                src_y = -dx * math.sin(rads) + dy * math.cos(rads) + midy
+        def fill_rows(y0):
+            y1 = min(out_h, y0 + rows_per_block)
+            # Only the columns some row of the block can map into the source
+            c0, c1 = int(starts[y0:y1].min()), int(stops[y0:y1].max())
+            if c0 >= c1:
+                return
+            if resample == 'nearest':
+                # Inverse rotation, same expression as the per-pixel form:
+                #   src_x = dx*cos + dy*sin + midx,  src_y = -dx*sin + dy*cos + midy
+                src_x = (col_cos[None, c0:c1] + row_sin[y0:y1, None]) + midx
+                src_y = (row_cos[y0:y1, None] - col_sin[None, c0:c1]) + midy
+                result[y0:y1, c0:c1] = self._sample(flat, width, height, src_x, src_y)
+            else:
+                x_fp = col_x[None, c0:c1] + row_x[y0:y1, None]
+                y_fp = col_y[None, c0:c1] + row_y[y0:y1, None]
+                result[y0:y1, c0:c1] = self._interpolate(flat, width, height, channels, x_fp, y_fp, resample)
 
-                src_x_round = int(round(src_x))
-                src_y_round = int(round(src_y))
+        blocks = range(0, out_h, rows_per_block)
+        if len(blocks) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(blocks), os.cpu_count() or 1)) as pool:
+                list(pool.map(fill_rows, blocks))
+        else:
+            fill_rows(0)
 
-                if 0 <= src_x_round < width and 0 <= src_y_round < height:
-                    dst_pixels[x, y] = src_pixels_2d[src_y_round][src_x_round]
-                else:
-                    # Fill empty area
-                    if original_mode == 'RGBA':
-                        dst_pixels[x, y] = (0, 0, 0, 0)
-                    else:
-                        dst_pixels[x, y] = (0, 0, 0)
+        if channels == 1:
+            result = Image.fromarray(result, 'L')
+        else:
+            result = Image.frombytes(original_mode, (out_w, out_h), result, 'raw',
+                                     'RGBX' if channels == 3 else 'RGBA')
 
         self.rotated_image = result
         self.angle = angle
-        return result
\ No newline at end of file
+        self.resample = resample
+        self.expand = expand
+        return result
+
+    @staticmethod
+    def _row_spans(width, height, cos_a, sin_a, row_x, row_y, out_midx, out_w):
+        """
+        Per output row, the [start, stop) output columns whose source position
+        can fall inside the image (one column of slack each side). Source x is
+        dx*cos + row_x and source y is -dx*sin + row_y; each bound is linear in dx.
+        """
+        low = np.full(row_x.shape, -np.inf)
+        high = np.full(row_x.shape, np.inf)
+        for slope, offset, limit in ((cos_a, row_x, width), (-sin_a, row_y, height)):
+            if abs(slope) < 1e-12:
+                # Constant along the row: either every column or none
+                miss = (offset < -1) | (offset > limit)
+                low[miss], high[miss] = np.inf, -np.inf
+                continue
+            a = (-1 - offset) / slope
+            b = (limit - offset) / slope
+            np.maximum(low, np.minimum(a, b), out=low)
+            np.minimum(high, np.maximum(a, b), out=high)
+        empty = low > high
+        with np.errstate(invalid='ignore'):
+            starts = np.clip(np.floor(low) + out_midx - 1, 0, out_w)
+            stops = np.clip(np.ceil(high) + out_midx + 2, 0, out_w)
+        starts[empty], stops[empty] = out_w, 0
+        return starts.astype(np.int64), stops.astype(np.int64)
+
+    @staticmethod
+    def _sample(flat, width, height, src_x, src_y):
+        """
+        Nearest-neighbour samples of the flattened source (one uint8 or packed
+        uint32 per pixel) at (src_x, src_y). Positions outside the image are 0.
+        """
+        ix = np.rint(src_x).astype(np.int32)
+        iy = np.rint(src_y).astype(np.int32)
+        outside = (ix < 0) | (ix >= width) | (iy < 0) | (iy >= height)
+        np.clip(ix, 0, width - 1, out=ix)
+        np.clip(iy, 0, height - 1, out=iy)
+        values = flat.take(iy * width + ix)
+        values[outside] = 0
+        return values
+
+    @staticmethod
+    def _interpolate(flat, width, height, channels, x_fp, y_fp, resample):
+        """
+        Bilinear / bicubic samples at fixed-point positions (x_fp, y_fp) of the
+        flattened source padded by _BORDER replicated pixels. Bilinear blends
+        packed pixels in integer lanes; bicubic takes its tap weights from a
+        table indexed by the coordinate fraction and accumulates each channel
+        in float32. Positions whose nearest pixel lies outside the image are 0.
+        """
+        global _cubic_table
+        half = _FRACTION_STEPS // 2
+        outside = (((x_fp + half).view(np.uint32) >= width * _FRACTION_STEPS) |
+                   ((y_fp + half).view(np.uint32) >= height * _FRACTION_STEPS))
+        stride = width + 2 * _BORDER
+        base = ((y_fp >> _FRACTION_BITS) + _BORDER) * stride + ((x_fp >> _FRACTION_BITS) + _BORDER)
+        fx = (x_fp & (_FRACTION_STEPS - 1)).view(np.uint32)
+        fy = (y_fp & (_FRACTION_STEPS - 1)).view(np.uint32)
+
+        def tap(dy, dx):
+            # Outside positions may index past the buffer; they are zeroed below
+            picked = flat.take(base + (dy * stride + dx), mode='clip')
+            return picked.astype(np.uint32) if flat.dtype == np.uint8 else picked
+
+        if resample == 'bilinear':
+            inv_fx = _FRACTION_STEPS - fx
+            inv_fy = _FRACTION_STEPS - fy
+            top = _lerp_packed(tap(0, 0), tap(0, 1), fx, inv_fx)
+            bottom = _lerp_packed(tap(1, 0), tap(1, 1), fx, inv_fx)
+            values = _lerp_packed(top, bottom, fy, inv_fy).astype(flat.dtype, copy=False)
+            values[outside] = 0
+            return values
+
+        if _cubic_table is None:
+            steps = np.arange(_FRACTION_STEPS, dtype=np.float64) / _FRACTION_STEPS
+            _cubic_table = np.stack(_cubic_weights(steps)).astype(np.float32)
+        wx = [_cubic_table[i].take(fx) for i in range(4)]
+        wy = [_cubic_table[j].take(fy) for j in range(4)]
+        acc = [None] * channels
+        scratch = np.empty(x_fp.shape, dtype=np.float32)
+        for j, k in enumerate((-1, 0, 1, 2)):
+            row = [None] * channels
+            for i, m in enumerate((-1, 0, 1, 2)):
+                picked = flat.take(base + (k * stride + m), mode='clip')
+                planes = picked[..., None] if channels == 1 else picked.view(np.uint8).reshape(picked.shape + (4,))
+                for c in range(channels):
+                    if row[c] is None:
+                        row[c] = np.multiply(planes[..., c], wx[i], dtype=np.float32)
+                    else:
+                        np.multiply(planes[..., c], wx[i], out=scratch)
+                        row[c] += scratch
+            for c in range(channels):
+                row[c] *= wy[j]
+                if acc[c] is None:
+                    acc[c] = row[c]
+                else:
+                    acc[c] += row[c]
+
+        values = np.zeros(x_fp.shape, dtype=flat.dtype)
+        planes = values[..., None] if channels == 1 else values.view(np.uint8).reshape(values.shape + (4,))
+        for c in range(channels):
+            np.rint(acc[c], out=acc[c])
+            np.clip(acc[c], 0, 255, out=acc[c])
+            planes[..., c] = acc[c]
+        values[outside] = 0
+        return values
@@ -1,5 +1,6 @@
 from modules.pixel_processor import process_pixels, get_image_info
 from modules.grayscale_converter import GrayscaleConverter
+from modules.contrast_enhancer import ContrastEnhancer
 
 class ThresholdConverter:
     def __init__(self):
@@ -11,40 +12,43 @@ class ThresholdConverter:
         self.block_size = 11
         self.c = 2
 
-    def apply_single_threshold(self, pil_image, t=128):
-        """Pixels >= t become white (255), else black (0)."""
+    def apply_single_threshold(self, pil_image, t=128, contrast=None):
+        """
+        Pixels >= t become white (255), else black (0). Returns an 'L' image.
+        contrast: optional ContrastEnhancer method applied to the grayscale first.
+        """
         if pil_image is None:
             return None
         converter = GrayscaleConverter()
-        gray_img = converter.convert_to_grayscale(pil_image)
+        gray_img = ContrastEnhancer.enhance(converter.convert_to_grayscale(pil_image), contrast)
 
         def threshold_transform(x, y, pixel):
             gray_val = pixel[0]
-            return (255, 255, 255) if gray_val >= t else (0, 0, 0)
+            return (255,) if gray_val >= t else (0,)
 
-        self.thresholded_image = process_pixels(gray_img, threshold_transform, output_mode='RGB')
+        self.thresholded_image = process_pixels(gray_img, threshold_transform, output_mode='L')
         self.threshold_type = "single"
         self.t = t
         return self.thresholded_image
 
-    def apply_range_threshold(self, pil_image, t1=0, t2=255):
+    def apply_range_threshold(self, pil_image, t1=0, t2=255, contrast=None):
         """Pixels in [t1, t2] become white, else black."""
         if pil_image is None:
             return None
         converter = GrayscaleConverter()
-        gray_img = converter.convert_to_grayscale(pil_image)
+        gray_img = ContrastEnhancer.enhance(converter.convert_to_grayscale(pil_image), contrast)
 
         def threshold_transform(x, y, pixel):
             gray_val = pixel[0]
-            return (255, 255, 255) if t1 <= gray_val <= t2 else (0, 0, 0)
+            return (255,) if t1 <= gray_val <= t2 else (0,)
 
-        self.thresholded_image = process_pixels(gray_img, threshold_transform, output_mode='RGB')
+        self.thresholded_image = process_pixels(gray_img, threshold_transform, output_mode='L')
         self.threshold_type = "range"
         self.t1 = t1
         self.t2 = t2
         return self.thresholded_image
 
-    def apply_adaptive_threshold(self, pil_image, block_size=11, c=2, method='mean'):
+    def apply_adaptive_threshold(self, pil_image, block_size=11, c=2, method='mean', contrast=None):
         """
         Adaptive thresholding: local threshold = mean of block - c.
         For each pixel, compute mean intensity of block_size x block_size neighborhood,
@@ -54,7 +58,7 @@ class ThresholdConverter:
         if pil_image is None:
             return None
         converter = GrayscaleConverter()
-        gray_img = converter.convert_to_grayscale(pil_image)  # RGB with equal channels
+        gray_img = ContrastEnhancer.enhance(converter.convert_to_grayscale(pil_image), contrast)  # single-channel 'L'
         width, height, _, _, _ = get_image_info(gray_img)
 
         # Convert to 2D list of grayscale intensities (0-255) for faster access
@@ -62,7 +66,7 @@ class ThresholdConverter:
         intensity = [[0 for _ in range(width)] for _ in range(height)]
         for y in range(height):
             for x in range(width):
-                intensity[y][x] = src_pixels[x, y][0]
+                intensity[y][x] = src_pixels[x, y]
 
         # Prepare result array
         result_intensity = [[0 for _ in range(width)] for _ in range(height)]
@@ -87,12 +91,11 @@ class ThresholdConverter:
 
         # Create output image from result_intensity
         from PIL import Image
-        result_img = Image.new('RGB', (width, height))
+        result_img = Image.new('L', (width, height))
         res_pixels = result_img.load()
         for y in range(height):
             for x in range(width):
-                val = result_intensity[y][x]
-                res_pixels[x, y] = (val, val, val)
+                res_pixels[x, y] = result_intensity[y][x]
 
         self.thresholded_image = result_img
         self.threshold_type = "adaptive"
@@ -12,9 +12,13 @@ class ImageTranslator:
             return None
 
         original_mode = pil_image.mode
-        if original_mode not in ('RGB', 'RGBA'):
+        if original_mode == '1':
+            pil_image = pil_image.convert('L')
+            original_mode = 'L'
+        elif original_mode not in ('L', 'RGB', 'RGBA'):
             pil_image = pil_image.convert('RGB')
             original_mode = 'RGB'
+        fill = {'L': 0, 'RGB': (0, 0, 0), 'RGBA': (0, 0, 0, 0)}[original_mode]
 
         # Use pixel_processor to get image dimensions (demonstrates usage of the module)
         width, height, channels, total_pixels, mode = get_image_info(pil_image)
@@ -30,10 +34,7 @@ class ImageTranslator:
                 if 0 <= src_x < width and 0 <= src_y < height:
                     dst[x, y] = src[src_x, src_y]
                 else:
-                    if original_mode == 'RGBA':
-                        dst[x, y] = (0, 0, 0, 0)
-                    else:
-                        dst[x, y] = (0, 0, 0)
+                    dst[x, y] = fill
 
         self.translated_image = result
         self.dx = dx
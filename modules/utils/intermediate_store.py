@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+
+
+class IntermediateStore:
+    """
+    Disk-backed store for large intermediate planes (masks, label maps, luma).
+
+    Each plane is a raw file in a private scratch directory, opened as a
+    numpy.memmap, so it lives in page cache instead of process heap. Worker
+    processes can open the same plane zero-copy from its descriptor (a small
+    picklable dict) instead of receiving a pickled copy of the pixels.
+    The scratch directory is removed on close(), when the store is garbage
+    collected, or at interpreter exit - whichever comes first.
+    """
+
+    def __init__(self, scratch_dir=None):
+        self.directory = tempfile.mkdtemp(prefix='visionpro-', dir=scratch_dir)
+        self._planes = {}
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def allocate(self, name, shape, dtype=np.uint8):
+        """Create (or replace) a zero-filled plane and return it writable."""
+        self.release(name)
+        dtype = np.dtype(dtype)
+        path = os.path.join(self.directory, f"{name}.raw")
+        plane = np.memmap(path, dtype=dtype, mode='w+', shape=tuple(shape))
+        self._planes[name] = {'path': path, 'shape': tuple(shape), 'dtype': dtype.str}
+        return plane
+
+    def put(self, name, data):
+        """Store an array or PIL image as a plane and return the memmap."""
+        array = np.asarray(data)
+        plane = self.allocate(name, array.shape, array.dtype)
+        plane[...] = array
+        plane.flush()
+        return plane
+
+    def get(self, name, writable=False):
+        """Open a stored plane (read-only unless writable=True)."""
+        return self.attach(self.descriptor(name), writable)
+
+    def descriptor(self, name):
+        """Picklable description of a plane, for handing to worker processes."""
+        if name not in self._planes:
+            raise KeyError(f"No intermediate plane named '{name}'")
+        return dict(self._planes[name])
+
+    @staticmethod
+    def attach(descriptor, writable=False):
+        """Open a plane from its descriptor (usable from any process)."""
+        return np.memmap(descriptor['path'], dtype=np.dtype(descriptor['dtype']),
+                         mode='r+' if writable else 'r', shape=tuple(descriptor['shape']))
+
+    def release(self, name):
+        """Drop a plane and delete its backing file."""
+        info = self._planes.pop(name, None)
+        if info and os.path.exists(info['path']):
+            os.remove(info['path'])
+
+    def names(self):
+        return list(self._planes)
+
+    def close(self):
+        """Delete all planes and the scratch directory."""
+        self._planes.clear()
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def __contains__(self, name):
+        return name in self._planes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False